@@ -0,0 +1,5 @@
+r"""
+性能测试。
+
+每个模块都可以用`python -m benchmark.<模块名>`在项目根目录下运行，输出用时并检查结果的正确性。
+"""
@@ -0,0 +1,70 @@
+r"""
+长时间运行时缓存的内存增长测试。
+
+模拟长时间运行：每一轮都从合成的课程中抽取新的一批课表，检查冲突、计算综合得分、排序，然后丢弃这些课表，
+再刷新一部分课程的选课人数。用`tracemalloc`记录每一轮结束后仍然存活的字节数。
+
+检查冲突的缓存以课程对为键，所以在课程对被覆盖后就不再增长；课表的得分记在课表自己身上，随课表一起被回收。
+因此，在前几轮之后，每一轮结束后的内存应当保持平稳。
+
+## 示例
+
+```shell
+python -m benchmark.cache_growth --lessons 200 --rounds 20 --time-tables 20000
+```
+"""
+
+import gc
+import tracemalloc
+from random import Random
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from benchmark.course_construction import synthesize
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "长时间运行时缓存的内存增长测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--rounds", type = int, default = 20, help = "模拟的轮数")
+    parser.add_argument("--time-tables", type = int, default = 20000, help = "每一轮创建的课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 6, help = "每个课表中的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    random = Random(0)
+    gc.collect()
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+
+    for index in range(1, arguments.rounds + 1):
+        # 创建一批新的课表，检查冲突并排序，然后丢弃
+        timeTables = [
+            timeTable
+            for timeTable in (
+                TimeTable(random.sample(courses, arguments.courses_per_table))
+                for _ in range(arguments.time_tables)
+            )
+            if not timeTable.isConflict
+        ]
+        timeTables.sort(key = TimeTable.getScore, reverse = True)
+        feasibleCount = len(timeTables)
+        del timeTables
+
+        # 刷新一部分课程的选课人数
+        Course.refreshCounts({
+            course.id: {"sc": random.randint(0, 2 * course.limitCount), "lc": course.limitCount}
+            for course in random.sample(courses, len(courses) // 10)
+        })
+
+        gc.collect()
+        current = tracemalloc.get_traced_memory()[0]
+        print(f"round {index:3d}: {feasibleCount:6d} feasible, {len(Course.conflicts):6d} cached pairs, {(current - start) / 1024:9.1f} KiB alive")
+
+    tracemalloc.stop()
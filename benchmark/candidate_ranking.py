@@ -0,0 +1,66 @@
+r"""
+候选课表排序的性能测试。
+
+在合成的课程上随机抽取候选课表，比较两种排序方式，并检查它们排出的顺序是否相同：
+- 为每个候选课表创建`TimeTable`，过滤掉冲突的，再按`TimeTable.getScore`排序；
+- `rank_time_tables`：候选课表是`sectionId`组成的元组，用`CourseGroup.isConflicting`和`TimeTable.scoreSectionIds`，不创建`TimeTable`。
+
+## 示例
+
+```shell
+python -m benchmark.candidate_ranking --lessons 200 --candidates 100000
+```
+"""
+
+from random import Random
+from time import perf_counter
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from src.core.arrange_schedule import rank_time_tables
+from benchmark.course_construction import synthesize
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "候选课表排序的性能测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--candidates", type = int, default = 100000, help = "候选课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 4, help = "每个候选课表中的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    random = Random(0)
+    candidates = [
+        tuple(course.sectionId for course in random.sample(courses, arguments.courses_per_table))
+        for _ in range(arguments.candidates)
+    ]
+
+    # 先检查一遍冲突，使两种方式都用上检查冲突的缓存
+    rank_time_tables(candidates)
+
+    start = perf_counter()
+    timeTables = [
+        timeTable
+        for timeTable in map(TimeTable.fromSectionIds, candidates)
+        if not timeTable.isConflict
+    ]
+    timeTables.sort(key = TimeTable.getScore, reverse = True)
+    timeTableSeconds = perf_counter() - start
+
+    start = perf_counter()
+    ranked = rank_time_tables(candidates)
+    rankedSeconds = perf_counter() - start
+
+    expected = [tuple(course.sectionId for course in timeTable.courses) for timeTable in timeTables]
+    if ranked != expected:
+        raise AssertionError("rank_time_tables 排出的顺序与 TimeTable.getScore 不同")
+    print(f"{len(candidates)} candidates, {len(ranked)} without conflicts: rank_time_tables agrees with TimeTable")
+
+    print(f"TimeTable per candidate: {timeTableSeconds:.3f} s")
+    print(f"rank_time_tables: {rankedSeconds:.3f} s ({timeTableSeconds / rankedSeconds:.1f}x)")
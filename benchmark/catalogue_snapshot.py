@@ -0,0 +1,68 @@
+r"""
+课程目录的快照的正确性与性能测试。
+
+把合成的课按课程代码分组作为查询结果，写入快照再读入，检查读入的与原来的相同，并比较：
+- 快照与直接`json.dumps`的大小；
+- 读入快照、再从中创建`Course`的用时。
+
+## 示例
+
+```shell
+python -m benchmark.catalogue_snapshot --lessons 2000
+```
+"""
+
+import os
+import json
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.model.course import Course
+from src.model.catalogue_snapshot import CatalogueSnapshot
+from benchmark.course_construction import synthesize
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "课程目录的快照的正确性与性能测试")
+    parser.add_argument("--lessons", type = int, default = 2000, help = "合成的课的数量")
+    arguments = parser.parse_args()
+
+    # 按课程代码分组，与`crawl`返回的`query_results`的结构相同
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    queryResults = {}
+    for lessonJSON in lessonJSONs:
+        result = queryResults.setdefault(lessonJSON["code"], {"lessonJSONs": [], "lessonId2Counts": {}})
+        result["lessonJSONs"].append(lessonJSON)
+        lessonId = str(lessonJSON["id"])
+        result["lessonId2Counts"][lessonId] = lessonId2Counts[lessonId]
+
+    digest = bytes(32)
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalogue.bin")
+
+        start = perf_counter()
+        CatalogueSnapshot("第一轮", queryResults).dump(path, digest)
+        dumpSeconds = perf_counter() - start
+
+        start = perf_counter()
+        snapshot = CatalogueSnapshot.load(path, digest)
+        loadSeconds = perf_counter() - start
+
+        size = os.path.getsize(path)
+
+    if snapshot is None or snapshot.queryResults != queryResults:
+        raise AssertionError("读入的快照与写入的查询结果不同")
+    print(f"{arguments.lessons} lessons in {len(queryResults)} course codes: the snapshot round-trips")
+
+    start = perf_counter()
+    for result in snapshot.queryResults.values():
+        Course.lessonId2Counts |= result["lessonId2Counts"]
+        Course.fromJSONs(result["lessonJSONs"])
+    buildSeconds = perf_counter() - start
+
+    jsonSize = len(json.dumps(queryResults, ensure_ascii = False).encode("utf-8"))
+    print(f"size: {size / 1024:.0f} KiB (json.dumps: {jsonSize / 1024:.0f} KiB)")
+    print(f"dump: {dumpSeconds * 1000:.1f} ms, load: {loadSeconds * 1000:.1f} ms, Course.fromJSONs: {buildSeconds * 1000:.1f} ms")
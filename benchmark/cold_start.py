@@ -0,0 +1,99 @@
+r"""
+启动耗时测试。
+
+在新的解释器中用`python -X importtime`导入`main.py`会用到的入口模块，并像`main.py`一样检查依赖的拓展库，
+统计入口模块（连同它们导入的所有模块）的导入耗时，列出最慢的几个模块，并检查：
+- 导入耗时的中位数不超过预算；
+- 导入入口模块、检查依赖时没有导入`requests`、`bs4`等较慢的库，它们应当到第一次用到时才导入。
+
+任何一项不满足时抛出`AssertionError`，所以可以用来发现启动变慢。
+
+## 示例
+
+```shell
+python -m benchmark.cold_start --runs 5 --budget 150
+```
+"""
+
+import subprocess
+import sys
+from statistics import median
+
+
+# `main.py`会导入的入口模块
+ENTRY_MODULES = ("src.util.install_prerequsites", "config.user", "src.core.arrange_schedule", "src.core.watch")
+
+# 导入入口模块时不应导入的库
+LAZY_MODULES = ("requests", "bs4", "urllib3", "charset_normalizer")
+
+
+def import_times(modules:tuple[str] = ENTRY_MODULES) -> tuple[dict[str, int], list[str]]:
+    r"""
+    在新的解释器中导入`modules`并调用`install_prerequsites`，返回`-X importtime`给出的每个模块的累计导入耗时（微秒），
+    以及此时已加载的`LAZY_MODULES`。
+
+    ## 返回
+
+    - `(dict[str, int], list[str])`：以模块名为键、以累计耗时为值的字典（只包含顶层的，即直接由`modules`触发的导入），
+      以及已加载的`LAZY_MODULES`。
+    """
+
+    code = (
+        f"import sys\n"
+        f"import {', '.join(modules)}\n"
+        f"src.util.install_prerequsites.install_prerequsites()\n"
+        f"print(','.join(name for name in {LAZY_MODULES!r} if name in sys.modules))\n"
+    )
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output = True, text = True, check = True,
+    )
+
+    # 每行形如`import time:  self [us] | cumulative | imported package`，缩进表示被谁导入
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        (_, cumulative, name) = line.split("|")
+        if not name.startswith(" ") or name.startswith("  "):
+            continue
+        times[name.strip()] = int(cumulative)
+
+    loaded = [name for name in process.stdout.strip().split(",") if name]
+    return (times, loaded)
+
+
+def entry_time(times:dict[str, int]) -> int:
+    r"""
+    返回入口模块的导入耗时（微秒），即由`config`和`src`中的模块触发的顶层导入的累计耗时之和。
+    """
+
+    return sum(
+        cumulative for (name, cumulative) in times.items()
+        if name.split(".")[0] in ("config", "src")
+    )
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "启动耗时测试")
+    parser.add_argument("--runs", type = int, default = 5, help = "启动的次数，取中位数")
+    parser.add_argument("--budget", type = float, default = 150, help = "导入入口模块的耗时的预算（毫秒）")
+    parser.add_argument("--top", type = int, default = 10, help = "列出最慢的模块的数量")
+    arguments = parser.parse_args()
+
+    results = [import_times() for _ in range(arguments.runs)]
+    totals = [entry_time(times) / 1000 for (times, _) in results]
+    (times, loaded) = results[-1]
+
+    print(f"slowest top-level imports (last run):")
+    for (name, cumulative) in sorted(times.items(), key = lambda item: item[1], reverse = True)[: arguments.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+    print(f"entry modules: median {median(totals):.1f} ms over {arguments.runs} runs (budget {arguments.budget:.0f} ms)")
+
+    if loaded:
+        raise AssertionError(f"导入入口模块时导入了应当延迟导入的库：{', '.join(loaded)}")
+    if median(totals) > arguments.budget:
+        raise AssertionError(f"导入入口模块的耗时 {median(totals):.1f} ms 超过了预算 {arguments.budget:.0f} ms")
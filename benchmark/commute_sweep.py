@@ -0,0 +1,79 @@
+r"""
+计算通勤时间的性能测试。
+
+在合成的课程上随机抽取课表（不过滤冲突，所以同一个格子可能有多个安排），比较两种计算通勤时间的方式，并检查结果是否相同：
+- 先用`TimeTable.arrangementTableOf`创建 7×14 的安排表，再逐格扫过（即原来的`getCommuteTime`）；
+- `TimeTable.commuteTimeOf`：合并每门课预先排好序的`Course.cells`，不创建安排表。
+
+## 示例
+
+```shell
+python -m benchmark.commute_sweep --lessons 200 --time-tables 20000
+```
+"""
+
+from random import Random
+from time import perf_counter
+
+from config.constants import COURSES_COUNT
+from src.model.course import Course
+from src.model.room import Room
+from src.model.time_table import TimeTable
+from benchmark.course_construction import synthesize
+
+
+def grid_commute_time(courses:list[Course]) -> float:
+    r"""
+    在安排表上逐格扫过，计算一周的通勤时间。
+    """
+
+    commuteTime = 0
+    for weekdayArrangements in TimeTable.arrangementTableOf(courses):
+        last = Room.getDormitory()
+        nearestCanteen = last.nearestCanteen
+        commuteTime += last.commuteTime(nearestCanteen)
+        last = nearestCanteen
+        for (slot, arrangement) in enumerate(weekdayArrangements, start = 1):
+            if arrangement:
+                commuteTime += last.commuteTime(arrangement)
+                if not arrangement.isOnline:
+                    nearestCanteen = arrangement.nearestCanteen
+                last = arrangement
+            if slot in (COURSES_COUNT["morning"], COURSES_COUNT["morning"] + COURSES_COUNT["afternoon"]):
+                commuteTime += last.commuteTime(nearestCanteen)
+                last = nearestCanteen
+        commuteTime += last.commuteTime(Room.getDormitory())
+    return commuteTime
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "计算通勤时间的性能测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--time-tables", type = int, default = 20000, help = "课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 8, help = "每个课表中的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    random = Random(0)
+    groups = [random.sample(courses, arguments.courses_per_table) for _ in range(arguments.time_tables)]
+
+    start = perf_counter()
+    expected = list(map(grid_commute_time, groups))
+    gridSeconds = perf_counter() - start
+
+    start = perf_counter()
+    actual = list(map(TimeTable.commuteTimeOf, groups))
+    sweepSeconds = perf_counter() - start
+
+    if actual != expected:
+        raise AssertionError("TimeTable.commuteTimeOf 的结果与在安排表上逐格扫过的不同")
+    print(f"{len(groups)} time tables: TimeTable.commuteTimeOf agrees with the grid sweep")
+
+    print(f"grid sweep: {gridSeconds:.3f} s")
+    print(f"TimeTable.commuteTimeOf: {sweepSeconds:.3f} s ({gridSeconds / sweepSeconds:.1f}x)")
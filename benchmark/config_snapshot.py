@@ -0,0 +1,56 @@
+r"""
+配置快照的正确性与性能测试。
+
+比较每次都重新编译配置（`ConfigSnapshot.compile`）与读入快照文件（`ConfigSnapshot.load`）的用时，并检查：
+- 读入的快照与重新编译的相同；
+- 源文件被修改（修改时间改变）后，快照失效。
+
+## 示例
+
+```shell
+python -m benchmark.config_snapshot --runs 200
+```
+"""
+
+import os
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.model.config_snapshot import ConfigSnapshot
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "配置快照的正确性与性能测试")
+    parser.add_argument("--runs", type = int, default = 200, help = "编译和读入的次数")
+    arguments = parser.parse_args()
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "config_snapshot.json")
+
+        start = perf_counter()
+        for _ in range(arguments.runs):
+            expected = ConfigSnapshot.compile()
+        compileSeconds = perf_counter() - start
+
+        expected.dump(path)
+        start = perf_counter()
+        for _ in range(arguments.runs):
+            actual = ConfigSnapshot.load(path)
+        loadSeconds = perf_counter() - start
+
+        if actual is None or any(getattr(actual, name) != getattr(expected, name) for name in ConfigSnapshot.__slots__):
+            raise AssertionError("读入的快照与重新编译的不同")
+        print("ConfigSnapshot.load agrees with ConfigSnapshot.compile")
+
+        # 把快照中记录的一个修改时间改掉，相当于源文件被修改了
+        actual.sources[next(iter(actual.sources))] -= 1
+        actual.dump(path)
+        if ConfigSnapshot.load(path) is not None:
+            raise AssertionError("源文件被修改后，快照没有失效")
+        print("ConfigSnapshot.load rejects a stale snapshot")
+
+    print(f"ConfigSnapshot.compile: {compileSeconds / arguments.runs * 1000:.3f} ms")
+    print(f"ConfigSnapshot.load: {loadSeconds / arguments.runs * 1000:.3f} ms ({compileSeconds / loadSeconds:.1f}x)")
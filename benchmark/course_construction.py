@@ -0,0 +1,89 @@
+r"""
+批量创建`Course`的性能测试。
+
+在合成的课程上比较两种创建方式，并检查它们创建出的课程是否相同：
+- 逐个调用`Course.fromJSON`（`__init__(**attributes)`的`setattr`循环，`Arrangement`经过`type_verifier`）；
+- 一次调用`Course.fromJSONs`。
+
+## 示例
+
+```shell
+python -m benchmark.course_construction --lessons 10000
+```
+"""
+
+import os
+from copy import deepcopy
+from time import perf_counter
+
+from src.core.parse import jsonfy_query_response
+from src.model.course import Course
+from src.model.exam_time import ExamTime
+
+
+RESULT_JS_PATH = os.path.join("static", "javascript", "case", "result.js")
+
+
+def synthesize(lessons_count:int) -> tuple[list[dict], dict[str, dict[str, int]]]:
+    r"""
+    以 result.js 中的课为模板，合成`lessons_count`门课，返回`(lessonJSONs, lessonId2Counts)`。
+    """
+
+    with open(RESULT_JS_PATH, "r", encoding = "utf-8") as file:
+        result = jsonfy_query_response(file.read())
+    templates = result["lessonJSONs"]
+
+    lessonJSONs = []
+    lessonId2Counts = {}
+    for index in range(lessons_count):
+        lessonJSON = deepcopy(templates[index % len(templates)])
+        lessonJSON["id"] = 1000000 + index
+        lessonJSONs.append(lessonJSON)
+        lessonId2Counts[str(lessonJSON["id"])] = {"sc": index % 150, "lc": 100}
+    return (lessonJSONs, lessonId2Counts)
+
+
+def build(function, lessonJSONs:list[dict]) -> tuple[list[Course], float]:
+    r"""
+    清空已创建的课程和考试时间，用`function`创建所有的课程，返回`(课程, 用时（秒）)`。
+    """
+
+    Course.courses.clear()
+    ExamTime.examTimes.clear()
+
+    start = perf_counter()
+    courses = function(lessonJSONs)
+    return (courses, perf_counter() - start)
+
+
+def snapshot(course:Course) -> tuple:
+    r"""
+    一门课的所有属性，用于比较两种创建方式的结果。
+    """
+
+    return (
+        tuple(course[name] for name in sorted(Course.unchangedJSONKeys)),
+        course.courseCode, course.courseId, course.courseName, course.courseNo, course.id,
+        str(course.examTime), course.teacherNames, course.selectCount, course.limitCount, course.score,
+        tuple((repr(arrangement), arrangement.weekStateDigit, arrangement.rooms, arrangement.course is course) for arrangement in course.arrangements),
+    )
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "批量创建 Course 的性能测试")
+    parser.add_argument("--lessons", type = int, default = 10000, help = "合成的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+
+    (slowCourses, slowSeconds) = build(lambda lessonJSONs: [Course.fromJSON(lessonJSON) for lessonJSON in lessonJSONs], lessonJSONs)
+    (fastCourses, fastSeconds) = build(Course.fromJSONs, lessonJSONs)
+
+    assert list(map(snapshot, slowCourses)) == list(map(snapshot, fastCourses)), "Course.fromJSONs differs from Course.fromJSON"
+    print(f"{arguments.lessons} lessons: Course.fromJSONs agrees with Course.fromJSON")
+    print(f"Course.fromJSON: {slowSeconds:.3f} s")
+    print(f"Course.fromJSONs: {fastSeconds:.3f} s ({slowSeconds / fastSeconds:.1f}x)")
@@ -0,0 +1,107 @@
+r"""
+`src.core.extract`中轻量提取器的一致性检查与性能测试。
+
+对 static/html/case 中的每一个页面，检查提取器与`BeautifulSoup`的结果是否相同（包括都找不到的情况），
+再比较两者的用时。
+
+## 示例
+
+```shell
+python -m benchmark.html_extract
+```
+"""
+
+import os
+from timeit import repeat
+
+from bs4 import BeautifulSoup
+
+from config.constants import LOGIN_FORM_ID
+from src.model.error import EnterFailure
+from src.core.extract import extract_login_form, extract_std_elect_course_page, extract_std_elect_course_default_page
+from src.core.parse import _soup_std_elect_course_page
+
+
+HTML_CASE_PATH = os.path.join("static", "html", "case")
+
+
+def soup_login_form(html:str) -> dict[str, str]|None:
+    r"""
+    `parse_login_form`原来的`BeautifulSoup`实现，找不到表单时返回`None`。
+    """
+
+    form = BeautifulSoup(html, "html.parser").find("form", {"id": LOGIN_FORM_ID})
+    if form is None:
+        return None
+    return {input_tag["name"]: input_tag.get("value", "") for input_tag in form.find_all("input")}
+
+
+def soup_std_elect_course_page(html:str) -> dict[str, str]|None:
+    r"""
+    `parse_std_elect_course_page`的`BeautifulSoup`实现，没有选课入口时返回`None`。
+    """
+
+    try:
+        return _soup_std_elect_course_page(html)
+    except (EnterFailure, AttributeError, TypeError):
+        return None
+
+
+def soup_std_elect_course_default_page(html:str) -> dict[str, str]|None:
+    r"""
+    `parse_std_elect_course_default_page`原来的`BeautifulSoup`实现，找不到时返回`None`。
+    """
+
+    script = BeautifulSoup(html, "html.parser").find("script", {"id": "queryLesson_script"})
+    if script is None:
+        return None
+    return {"src": script["src"]}
+
+
+# (名称, 提取器, BeautifulSoup 实现)
+PAIRS = (
+    ("login_form", lambda html: extract_login_form(html, LOGIN_FORM_ID), soup_login_form),
+    ("std_elect_course_page", extract_std_elect_course_page, soup_std_elect_course_page),
+    ("std_elect_course_default_page", extract_std_elect_course_default_page, soup_std_elect_course_default_page),
+)
+
+
+def check() -> list[str]:
+    r"""
+    检查所有页面上提取器与`BeautifulSoup`的结果是否相同，不同则抛出`AssertionError`。
+
+    ## 返回
+
+    - `list[str]`：提取器找到了字段的`"页面:提取器"`。
+    """
+
+    found = []
+    for file_name in sorted(os.listdir(HTML_CASE_PATH)):
+        with open(os.path.join(HTML_CASE_PATH, file_name), "r", encoding = "utf-8") as file:
+            html = file.read()
+        for (name, extractor, soup) in PAIRS:
+            extracted = extractor(html)
+            expected = soup(html)
+            assert extracted == expected, f"{file_name}: {name} extracted {extracted!r}, but BeautifulSoup found {expected!r}"
+            if extracted is not None:
+                found.append(f"{file_name}:{name}")
+    return found
+
+
+
+if __name__ == "__main__":
+    for item in check():
+        print(f"{item}: OK")
+    print("all pages: extractors agree with BeautifulSoup")
+
+    # 性能测试，只测有字段可取的页面
+    for (file_name, (name, extractor, soup)) in (
+        ("login.html", PAIRS[0]),
+        ("stdElectCourse.html", PAIRS[1]),
+        ("stdElectCourse!defaultPage.html", PAIRS[2]),
+    ):
+        with open(os.path.join(HTML_CASE_PATH, file_name), "r", encoding = "utf-8") as file:
+            html = file.read()
+        for (kind, function) in (("extractor", extractor), ("BeautifulSoup", soup)):
+            seconds = min(repeat(lambda: function(html), number = 20, repeat = 3)) / 20
+            print(f"{file_name} {kind}: {seconds * 1000:.3f} ms")
@@ -0,0 +1,110 @@
+r"""
+`jsonfy_query_response`的正确性检查与性能测试。
+
+用 static/javascript/case/result.js 和合成的大响应（宽泛的查询可能返回几 MB）比较新旧两种实现：
+- 新的实现：`src.core.parse.jsonfy_query_response`，用`str.find`定位、`json.JSONDecoder.raw_decode`原地解码；
+- 旧的实现：`_jsonfy_by_regex`，两次`re.search(..., re.DOTALL)`，再分别`json.loads`。
+
+## 示例
+
+```shell
+python -m benchmark.jsonfy_query_response --lessons 20000
+```
+"""
+
+import json
+import re
+import os
+from timeit import repeat
+
+from src.core.parse import jsonfy_query_response, jsonfy_query_counts
+
+
+RESULT_JS_PATH = os.path.join("static", "javascript", "case", "result.js")
+
+
+def _jsonfy_by_regex(response_text:str) -> dict:
+    r"""
+    旧的、基于正则表达式的实现，作为对照。
+    """
+
+    lessonJSONs_match = re.search(r"var\s+lessonJSONs\s*=\s*(\[.*?\])\s*;", response_text, re.DOTALL)
+    lessonId2Counts_match = re.search(r"window\s*\.\s*lessonId2Counts\s*=\s*({.*?})\s*(?:;|$)", response_text, re.DOTALL)
+
+    lessonId2Counts_string = lessonId2Counts_match.group(1)
+    for (old, new) in {"'": "\"", "sc": "\"sc\"", "lc": "\"lc\""}.items():
+        lessonId2Counts_string = lessonId2Counts_string.replace(old, new)
+
+    return {
+        "lessonJSONs": json.loads(lessonJSONs_match.group(1)),
+        "lessonId2Counts": json.loads(lessonId2Counts_string),
+    }
+
+
+def synthesize(lessons_count:int) -> str:
+    r"""
+    以 result.js 中的课为模板，合成一个含有`lessons_count`门课的响应文本。
+    """
+
+    with open(RESULT_JS_PATH, "r", encoding = "utf-8") as file:
+        templates = jsonfy_query_response(file.read())["lessonJSONs"]
+
+    lessonJSONs = []
+    counts = []
+    for index in range(lessons_count):
+        lesson = dict(templates[index % len(templates)])
+        lesson["id"] = 1000000 + index
+        lessonJSONs.append(lesson)
+        counts.append(f"'{lesson['id']}':{{sc:{index % 150},lc:100}}")
+
+    lessonJSONsString = json.dumps(lessonJSONs, ensure_ascii = False, separators = (",", ":"))
+    return f"var lessonJSONs = {lessonJSONsString};/*sc 当前人数, lc 人数上限*/\nwindow.lessonId2Counts={{{','.join(counts)}}}"
+
+
+def check(response_text:str) -> None:
+    r"""
+    检查新旧两种实现的结果是否相同，不同则抛出`AssertionError`。
+    """
+
+    expected = _jsonfy_by_regex(response_text)
+    assert jsonfy_query_response(response_text) == expected, "jsonfy_query_response differs from the regex implementation"
+    assert jsonfy_query_counts(response_text) == expected["lessonId2Counts"], "jsonfy_query_counts differs from the regex implementation"
+
+
+def benchmark(response_text:str, number:int = 5) -> dict[str, float]:
+    r"""
+    返回每种实现解析一次`response_text`的最短用时（秒）。
+    """
+
+    return {
+        name: min(repeat(lambda: function(response_text), number = number, repeat = 3)) / number
+        for (name, function) in (
+            ("regex", _jsonfy_by_regex),
+            ("raw_decode", jsonfy_query_response),
+            ("counts_only", jsonfy_query_counts),
+        )
+    }
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "jsonfy_query_response 的正确性检查与性能测试")
+    parser.add_argument("--lessons", type = int, default = 20000, help = "合成的响应中课的数量")
+    arguments = parser.parse_args()
+
+    # 检查正确性
+    with open(RESULT_JS_PATH, "r", encoding = "utf-8") as file:
+        result_js = file.read()
+    check(result_js)
+    print(f"{RESULT_JS_PATH}: OK")
+
+    large = synthesize(arguments.lessons)
+    check(large)
+    print(f"synthetic ({arguments.lessons} lessons, {len(large.encode('utf-8')) / 2 ** 20:.1f} MB): OK")
+
+    # 性能测试
+    for (text_name, text) in ((RESULT_JS_PATH, result_js), ("synthetic", large)):
+        for (name, seconds) in benchmark(text).items():
+            print(f"{text_name} {name}: {seconds * 1000:.2f} ms")
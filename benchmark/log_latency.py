@@ -0,0 +1,76 @@
+r"""
+日志的延迟测试。
+
+在临时文件夹中记录相同的消息，比较两种记录方式在调用者线程中的用时，并检查写入的行数是否相同：
+- 每条消息都检查文件、打开、追加一行、关闭（即原来的`src.util.log.log`）；
+- `Logger.log`：写文件交给后台线程批量完成。
+
+两者都输出到标准输出，测试时标准输出被重定向到空设备。
+
+## 示例
+
+```shell
+python -m benchmark.log_latency --messages 20000
+```
+"""
+
+import os
+import time
+from contextlib import redirect_stdout
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from config.constants import STR_TIME_FORMAT
+from src.model.logger import Logger
+
+
+def open_per_message_log(path:str, message:str) -> None:
+    r"""
+    原来的`log`：每条消息都打开一次文件。
+    """
+
+    mode = "a" if os.path.isfile(path) else "w"
+    with open(path, mode = mode, encoding = "utf-8") as file:
+        file.write(f"[{time.strftime(STR_TIME_FORMAT, time.localtime())}]{message}\n")
+    print(message)
+
+
+def count_lines(path:str) -> int:
+    with open(path, encoding = "utf-8") as file:
+        return sum(1 for _ in file)
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "日志的延迟测试")
+    parser.add_argument("--messages", type = int, default = 20000, help = "消息的数量")
+    arguments = parser.parse_args()
+
+    messages = [f"query_lesson: 发送查询请求：{{'lessonNo': '', 'courseCode': 'COMP{index:06d}', 'courseName': ''}}" for index in range(arguments.messages)]
+
+    with TemporaryDirectory() as directory, open(os.devnull, "w", encoding = "utf-8") as devnull, redirect_stdout(devnull):
+        legacyPath = os.path.join(directory, "legacy.md")
+        start = perf_counter()
+        for message in messages:
+            open_per_message_log(legacyPath, message)
+        legacySeconds = perf_counter() - start
+
+        logger = Logger(os.path.join(directory, "log.md"), consoleLevel = "DEBUG", maxBytes = 0, timeFormat = STR_TIME_FORMAT)
+        start = perf_counter()
+        for message in messages:
+            logger.log(message)
+        loggerSeconds = perf_counter() - start
+        logger.flush()
+        flushedSeconds = perf_counter() - start
+
+        expected = count_lines(legacyPath)
+        actual = count_lines(logger.path)
+
+    if actual != expected:
+        raise AssertionError(f"Logger 写入了 {actual} 行，而原来的 log 写入了 {expected} 行")
+    print(f"{arguments.messages} messages: Logger wrote the same number of lines")
+
+    print(f"open per message: {legacySeconds / arguments.messages * 1e6:.1f} us per call")
+    print(f"Logger.log: {loggerSeconds / arguments.messages * 1e6:.1f} us per call ({legacySeconds / loggerSeconds:.1f}x), {flushedSeconds:.3f} s until flushed")
@@ -0,0 +1,126 @@
+r"""
+模型对象的内存占用测试。
+
+用`tracemalloc`测量创建合成的`Course`（连同它们的`Arrangement`、`ExamTime`）和`TimeTable`时，平均每个对象分配的字节数。
+
+作为对照，再把创建好的对象复制为用`__dict__`储存的副本（见`unslotted`），测量副本的大小，
+即模型类加入`__slots__`、共用重复的字符串之前的存储方式。副本与现在的对象保存相同的数据，所以两者的差别只来自存储方式。
+
+## 示例
+
+```shell
+python -m benchmark.model_memory --lessons 10000 --time-tables 100000
+```
+"""
+
+import gc
+import tracemalloc
+from random import Random
+
+from src.model.course import Course
+from src.model.arrangement import Arrangement
+from src.model.building import Building
+from src.model.campus import Campus
+from src.model.time_table import TimeTable
+from benchmark.course_construction import synthesize
+
+
+# 以模型类为键，值为用`__dict__`储存属性的副本的类，见`unslotted_class`
+unslottedClasses = {}
+
+
+def unslotted_class(cls:type) -> type:
+    r"""
+    返回模型类`cls`的副本的类，如`Course`的副本的类为`UnslottedCourse`。
+
+    每个模型类各用一个副本的类：CPython 中同一个类的实例共用`__dict__`的键，
+    不同的模型类共用一个类时，属性各不相同，就不能共用了，副本会比原来的存储方式大。
+    """
+
+    if cls not in unslottedClasses:
+        unslottedClasses[cls] = type(f"Unslotted{cls.__name__}", (), {})
+    return unslottedClasses[cls]
+
+
+def unslotted(value:object, memo:dict[int, object]) -> object:
+    r"""
+    把`value`复制为没有`__slots__`时的样子，同一个对象只复制一次（`memo`以`id`为键）：
+
+    - 模型对象（`Building`、`Campus`本来就没有`__slots__`，不复制）复制为`unslotted_class`返回的类的实例，属性存入`__dict__`；
+    - 元组复制为列表（如`Arrangement.rooms`），列表和字典（如`TimeTable.limitedCoursesCount`）也复制；
+    - 字符串复制为新的对象，即不共用（`json.loads`解析出来的字符串各不相同）；
+    - `Arrangement`另外保存`weekState`字符串，`isSelected`为`False`时不保存（原来是类属性）。
+    """
+
+    if isinstance(value, str):
+        return value[:1] + value[1:] if len(value) > 1 else value
+    if id(value) in memo:
+        return memo[id(value)]
+
+    if isinstance(value, (list, tuple)):
+        copy = memo[id(value)] = []
+        copy.extend(unslotted(item, memo) for item in value)
+        return copy
+    if isinstance(value, dict):
+        copy = memo[id(value)] = {}
+        copy.update((unslotted(key, memo), unslotted(item, memo)) for (key, item) in value.items())
+        return copy
+
+    slots = [name for cls in type(value).__mro__ for name in getattr(cls, "__slots__", ())]
+    if not slots or isinstance(value, (Building, Campus)):
+        return value
+
+    copy = memo[id(value)] = unslotted_class(type(value))()
+    for name in slots:
+        if name == "_weekStateLength" or (name == "isSelected" and not value.isSelected) or not hasattr(value, name):
+            continue
+        setattr(copy, name, unslotted(getattr(value, name), memo))
+    if isinstance(value, Arrangement):
+        copy.weekState = unslotted(value.weekState, memo)
+    return copy
+
+
+def measure(function) -> tuple[object, int]:
+    r"""
+    调用`function()`，返回`(返回值, 期间新分配且仍然存活的字节数)`。
+    """
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    gc.collect()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (result, after - before)
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "模型对象的内存占用测试")
+    parser.add_argument("--lessons", type = int, default = 10000, help = "合成的课的数量")
+    parser.add_argument("--time-tables", type = int, default = 100000, help = "创建的课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 9, help = "每个课表中的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+
+    # 课程，连同它们的安排和考试时间
+    (courses, size) = measure(lambda: Course.fromJSONs(lessonJSONs))
+    (_, baselineSize) = measure(lambda: unslotted(courses, {}))
+    arrangementsCount = sum(len(course.arrangements) for course in courses)
+    print(f"{len(courses)} courses with {arrangementsCount} arrangements: {baselineSize / len(courses):.0f} -> {size / len(courses):.0f} bytes per course")
+
+    # 课表，只计课表本身（课程已经存在）；先创建一遍，使检查冲突的缓存不计入
+    random = Random(0)
+    groups = [random.sample(courses, arguments.courses_per_table) for _ in range(arguments.time_tables)]
+    list(map(TimeTable, groups))
+    (timeTables, size) = measure(lambda: list(map(TimeTable, groups)))
+
+    # 课表的副本只复制课表本身，其中的课程共用已经存在的课程
+    memo = {id(course): course for course in courses}
+    (_, baselineSize) = measure(lambda: unslotted(timeTables, dict(memo)))
+    print(f"{len(timeTables)} time tables: {baselineSize / len(timeTables):.0f} -> {size / len(timeTables):.0f} bytes per time table")
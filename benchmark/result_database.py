@@ -0,0 +1,116 @@
+r"""
+结果数据库的正确性与性能测试。
+
+在合成的课程上随机抽取候选课表，用`rank_time_tables`排序并写入临时的结果数据库（写入`--runs`次，模拟多次运行），检查：
+- 写入数据库时排出的顺序与不写入时相同；
+- `ResultDatabase.best`查询到的前若干名的得分与`rank_time_tables`的相同；
+- 含有某门课（或某两门课）的得分最高的课表与逐个课表查找的结果相同。
+
+并测量写入和各种查询的用时。
+
+## 示例
+
+```shell
+python -m benchmark.result_database --lessons 200 --candidates 200000 --runs 3
+```
+"""
+
+import os
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from src.model.result_database import ResultDatabase
+from src.core.arrange_schedule import rank_time_tables
+from benchmark.course_construction import synthesize
+
+
+def best_score_containing(candidates:list[tuple[int]], courseNos:"Iterable[str]") -> float|None:
+    r"""
+    逐个课表查找含有`courseNos`中所有课的课表的最高得分。
+    """
+
+    courseNos = set(courseNos)
+    scores = [
+        TimeTable.scoreSectionIds(candidate)
+        for candidate in candidates
+        if courseNos <= {Course.sections[sectionId].courseNo for sectionId in candidate}
+    ]
+    return max(scores, default = None)
+
+
+def timed(function, *args, **kwargs):
+    r"""
+    返回`function`的返回值和用时（毫秒）。
+    """
+
+    start = perf_counter()
+    result = function(*args, **kwargs)
+    return (result, (perf_counter() - start) * 1000)
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "结果数据库的正确性与性能测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--candidates", type = int, default = 200000, help = "每次运行的候选课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 4, help = "每个候选课表中的课的数量")
+    parser.add_argument("--runs", type = int, default = 3, help = "写入的运行的次数")
+    parser.add_argument("--top", type = int, default = 10, help = "比较的前若干名")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    # 合成的课中有课程序号相同的，同一个候选课表中的课的课程序号应互不相同，与真实的课表一样
+    courseNo2Course = {course.courseNo: course for course in courses}
+    random = Random(0)
+    candidates = [
+        tuple(courseNo2Course[courseNo].sectionId for courseNo in random.sample(sorted(courseNo2Course), arguments.courses_per_table))
+        for _ in range(arguments.candidates)
+    ]
+
+    expected = rank_time_tables(candidates)
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "results.sqlite3")
+
+        writeSeconds = []
+        for _ in range(arguments.runs):
+            start = perf_counter()
+            actual = rank_time_tables(candidates, database_path = path, phase = "第一轮")
+            writeSeconds.append(perf_counter() - start)
+            if actual != expected:
+                raise AssertionError("写入数据库时 rank_time_tables 排出的顺序不同")
+
+        with ResultDatabase(path) as database:
+            runs = database.runs()
+            if [run["scheduleCount"] for run in runs] != [len(expected)] * arguments.runs:
+                raise AssertionError("数据库中的运行或课表的数量不对")
+            stored = database.connection.execute("SELECT COUNT(*) FROM schedules").fetchone()[0]
+
+            (top, topMilliseconds) = timed(database.best, arguments.top, runId = runs[0]["id"])
+            if [schedule["score"] for schedule in top] != [TimeTable.scoreSectionIds(candidate) for candidate in expected[: arguments.top]]:
+                raise AssertionError("ResultDatabase.best 查询到的前几名的得分不同")
+
+            (courseNo, otherCourseNo) = (Course.sections[expected[0][0]].courseNo, Course.sections[expected[0][1]].courseNo)
+            (containing, containingMilliseconds) = timed(database.best, 1, courseNos = (courseNo,))
+            if containing[0]["score"] != best_score_containing(expected, (courseNo,)) or courseNo not in containing[0]["courseNos"]:
+                raise AssertionError(f"含有 {courseNo} 的得分最高的课表不同")
+
+            (both, bothMilliseconds) = timed(database.best, 1, courseNos = (courseNo, otherCourseNo))
+            if both[0]["score"] != best_score_containing(expected, (courseNo, otherCourseNo)):
+                raise AssertionError(f"含有 {courseNo} 和 {otherCourseNo} 的得分最高的课表不同")
+
+            size = os.path.getsize(path)
+
+    print(f"{arguments.runs} runs of {len(expected)} time tables ({stored} stored): the database returns the same best time tables")
+    print(f"write per run: {', '.join(f'{seconds:.2f}' for seconds in writeSeconds)} s ({size / 1024 / 1024:.1f} MiB)")
+    print(f"top {arguments.top} of the last run: {topMilliseconds:.2f} ms")
+    print(f"best containing {courseNo}: {containingMilliseconds:.2f} ms")
+    print(f"best containing {courseNo} and {otherCourseNo}: {bothMilliseconds:.2f} ms")
@@ -0,0 +1,91 @@
+r"""
+输出课表的正确性与性能测试。
+
+在合成的课程上排出课表，把排名前若干的课表输出到临时文件夹，比较两种输出方式，并检查 CSV 文件的内容是否相同：
+- 每个课表都用`TimeTable.toCsv`以追加模式重新打开一次文件（即原来的`output_csv`）；
+- `ResultWriter`：每个输出文件只打开一次。
+
+另外测量同时输出 CSV、JSON Lines、HTML 三种格式的用时。
+
+## 示例
+
+```shell
+python -m benchmark.result_writer --lessons 200 --tables 2000
+```
+"""
+
+import os
+import json
+from random import Random
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from src.model.result_writer import ResultWriter
+from src.core.arrange_schedule import rank_time_tables
+from benchmark.course_construction import synthesize
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "输出课表的正确性与性能测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--tables", type = int, default = 2000, help = "输出的课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 4, help = "每个课表中的课的数量")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    # 随机抽取候选课表，直到有足够多的没有冲突的课表
+    random = Random(0)
+    candidates = []
+    while len(candidates) < arguments.tables:
+        candidates += rank_time_tables([
+            tuple(course.sectionId for course in random.sample(courses, arguments.courses_per_table))
+            for _ in range(arguments.tables * 10)
+        ])
+    candidates = candidates[: arguments.tables]
+
+    # 两种方式都要创建课表、计算得分，先创建好，只比较写文件的部分
+    timeTables = [TimeTable.fromSectionIds(candidate) for candidate in candidates]
+    for timeTable in timeTables:
+        timeTable.getScore()
+
+    with TemporaryDirectory() as directory:
+        expectedPath = os.path.join(directory, "expected.csv")
+        start = perf_counter()
+        with open(expectedPath, mode = "w", encoding = "gbk"):
+            pass
+        for timeTable in timeTables:
+            timeTable.toCsv(expectedPath)
+        appendSeconds = perf_counter() - start
+
+        start = perf_counter()
+        with ResultWriter(os.path.join(directory, "actual"), ("csv",)) as writer:
+            writer.writeAll(timeTables)
+        writerSeconds = perf_counter() - start
+
+        with open(expectedPath, "rb") as expected, open(writer.paths["csv"], "rb") as actual:
+            if expected.read() != actual.read():
+                raise AssertionError("ResultWriter 输出的 CSV 文件与 TimeTable.toCsv 的不同")
+        print(f"{len(timeTables)} time tables: ResultWriter writes the same CSV as TimeTable.toCsv")
+
+        start = perf_counter()
+        with ResultWriter(os.path.join(directory, "all"), ResultWriter.formats, "utf-8") as writer:
+            writer.writeAll(timeTables)
+        allSeconds = perf_counter() - start
+
+        with open(writer.paths["jsonl"], encoding = "utf-8") as file:
+            ranks = [json.loads(line)["rank"] for line in file]
+        if ranks != list(range(1, len(timeTables) + 1)):
+            raise AssertionError("JSON Lines 文件中的名次不对")
+        sizes = ", ".join(f"{format_} {os.path.getsize(path) / 1024:.0f} KiB" for (format_, path) in writer.paths.items())
+
+    print(f"TimeTable.toCsv per table: {appendSeconds:.3f} s")
+    print(f"ResultWriter csv: {writerSeconds:.3f} s ({appendSeconds / writerSeconds:.1f}x)")
+    print(f"ResultWriter csv + jsonl + html: {allSeconds:.3f} s ({sizes})")
@@ -0,0 +1,66 @@
+r"""
+从教室代码中找出楼的性能测试。
+
+在由所有楼的代码合成的教室代码上，比较两种找出楼的方式，并检查结果是否相同：
+- 按逆序逐个检查楼的代码是不是教室代码的前缀（即原来的`Room._parseCode`）；
+- `buildingTrie.longestPrefix`：在前缀树上最长前缀匹配。
+
+## 示例
+
+```shell
+python -m benchmark.room_parsing --rooms 100000
+```
+"""
+
+from random import Random
+from time import perf_counter
+
+from config.constants import BUILDING_CODES
+from src.util.geography import get_geography
+
+
+REVERSED_BUILDING_CODES = tuple(sorted(BUILDING_CODES, reverse = True))
+
+
+def linear_scan(code:str) -> str|None:
+    r"""
+    按逆序逐个检查楼的代码，返回第一个是`code`的前缀的楼的代码。
+    """
+
+    for building_code in REVERSED_BUILDING_CODES:
+        if code.startswith(building_code):
+            return building_code
+    return None
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "从教室代码中找出楼的性能测试")
+    parser.add_argument("--rooms", type = int, default = 100000, help = "合成的教室代码的数量")
+    arguments = parser.parse_args()
+
+    # 楼的代码加上楼层和序号；也包括没有楼层的、以及不属于任何楼的代码
+    random = Random(0)
+    buildingCodes = sorted(BUILDING_CODES)
+    codes = [
+        random.choice(buildingCodes + ["X", "在线"]) + random.choice(["", f"{random.randint(1, 9)}{random.randint(1, 20):02d}"])
+        for _ in range(arguments.rooms)
+    ]
+
+    start = perf_counter()
+    expected = list(map(linear_scan, codes))
+    scanSeconds = perf_counter() - start
+
+    trie = get_geography().buildingTrie
+    start = perf_counter()
+    actual = [None if match is None else match[0] for match in map(trie.longestPrefix, codes)]
+    trieSeconds = perf_counter() - start
+
+    if actual != expected:
+        raise AssertionError("buildingTrie.longestPrefix 的结果与逐个检查的不同")
+    print(f"{len(codes)} room codes: buildingTrie agrees with the linear scan")
+
+    print(f"linear scan: {scanSeconds:.3f} s")
+    print(f"buildingTrie.longestPrefix: {trieSeconds:.3f} s ({scanSeconds / trieSeconds:.1f}x)")
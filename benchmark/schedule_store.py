@@ -0,0 +1,108 @@
+r"""
+课表库的正确性与性能测试。
+
+在合成的课程上随机抽取候选课表，用`rank_time_tables`排序并写入临时的课表库，检查：
+- 写入课表库时排出的顺序与不写入时相同；
+- `ScheduleStore.rank`排出的前若干名的得分与`rank_time_tables`的相同；
+- `ScheduleStore.sectionCounts`与逐个课表统计的结果相同；
+- 用新的权重重新计算的得分与`TimeTable.scoreOf`的相同。
+
+并测量写入和各种查询的用时。
+
+## 示例
+
+```shell
+python -m benchmark.schedule_store --lessons 200 --candidates 200000
+```
+"""
+
+import os
+from random import Random
+from collections import Counter
+from tempfile import TemporaryDirectory
+from time import perf_counter
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from src.model.schedule_store import ScheduleStore
+from src.core.arrange_schedule import rank_time_tables
+from benchmark.course_construction import synthesize
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "课表库的正确性与性能测试")
+    parser.add_argument("--lessons", type = int, default = 200, help = "合成的课的数量")
+    parser.add_argument("--candidates", type = int, default = 200000, help = "候选课表的数量")
+    parser.add_argument("--courses-per-table", type = int, default = 4, help = "每个候选课表中的课的数量")
+    parser.add_argument("--top", type = int, default = 10, help = "比较的前若干名")
+    arguments = parser.parse_args()
+
+    (lessonJSONs, lessonId2Counts) = synthesize(arguments.lessons)
+    Course.lessonId2Counts |= lessonId2Counts
+    courses = Course.fromJSONs(lessonJSONs)
+
+    random = Random(0)
+    candidates = [
+        tuple(course.sectionId for course in random.sample(courses, arguments.courses_per_table))
+        for _ in range(arguments.candidates)
+    ]
+
+    start = perf_counter()
+    expected = rank_time_tables(candidates)
+    rankSeconds = perf_counter() - start
+
+    with TemporaryDirectory() as directory:
+        path = os.path.join(directory, "schedules.bin")
+
+        start = perf_counter()
+        actual = rank_time_tables(candidates, path)
+        storeSeconds = perf_counter() - start
+        if actual != expected:
+            raise AssertionError("写入课表库时 rank_time_tables 排出的顺序不同")
+
+        with ScheduleStore(path) as store:
+            if len(store) != len(expected):
+                raise AssertionError(f"课表库有 {len(store)} 行，而没有冲突的课表有 {len(expected)} 种")
+
+            start = perf_counter()
+            top = store.rank(arguments.top)
+            topSeconds = perf_counter() - start
+            expectedScores = [TimeTable.scoreSectionIds(candidate) for candidate in expected[: arguments.top]]
+            if [float(store.rows["score"][index]) for index in top] != expectedScores:
+                raise AssertionError("ScheduleStore.rank 排出的前几名的得分不同")
+
+            start = perf_counter()
+            counts = store.sectionCounts()
+            countSeconds = perf_counter() - start
+            expectedCounts = Counter(Course.sections[sectionId].courseNo for candidate in expected for sectionId in candidate)
+            if counts != dict(expectedCounts):
+                raise AssertionError("ScheduleStore.sectionCounts 的统计结果不同")
+
+            courseNo = next(iter(counts))
+            start = perf_counter()
+            mask = store.containing(courseNo)
+            containingTop = store.rank(arguments.top, mask = mask)
+            containingSeconds = perf_counter() - start
+            if any(courseNo not in store.lessonsAt(index) for index in containingTop):
+                raise AssertionError(f"ScheduleStore.rank 返回了不含 {courseNo} 的课表")
+
+            start = perf_counter()
+            scores = store.scores(commuteTimeWeight = 1.0, courseScoreWeight = 2.0)
+            rescoreSeconds = perf_counter() - start
+            for index in random.sample(range(len(store)), min(1000, len(store))):
+                row = store.rows[index]
+                expectedScore = TimeTable.scoreOf(float(row["commuteTime"]), float(row["courseScore"]), commuteTimeWeight = 1.0, courseScoreWeight = 2.0)
+                if abs(scores[index] - expectedScore) > 1e-12:
+                    raise AssertionError("ScheduleStore.scores 重新计算的得分不同")
+
+            size = os.path.getsize(path)
+            del (row, scores, mask)
+
+    print(f"{len(expected)} time tables: the store ranks, counts and rescores the same as the Python code")
+    print(f"rank_time_tables: {rankSeconds:.3f} s, with the store: {storeSeconds:.3f} s ({size / 1024 / 1024:.1f} MiB)")
+    print(f"top {arguments.top}: {topSeconds * 1000:.1f} ms, section counts: {countSeconds * 1000:.1f} ms")
+    print(f"top {arguments.top} containing {courseNo} ({int(counts[courseNo])} time tables): {containingSeconds * 1000:.1f} ms")
+    print(f"rescore with new weights: {rescoreSeconds * 1000:.1f} ms")
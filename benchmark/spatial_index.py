@@ -0,0 +1,62 @@
+r"""
+空间索引的正确性与性能测试。
+
+在复旦大学各校区附近随机取查询点，比较`SpatialIndex.nearest`与逐个计算距离再排序的结果是否相同，并比较两者的用时。
+
+## 示例
+
+```shell
+python -m benchmark.spatial_index --queries 20000 --k 3
+```
+"""
+
+from random import Random
+from time import perf_counter
+
+from config.constants import BUILDING_CODES, BUILDING_LOCATIONS
+from src.model.spatial_index import SpatialIndex
+from src.util.geography import manhattan_distance
+
+
+def brute_force(locations:dict[str, tuple[float, float]], location:tuple[float, float], k:int) -> list[tuple[float, str]]:
+    r"""
+    逐个计算距离，返回离`location`最近的`k`个地点的`(距离, 代码)`。
+    """
+
+    return sorted((manhattan_distance(location, point), code) for (code, point) in locations.items())[:k]
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "空间索引的正确性与性能测试")
+    parser.add_argument("--queries", type = int, default = 20000, help = "查询的次数")
+    parser.add_argument("--k", type = int, default = 3, help = "每次查询的最近的地点的数量")
+    arguments = parser.parse_args()
+
+    locations = {code: BUILDING_LOCATIONS[code] for code in BUILDING_CODES}
+    index = SpatialIndex(locations)
+
+    # 查询点在某栋楼附近（约 ±1 千米），也包括楼本身的位置，以覆盖距离相等的情况
+    random = Random(0)
+    points = list(locations.values())
+    queries = [
+        point if random.random() < 0.1 else (point[0] + random.uniform(-0.01, 0.01), point[1] + random.uniform(-0.01, 0.01))
+        for point in (random.choice(points) for _ in range(arguments.queries))
+    ]
+
+    start = perf_counter()
+    expected = [brute_force(locations, query, arguments.k) for query in queries]
+    bruteSeconds = perf_counter() - start
+
+    start = perf_counter()
+    actual = [index.nearest(query, arguments.k) for query in queries]
+    indexSeconds = perf_counter() - start
+
+    if actual != expected:
+        raise AssertionError("SpatialIndex.nearest 的结果与逐个计算的不同")
+    print(f"{len(queries)} queries over {len(index)} buildings: SpatialIndex.nearest agrees with brute force")
+
+    print(f"brute force: {bruteSeconds:.3f} s")
+    print(f"SpatialIndex.nearest: {indexSeconds:.3f} s ({bruteSeconds / indexSeconds:.1f}x)")
@@ -2,15 +2,41 @@ r"""
 constants
 """
 
+import os
+
 # 所依赖的拓展库
 REQUIRED_MODULES = {
     "bs4": "beautifulsoup4",
     "requests": "requests",
-    "scipy": "scipy",
 }
 
+# 所依赖的拓展库的检查结果的缓存，只对同一个解释器有效
+PREREQUISITES_CACHE_PATH = os.path.join("tmp", "prerequisites.json")
+
+# 要选的课程代码及其 tag 的文件，以及每个 tag 要选的课的数量的文件，见`config.user`
+COURSE_CODES_PATH = r"config/course_codes.csv"
+TAGS_PATH = r"config/tags.csv"
+
+# 配置的快照，源文件被修改后自动重新编译，见`src.model.config_snapshot`
+CONFIG_SNAPSHOT_PATH = os.path.join("tmp", "config_snapshot.json")
+
+# 课程目录的快照，见`config.user.CATALOGUE_MAX_AGE`和`src.model.catalogue_snapshot`
+CATALOGUE_SNAPSHOT_PATH = os.path.join("tmp", "catalogue.bin")
+
 # 日志的路径
-LOG_PATH = r"logs\log.md"
+LOG_PATH = os.path.join("logs", "log.md")
+
+# 结构化日志（JSON Lines）的路径，见`config.user.LOG_JSON`
+LOG_JSON_PATH = os.path.join("logs", "log.jsonl")
+
+# 日志文件的大小上限（字节），超过时轮换为`log.md.1`、`log.md.2`……
+LOG_MAX_BYTES = 1 << 20
+
+# 轮换时保留的旧日志文件的数量
+LOG_BACKUP_COUNT = 3
+
+# 各阶段的用时报告的 JSON 文件，见`config.user.PROFILE_JSON`
+PROFILE_JSON_PATH = os.path.join("logs", "profile.json")
 
 # 日志中的时间格式
 STR_TIME_FORMAT = r"%Y-%m-%d %H:%M:%S"
@@ -18,9 +44,25 @@ STR_TIME_FORMAT = r"%Y-%m-%d %H:%M:%S"
 # 输出结果的文件夹
 RESULT_PATH = r"result"
 
+# 所有没有冲突的课表的库，见`config.user.SCHEDULE_STORE`和`src.model.schedule_store`
+SCHEDULE_STORE_PATH = os.path.join(RESULT_PATH, "schedules.bin")
+
+# 保存每次运行排出的所有课表的数据库，见`config.user.RESULT_DATABASE`和`src.model.result_database`
+RESULT_DATABASE_PATH = os.path.join(RESULT_PATH, "results.sqlite3")
+
+# 诊断输出时，响应文本被写入的文件夹
+DUMP_PATH = r"tmp"
+
+# 诊断输出为`"ring"`模式时，在内存中保留的最近的响应的数量
+DUMP_RING_SIZE = 16
+
+
+# 选课系统的根目录
+# 可以用环境变量`XK_BASE_URL`覆盖，例如指向 src.util.stand_in_server 启动的本地替身服务器
+BASE_URL = os.environ.get("XK_BASE_URL", "https://xk.fudan.edu.cn")
 
 # 登录选课系统的网站
-XK_LOGIN_URL = "https://xk.fudan.edu.cn/xk/login.action"
+XK_LOGIN_URL = f"{BASE_URL}/xk/login.action"
 
 # 选课系统网页 html 文档中，要提交的表单的 id 属性值
 LOGIN_FORM_ID = "loginForm"
@@ -37,17 +79,14 @@ LOGIN_FAIL_INFORMATION = {
 LOGIN_INTERVAL_TIME = 0.13
 
 
-# 选课系统的根目录
-BASE_URL = "https://xk.fudan.edu.cn"
-
 # 选课系统的主页
-XK_HOME_URL = "https://xk.fudan.edu.cn/xk/home.action"
+XK_HOME_URL = f"{BASE_URL}/xk/home.action"
 
 # 选课的入口页面
-XK_STD_ELECT_COURSE_URL = "https://xk.fudan.edu.cn/xk/stdElectCourse.action"
+XK_STD_ELECT_COURSE_URL = f"{BASE_URL}/xk/stdElectCourse.action"
 
 # 选课的默认页面
-XK_STD_ELECT_COURSE_DEFAULT_PAGE_URL = "https://xk.fudan.edu.cn/xk/stdElectCourse!defaultPage.action"
+XK_STD_ELECT_COURSE_DEFAULT_PAGE_URL = f"{BASE_URL}/xk/stdElectCourse!defaultPage.action"
 
 # 进入选课页面失败后，可能会返回包含以下两种错误信息的网页
 ENTER_FAIL_INFORMATION = {
@@ -63,7 +102,7 @@ PHASES_INFORMATION = {
 }
 
 # 查询课程的 URL ，每轮选课都不一样的
-XK_STD_ELECT_COURSE_QUERY_LESSON_URL = 'https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3045'
+XK_STD_ELECT_COURSE_QUERY_LESSON_URL = f"{BASE_URL}/xk/stdElectCourse!queryLesson.action?profileId=3045"
 
 # 查询课程得到的预期错误
 QUERY_ERROR_INFORMATION = {
@@ -2,8 +2,6 @@ r"""
 User's data.
 """
 
-from csv import reader
-
 # 学号和密码
 USERNAME = "你的学号"
 PASSWORD = "你的 UIS 密码"
@@ -15,11 +13,64 @@ SELECTED_COURSES_COUNT = 9
 # 如果可行方案少于`MAX_SCHEDULES_TO_OUTPUT`种，将只输出可行的那几种
 MAX_SCHEDULES_TO_OUTPUT = 10
 
+# 输出课表的格式，可以有多个："csv"（表格）、"jsonl"（每行一个课表的 JSON，便于用其它程序分析）、"html"（用浏览器查看的网页）
+RESULT_FORMATS = ("csv",)
+
+# csv 文件的编码，"gbk"便于用 Excel 打开，"utf-8"便于用其它程序读取
+RESULT_CSV_ENCODING = "gbk"
+
+# 是否把所有没有冲突的课表（而不只是前`MAX_SCHEDULES_TO_OUTPUT`个）及其得分写入 result\schedules.bin
+# 可以用`src.model.schedule_store.ScheduleStore`（需要 NumPy）过滤、统计、用新的权重重新排序，例如统计每门课出现在多少个课表中
+SCHEDULE_STORE = False
+
+# 是否把每次运行排出的所有课表及其得分写入数据库 result\results.sqlite3，便于比较不同的运行
+# 例如，`python -m src.model.result_database MATH120017.06`列出含有这门课的得分最高的课表
+RESULT_DATABASE = False
+
 # 可以排已经选满的课吗？
 # 此选项在第二轮或第三轮选课时有用
 # 若`FULL_OK`为`False`，那么在第二轮或第三轮选课时，会过滤掉那些已经报满了的课
 FULL_OK = False
 
+# 课程目录的快照的有效期（单位：秒）
+# 大于`0`时，每次查询课程后都保存查询结果；在有效期内重新运行（如修改了`TAGS_COUNT`、权重等），直接使用上次的查询结果，不再登录和查询
+# 监视模式总是重新查询
+CATALOGUE_MAX_AGE = 0
+
+# 是否进入监视模式
+# 监视模式会一直运行，每隔`WATCH_INTERVAL_TIME`秒刷新一次选课人数，课表排名前`MAX_SCHEDULES_TO_OUTPUT`名有变化时才重写输出文件
+# 适用于第二轮或第三轮选课，那时课程的名额随时可能空出或被占满
+WATCH = False
+
+# 监视模式下，两次刷新选课人数之间的时间间隔（单位：秒）
+WATCH_INTERVAL_TIME = 60
+
+# 选课系统的响应文本的诊断输出模式，输出到 tmp 文件夹
+# "off"：只在出错时输出出错的那一个响应
+# "ring"：在内存中保留最近的若干个响应，出错时全部输出
+# "async"：由后台线程输出每一个响应
+DUMP_MODE = "ring"
+
+# 日志的级别，由低到高为"DEBUG"、"INFO"、"WARNING"、"ERROR"
+# `LOG_LEVEL`及以上的消息输出到屏幕，`LOG_FILE_LEVEL`及以上的消息写入 logs 文件夹中的日志文件
+# 每个请求都会记录一条"DEBUG"消息
+LOG_LEVEL = "INFO"
+LOG_FILE_LEVEL = "DEBUG"
+
+# 是否同时写入结构化日志（每行一个 JSON 对象），便于用其它程序分析
+LOG_JSON = False
+
+# 是否记录各阶段（登录、进入选课页面、每个查询、解析、分类、组合、检查冲突、评分、输出）的用时，并在结束时输出报告
+PROFILE = False
+
+# 记录用时时，另外用`cProfile`剖析、用`tracemalloc`记录内存分配的阶段，如`("combine", "conflict-check")`
+# 阶段的名称见`src.util.profiling`的报告；两者都会使被剖析的阶段明显变慢
+PROFILE_CPROFILE = ()
+PROFILE_TRACEMALLOC = ()
+
+# 是否把报告同时写入 logs\profile.json
+PROFILE_JSON = False
+
 
 # “通勤时间”和“课程评分”在课程表得分中所占的权重
 COMMUTE_TIME_WEIGHT = 0.0
@@ -36,10 +87,9 @@ SIGMA = 0.618 # 这个值必需大于`0`
 assert SIGMA > 0, f"`SIGMA` 必需大于`0`，但是你输入了{SIGMA}"
 
 
-# 读取 course_codes.csv
-with open(r"config/course_codes.csv", "r", encoding="gbk") as file:
-    COURSE_CODES = {row[0]: row[1] for row in reader(file)}
+# 读取 course_codes.csv 和 tags.csv
+# 它们在第一次运行或被修改后检查、编译一次，之后从快照中读入，见`src.util.config_snapshot`
+from src.util.config_snapshot import get_config_snapshot
 
-# 读取 tags.csv
-with open(r"config/tags.csv", "r", encoding="gbk") as file:
-    TAGS_COUNT = {row[0]: int(row[1]) for row in reader(file)}
+COURSE_CODES = get_config_snapshot().courseCodes
+TAGS_COUNT = get_config_snapshot().tagsCount
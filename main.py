@@ -1,5 +1,8 @@
 r"""
 主程序
+
+只在启动时检查一次依赖的拓展库；`requests`、`bs4`等较慢的库到第一次用到时才导入，
+启动的耗时见`benchmark.cold_start`。
 """
 
 from src.util.install_prerequsites import install_prerequsites
@@ -10,13 +13,22 @@ except BaseException as error:
     print(f"安装依赖的拓展库失败，可能需要管理员权限，错误信息：{type(error).__name__}: {str(error)}")
 
 
-from src.core.arrange_schedule import arrange_schedule
+from config.user import WATCH
 
 
 try:
-    install_prerequsites()
-    arrange_schedule()
+    # 只导入要运行的那个入口
+    if WATCH:
+        from src.core.watch import watch
+        watch()
+    else:
+        from src.core.arrange_schedule import arrange_schedule
+        arrange_schedule()
 except BaseException as error:
     print(f"出错了，错误信息：{type(error).__name__}: {str(error)}")
 
+# `config.user.PROFILE`为`True`时，输出各阶段的用时
+from src.util.profiling import report
+report()
+
 input()
@@ -1,35 +1,53 @@
 r"""
 排课表主程序。
 
-function: arrange_schedule
+排课时，每个候选课表都用课程的`sectionId`（见`Course.sections`）组成的元组表示，
+只有最后要输出的前`MAX_SCHEDULES_TO_OUTPUT`个才会被创建为`TimeTable`对象。
+
+function: arrange_schedule, rank_time_tables
 """
 
 from math import prod
 import os
-from time import asctime
+from time import asctime, localtime
 from itertools import combinations, product
 
-from config.constants import RESULT_PATH
+from config.constants import RESULT_PATH, SCHEDULE_STORE_PATH, RESULT_DATABASE_PATH
 from config.user import COURSE_CODES, TAGS_COUNT, SELECTED_COURSES_COUNT
 from config.user import FULL_OK
 from config.user import MAX_SCHEDULES_TO_OUTPUT
+from config.user import RESULT_FORMATS, RESULT_CSV_ENCODING
+from config.user import SCHEDULE_STORE, RESULT_DATABASE
 from src.model.course import Course
 from src.model.course_group import CourseGroup
 from src.model.time_table import TimeTable
+from src.model.result_writer import ResultWriter
+from src.model.schedule_store import ScheduleStoreWriter
+from src.model.result_database import ResultDatabase
 from src.util.log import log
-from src.core.uis_login import uis_login
-from src.core.std_election_course import enter_std_elect_course_page, query_lesson
+from src.util.file import open_with_default_app
+from src.util.catalogue import load_catalogue, save_catalogue
+from src.util.profiling import span
+from src.core.crawl import crawl
+from src.core.std_election_course import query_lessons
 from src.util import timer
 
 
-def initialize():
+def initialize(use_catalogue:bool = True):
     r"""
-    初始化选课系统登录并进入课程选择页面。
+    初始化选课系统登录并进入课程选择页面，同时查询`COURSE_CODES`中的所有课程。
 
     该函数执行用户登录操作，并导航至选课页面，获取必要的选课信息。
     
-    此函数依赖于外部定义的 `uis_login` 和 `enter_std_elect_course_page` 函数，
-    它们分别负责处理实际的登录过程和进入选课页面后的数据获取。
+    此函数依赖于外部定义的 `crawl` 函数，它在同一个事件循环里依次完成登录、进入选课页面，
+    再并发地发出所有的查询请求。
+
+    如果`use_catalogue`为`True`，并且有`CATALOGUE_MAX_AGE`秒内保存的课程目录的快照（见`src.util.catalogue`），
+    就直接使用快照中的查询结果，不登录、不查询，此时`"session"`和`"query_lesson_url"`为`None`。
+
+    ## 参数
+
+    - `use_catalogue`（`bool`，可选）：是否可以使用课程目录的快照，默认为`True`。需要会话对象时（如监视模式）应为`False`。
 
     ## 返回
 
@@ -37,24 +55,32 @@ def initialize():
             - `"session"`：进入了选课界面的会话对象，用于维持与选课系统服务器的通信。
             - `"phase"`：当前选课阶段的信息或标识，如`"第三轮"`。
             - `"query_lesson_url"`：查询课程列表所必需的URL地址，如`"https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3045"`。
+            - `"query_results"`：以课程代码为键，以该课程代码的查询结果为值的字典。
     """
 
-    # 进行登录、进入页面等操作
-    session = uis_login()
-    data = enter_std_elect_course_page(session)
-
-    return {
-        "session": session,
-        "phase": data["phase"],
-        "query_lesson_url": data["query_lesson_url"],
-    }
-
-
-def classify(session:"Session", phase:str, query_lesson_url:str):
+    # 在有效期内重新运行时，使用上次的查询结果
+    if use_catalogue:
+        catalogue = load_catalogue()
+        if catalogue is not None:
+            log(f"initialize: 使用 {asctime(localtime(catalogue.createdAt))} 保存的查询结果，没有重新查询。")
+            return {
+                "session": None,
+                "phase": catalogue.phase,
+                "query_lesson_url": None,
+                "query_results": catalogue.queryResults,
+            }
+
+    # 进行登录、进入页面、查询课程等操作
+    data = crawl(COURSE_CODES)
+    save_catalogue(data["phase"], data["query_results"])
+    return data
+
+
+def classify(session:"Session", phase:str, query_lesson_url:str, query_results:dict[str, dict]|None = None, full_ok:bool = FULL_OK):
     r"""
     查询课程，并将课程分类到相应的 `code` 下，再将 `code` 归类到相应的 `tag` 下。
 
-    该函数首先通过给定的 `session` 和查询 URL 对指定课程代码的课程进行查询，
+    该函数首先通过给定的 `session` 和查询 URL 对指定课程代码的课程进行查询（如果没有提供查询结果的话），
     然后根据课程代码对查询结果进行过滤和归类。最后，依据预定义的标签（`tag`）对课程代码进行分组。
     
     ## 参数
@@ -62,6 +88,8 @@ def classify(session:"Session", phase:str, query_lesson_url:str):
     - `session`（`requests.Session`）：登录会话对象，用于发送请求。
     - `phase`（`str`）：当前选课阶段的标识符，如“第一轮”、“第二轮”等。
     - `query_lesson_url`（`str`）：查询课程列表所必需的URL地址。
+    - `query_results`（`dict[str, dict]|None`，可选）：已经查询好的结果，以课程代码为键。默认为`None`，此时会并发地查询`COURSE_CODES`中的所有课程代码。
+    - `full_ok`（`bool`，可选）：是否保留已经选满了的课，默认为`FULL_OK`。`src.core.watch`会保留所有的课，再随选课人数的变化自行过滤。
 
     ## 返回
 
@@ -87,31 +115,36 @@ def classify(session:"Session", phase:str, query_lesson_url:str):
     - `UserWarning`：如果配置的 `SELECTED_COURSES_COUNT` 值不正确、某个标签下没有足够的课程等情况时抛出。
     """
 
-    # 查询课程，并将课程归入响应的`code`类
+    # 并发地发送查询请求
+    if query_results is None:
+        query_results = query_lessons(session, query_lesson_url, COURSE_CODES)
+
+    # 将课程归入响应的`code`类
     course_codes = {}
     for code in COURSE_CODES:
-        # 发送查询请求
-        query_result = query_lesson(session = session, url = query_lesson_url, course_code = code)
+        query_result = query_results[code]
 
         # 设置全局选课人数
         Course.lessonId2Counts |= query_result["lessonId2Counts"]
 
         # 创建`Course`对象
-        courses = [Course.fromJSON(lessonJSON) for lessonJSON in query_result["lessonJSONs"]]
+        with span("parse"):
+            courses = Course.fromJSONs(query_result["lessonJSONs"])
 
         # 检查常量`SELECTED_COURSES_COUNT`的正确性
         if len(courses) < SELECTED_COURSES_COUNT:
             raise UserWarning(f"你可能输入了错误的`SELECTED_COURSES_COUNT`值：{SELECTED_COURSES_COUNT}。请到 config.user.py 中重新设置。")
 
+        # 标记已经选了的课，它们排在查询结果的最前面
+        for course in courses[:SELECTED_COURSES_COUNT]:
+            course.isSelected = True
+
         # 过滤掉代码不对的课、选满了的课
         course_codes[code] = [
             courses[index]
             for index in range(len(courses))
             if courses[index].courseCode == code and ( # 代码要正确
-                index < SELECTED_COURSES_COUNT or # 如果这门课已经选了，就不用管它满没满
-                phase not in ("第二轮", "第三轮") or # 如果是第一轮选课，也不用管它满没满
-                FULL_OK or # 如果你觉得满了也没关系，那也不用管它满没满
-                courses[index].probability == 1 # 没满
+                not is_blocked(courses[index], phase, full_ok) # 没满，或者满了也不用管
             )
         ]
 
@@ -130,6 +163,32 @@ def classify(session:"Session", phase:str, query_lesson_url:str):
     return tags
 
 
+def is_blocked(course:Course, phase:str, full_ok:bool = FULL_OK) -> bool:
+    r"""
+    判断`course`是否因为已经选满了而不能排进课表。
+
+    ## 参数
+
+    - `course`（`Course`）：要判断的课程，需要已经由`classify`标记过`isSelected`。
+    - `phase`（`str`）：当前选课阶段，如`"第三轮"`。
+    - `full_ok`（`bool`，可选）：满了的课是否也可以排，默认为`FULL_OK`。
+
+    ## 返回
+
+    - `bool`：这门课已经满了，并且不属于下面任何一种情况时，返回`True`：
+        - 这门课已经选了；
+        - 现在是第一轮选课；
+        - `full_ok`为`True`。
+    """
+
+    return not (
+        course.isSelected or # 如果这门课已经选了，就不用管它满没满
+        phase not in ("第二轮", "第三轮") or # 如果是第一轮选课，也不用管它满没满
+        full_ok or # 如果你觉得满了也没关系，那也不用管它满没满
+        course.probability == 1 # 没满
+    )
+
+
 def combine_courses(tags:dict[str, dict]):
     r"""
     尝试所有可能的组合来安排课程表。
@@ -159,7 +218,7 @@ def combine_courses(tags:dict[str, dict]):
 
     ## 返回
 
-    - `list`：所有可能的、无冲突的课程组合列表。每个组合是一个元组，其中包含了多个课程对象。这些课程在 Tag 组内是无时间冲突的。
+    - `list[tuple[int]]`：所有可能的、无冲突的课程组合（候选课表）列表。每个组合是由课程的`sectionId`组成的元组。这些课程在 Tag 组内是无时间冲突的。
 
     ## 注意
 
@@ -179,9 +238,9 @@ def combine_courses(tags:dict[str, dict]):
         tags_prod[tag] = ()
         for code_combination in code_combinations:
             course_groups = tuple(
-                courses
+                tuple(course.sectionId for course in courses)
                 for courses in product(*code_combination)
-                if not CourseGroup(courses).isConflict
+                if not CourseGroup.isConflicting(courses)
             )
             tags_prod[tag] += course_groups
 
@@ -210,17 +269,23 @@ def arrange_schedule():
 
     该函数首先通过调用 `classify` 和 `initialize` 函数初始化课程信息并分类课程，
     然后使用 `combine_courses` 函数生成所有可能的课程组合。接着，它遍历每个课程组合，
-    创建相应的课表对象，并过滤掉存在时间冲突的课表。最后，对剩余的无冲突课表按照评分进行排序，
-    并将排名前 `MAX_SCHEDULES_TO_OUTPUT` 的课表输出到一个CSV文件中。
+    过滤掉存在时间冲突的组合。最后，对剩余的无冲突课表按照评分进行排序，
+    并将排名前 `MAX_SCHEDULES_TO_OUTPUT` 的课表创建为课表对象，输出到一个CSV文件中。
 
     ## 返回
     
-    - 无直接返回值。但是，该函数会生成一个包含排名前 `MAX_SCHEDULES_TO_OUTPUT` 的课程表的CSV文件。
+    - `dict`：包含以下键的字典，可以交给`src.core.refresh.refresh_schedule`只刷新选课人数并重新排序：
+        - `"session"`：进入了选课界面的会话对象；使用课程目录的快照时为`None`，见`initialize`。
+        - `"query_lesson_url"`：查询课程的 API URL；使用课程目录的快照时为`None`。
+        - `"candidates"`：按照评分排好序的、没有冲突的候选课表，每个都是课程的`sectionId`组成的元组。
+    - 同时，该函数会生成一个包含排名前 `MAX_SCHEDULES_TO_OUTPUT` 的课程表的CSV文件。
 
     ## 注意
 
     - 在第一轮选课时，或者在 `FULL_OK=True`时，此过程可能会比较耗时（如：1小时），请确保有充足的计算资源和时间。
-    - 输出的CSV文件路径基于当前时间命名，位于 `result` 目录下，并使用GBK编码。
+    - 输出的文件基于当前时间命名，位于 `result` 目录下，格式见`config.user.RESULT_FORMATS`，CSV 文件的编码见`config.user.RESULT_CSV_ENCODING`。
+    - `config.user.SCHEDULE_STORE`为`True`时，所有没有冲突的课表还会写入`SCHEDULE_STORE_PATH`，见`rank_time_tables`。
+    - `config.user.RESULT_DATABASE`为`True`时，所有没有冲突的课表还会作为一次运行写入`RESULT_DATABASE_PATH`。
 
     ## 示例
 
@@ -233,59 +298,143 @@ def arrange_schedule():
     排名前 10 的课程表已经记录完成，在 result\Thu Feb 20 09：48：00 2025.csv 文件里。
     """
 
-    tags = classify(**initialize())
-    course_combinitions = combine_courses(tags)
-    count = len(course_combinitions)
+    with span("initialize"):
+        data = initialize()
+    with span("classify"):
+        tags = classify(**data)
+    with span("combine"):
+        course_combinitions = combine_courses(tags)
+    candidates = rank_time_tables(
+        course_combinitions,
+        store_path = SCHEDULE_STORE_PATH if SCHEDULE_STORE else None,
+        database_path = RESULT_DATABASE_PATH if RESULT_DATABASE else None,
+        phase = data["phase"],
+    )
 
-    # 创建课表，留下没有冲突的课表
-    time_tables = []
-    timer.reset()
-    for (index, time_table) in enumerate(map(TimeTable, course_combinitions)):
-        if timer.read() > 10:
-            print(f"已处理了 {index} 个课程表：{round(index / count * 100, 2)}%")
-            timer.reset()
+    # 输出课表
+    output_results(candidates)
 
-        # 将刚刚创建的课表添加到列表中
-        if not time_table.isConflict:
-            time_tables.append(time_table)
-    log(f"arrange_schedule: 共有{len(time_tables)}种没有冲突的课程表。")
+    return {
+        "session": data["session"],
+        "query_lesson_url": data["query_lesson_url"],
+        "candidates": candidates,
+    }
 
-    # 按照得分进行排序
-    time_tables.sort(key = TimeTable.getScore, reverse = True)
 
-    # 输出课表
-    output_csv(time_tables)
+def rank_time_tables(
+    course_combinitions:list[tuple[int]],
+    store_path:str|None = None,
+    database_path:str|None = None,
+    phase:str|None = None,
+) -> list[tuple[int]]:
+    r"""
+    过滤掉存在时间冲突的候选课表，并按照评分从高到低排序。
+
+    不会为每个候选课表创建`TimeTable`对象：冲突由`CourseGroup.isConflicting`直接检查，
+    评分由`TimeTable.scoreSectionIds`直接计算。
+
+    ## 参数
+
+    - `course_combinitions`（`list[tuple[int]]`）：`combine_courses`返回的候选课表列表。
+    - `store_path`（`str|None`，可选）：课表库的路径，默认为`None`，即不写入。
+        不为`None`时，把所有没有冲突的候选课表（按照过滤的顺序）及其通勤时间、课程得分、综合得分写入课表库，
+        见`src.model.schedule_store`；排序的结果与不写入时相同。
+    - `database_path`（`str|None`，可选）：结果数据库的路径，默认为`None`，即不写入。
+        不为`None`时，把排好序的所有候选课表及其得分作为一次运行写入数据库，见`src.model.result_database`。
+    - `phase`（`str|None`，可选）：选课阶段，记录在结果数据库中。
 
+    ## 返回
+
+    - `list[tuple[int]]`：没有冲突的候选课表，已经按照评分从高到低排好序。
+    """
+
+    count = len(course_combinitions)
+    sections = Course.sections
+
+    # 留下没有冲突的候选课表
+    candidates = []
+    timer.reset()
+    with span("conflict-check"):
+        for (index, candidate) in enumerate(course_combinitions):
+            if timer.read() > 10:
+                print(f"已处理了 {index} 个课程表：{round(index / count * 100, 2)}%")
+                timer.reset()
+
+            if not CourseGroup.isConflicting([sections[sectionId] for sectionId in candidate]):
+                candidates.append(candidate)
+    log(f"arrange_schedule: 共有{len(candidates)}种没有冲突的课程表。")
 
-def output_csv(time_tables: list[TimeTable]) -> str:
+    # 按照得分进行排序
+    if store_path is None and database_path is None:
+        with span("score"):
+            candidates.sort(key = TimeTable.scoreSectionIds, reverse = True)
+        return candidates
+
+    # 要写入课表库或结果数据库时，记下得分的各个部分：通勤时间、课程得分、综合得分
+    with span("score"):
+        components = []
+        for candidate in candidates:
+            courses = [sections[sectionId] for sectionId in candidate]
+            commute_time = TimeTable.commuteTimeOf(courses)
+            course_score = TimeTable.courseScoreOf(courses)
+            components.append((commute_time, course_score, TimeTable.scoreOf(commute_time, course_score)))
+
+        order = sorted(range(len(candidates)), key = lambda index: components[index][2], reverse = True)
+
+    if store_path is not None:
+        width = max(map(len, candidates), default = 0)
+        with span("store"), ScheduleStoreWriter(store_path, width) as writer:
+            for (candidate, component) in zip(candidates, components):
+                writer.append(candidate, *component)
+        log(f"arrange_schedule: {writer.count} 种没有冲突的课程表已经写入 {store_path} 。")
+
+    candidates = [candidates[index] for index in order]
+
+    if database_path is not None:
+        with span("database"), ResultDatabase(database_path) as database:
+            run_id = database.addRun(phase, candidates, [components[index] for index in order])
+        log(f"arrange_schedule: {len(candidates)} 种没有冲突的课程表已经作为第 {run_id} 次运行写入 {database_path} 。")
+
+    return candidates
+
+
+def output_results(
+    candidates: list[tuple[int]],
+    base_path:str|None = None,
+    open_file:bool = True,
+    count:int = MAX_SCHEDULES_TO_OUTPUT,
+    formats:"Iterable[str]" = RESULT_FORMATS,
+    csv_encoding:str = RESULT_CSV_ENCODING,
+) -> list[str]:
     r"""
-    将前 `MAX_SCHEDULES_TO_OUTPUT` 名的课程表输出到 csv 文件。
+    将前 `count` 名的课程表输出到文件，每种格式一个文件，见`src.model.result_writer.ResultWriter`。
+
+    只有这些课程表会被创建为`TimeTable`对象，每个输出文件只打开一次。
 
     ## 参数
 
-    - `time_tables: list[TimeTable]`：已经排好序了的课程表列表。
+    - `candidates: list[tuple[int]]`：已经排好序了的候选课表列表，每个都是课程的`sectionId`组成的元组。
+    - `base_path: str|None`：不带扩展名的输出路径，文件已存在时会被覆盖。默认为`None`，即在`RESULT_PATH`下以当前时间命名。
+    - `open_file: bool`：输出后是否用默认的程序打开第一个输出文件（只在 Windows 上），默认为`True`。
+    - `count: int`：输出的课程表的数量，默认为`MAX_SCHEDULES_TO_OUTPUT`。
+    - `formats: Iterable[str]`：输出的格式，默认为`RESULT_FORMATS`。
+    - `csv_encoding: str`：CSV 文件的编码，默认为`RESULT_CSV_ENCODING`。
 
     ## 返回
 
-    - 输出的 .csv 文件的相对路径。
+    - `list[str]`：输出的文件的相对路径，与`formats`的顺序相同。
     """
 
-    # 确保输出文件夹存在
-    if not os.path.isdir(RESULT_PATH):
-        os.makedirs(RESULT_PATH)
-
-    # 创建输出文件
-    now_time = asctime().replace(':', '：')
-    csv_path = os.path.join(RESULT_PATH, f"{now_time}.csv")
-    with open(csv_path, mode = "w", encoding="gbk"):
-        pass
-
-    # 输出前`MAX_SCHEDULES_TO_OUTPUT`名
-    for (index, time_table) in enumerate(time_tables):
-        if index >= MAX_SCHEDULES_TO_OUTPUT:
-            break
-        time_table.toCsv(csv_path)
-
-    log(f"排名前 {index} 的课程表已经记录完成，在 {csv_path} 文件里。")
-    os.startfile(csv_path)
-    return csv_path
+    if base_path is None:
+        now_time = asctime().replace(':', '：')
+        base_path = os.path.join(RESULT_PATH, now_time)
+
+    # 输出前`count`名
+    with span("output"), ResultWriter(base_path, formats, csv_encoding) as writer:
+        writer.writeAll(TimeTable.fromSectionIds(candidate) for candidate in candidates[:count])
+    paths = list(writer.paths.values())
+
+    log(f"排名前 {writer.count} 的课程表已经记录完成，在 {'、'.join(paths)} 文件里。")
+    if open_file and not open_with_default_app(paths[0]):
+        log(f"请手动打开 {paths[0]} 文件。")
+    return paths
@@ -0,0 +1,63 @@
+r"""
+把登录、进入选课页面、查询课程这一整套网络请求放进同一个事件循环里执行。
+
+function: crawl
+"""
+
+import asyncio
+
+from config.user import USERNAME, PASSWORD
+from src.core.uis_login import async_uis_login
+from src.core.std_election_course import async_enter_std_elect_course_page, async_query_lessons
+from src.util.profiling import span
+
+
+async def async_crawl(course_codes, username:str = USERNAME, password:str = PASSWORD) -> dict:
+    r"""
+    `crawl`的异步版本，参数、返回值和异常都与之相同。
+    """
+
+    # 登录和进入选课页面有先后依赖，只能依次进行
+    with span("login"):
+        session = await async_uis_login(username, password)
+    with span("enter"):
+        data = await async_enter_std_elect_course_page(session)
+
+    # 所有的查询请求并发进行，共用同一个限速器
+    query_results = await async_query_lessons(session, data["query_lesson_url"], course_codes)
+
+    return {
+        "session": session,
+        "phase": data["phase"],
+        "query_lesson_url": data["query_lesson_url"],
+        "query_results": query_results,
+    }
+
+
+def crawl(course_codes, username:str = USERNAME, password:str = PASSWORD) -> dict:
+    r"""
+    登录选课系统、进入选课页面，并查询`course_codes`中的所有课程代码。
+
+    所有请求都在同一个事件循环中发出，并共用`src.util.rate_limit`中的限速器；
+    查询请求是并发的，一个响应的解析和其它请求的等待可以同时进行。
+
+    ## 参数
+
+    - `course_codes`（`Iterable[str]`）：要查询的课程代码。
+    - `username`（`str`）：用户名。
+    - `password`（`str`）：密码。
+
+    ## 返回
+
+    - `dict`：包含以下键的字典：
+        - `"session"`：进入了选课界面的会话对象。
+        - `"phase"`：当前选课阶段，如`"第三轮"`。
+        - `"query_lesson_url"`：查询课程的 API URL。
+        - `"query_results"`：以课程代码为键，以该课程代码的查询结果为值的字典，详见`query_lesson`。
+
+    ## 异常
+
+    - 与`uis_login`、`enter_std_elect_course_page`、`query_lesson`相同。
+    """
+
+    return asyncio.run(async_crawl(course_codes, username, password))
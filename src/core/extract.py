@@ -0,0 +1,215 @@
+r"""
+基于`html.parser.HTMLParser`事件回调的轻量提取器，只读取所需的几个字段，读到之后立即停止解析。
+
+`src.core.uis_login`和`src.core.parse`中的解析函数先使用这里的提取器，只有提取失败（返回`None`）时才退回到`BeautifulSoup`。
+
+function: extract_login_form
+function: extract_std_elect_course_page
+function: extract_std_elect_course_default_page
+"""
+
+from html.parser import HTMLParser
+
+
+class _Done(Exception):
+    r"""
+    已经取得所需的全部字段，用于提前结束`HTMLParser.feed`。
+    """
+    pass
+
+
+class _Extractor(HTMLParser):
+    r"""
+    提取器的基类。子类在`handle_starttag`等回调中填写`self.result`，取得全部字段后调用`self.done()`。
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs = True)
+        self.result = None
+        self.finished = False
+
+
+    def done(self) -> None:
+        r"""
+        停止解析。
+        """
+
+        self.finished = True
+        raise _Done()
+
+
+    def extract(self, html:str) -> dict[str, str]|None:
+        r"""
+        解析`html`，直到取得全部字段。
+
+        ## 返回
+
+        - `dict[str, str]|None`：取得的字段；如果读完整个文档还没有取得全部字段，则返回`None`。
+        """
+
+        try:
+            self.feed(html)
+            self.close()
+        except _Done:
+            pass
+
+        return self.result if self.finished else None
+
+
+
+class _LoginFormExtractor(_Extractor):
+    r"""
+    提取`id`为`form_id`的`<form>`元素中所有`<input>`元素的`name`和`value`。
+    """
+
+    def __init__(self, form_id:str):
+        super().__init__()
+        self.form_id = form_id
+        self.inForm = False
+
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "form" and not self.inForm:
+            if dict(attrs).get("id") == self.form_id:
+                self.inForm = True
+                self.result = {}
+        elif tag == "input" and self.inForm:
+            attrs = dict(attrs)
+            if "name" in attrs:
+                self.result[attrs["name"]] = attrs.get("value") or ""
+
+
+    def handle_endtag(self, tag):
+        if tag == "form" and self.inForm:
+            self.done()
+
+
+
+class _StdElectCoursePageExtractor(_Extractor):
+    r"""
+    在`id`为`electIndexNotice0`的选课通知板中，提取第一个`<h2>`的文本、
+    `name`为`stdElectCourseIndexForm0`的表单的`action`，以及其中`name`为`electionProfile.id`的`<input>`的`value`。
+    """
+
+    def __init__(self):
+        super().__init__()
+
+        # 在选课通知板内的`<div>`的层数，`0`表示不在通知板内
+        self.divDepth = 0
+        self.inH2 = False
+        self.inForm = False
+        self.phaseParts = None
+
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "div":
+            if self.divDepth:
+                self.divDepth += 1
+            elif dict(attrs).get("id") == "electIndexNotice0":
+                self.divDepth = 1
+                self.result = {}
+            return
+
+        if not self.divDepth:
+            return
+
+        if tag == "h2" and self.phaseParts is None:
+            self.inH2 = True
+            self.phaseParts = []
+        elif tag == "form" and dict(attrs).get("name") == "stdElectCourseIndexForm0":
+            self.inForm = True
+            self.result["action"] = dict(attrs).get("action")
+        elif tag == "input" and self.inForm:
+            attrs = dict(attrs)
+            if attrs.get("name") == "electionProfile.id":
+                self.result["electionProfile.id"] = attrs.get("value")
+                self.done()
+
+
+    def handle_startendtag(self, tag, attrs):
+        # `<input ... />`是自闭合的，不会改变`<div>`的层数
+        if tag != "div":
+            self.handle_starttag(tag, attrs)
+
+
+    def handle_endtag(self, tag):
+        if not self.divDepth:
+            return
+
+        if tag == "h2" and self.inH2:
+            self.inH2 = False
+            self.result["phase"] = "".join(self.phaseParts)
+        elif tag == "form":
+            self.inForm = False
+        elif tag == "div":
+            self.divDepth -= 1
+
+            # 选课通知板结束了，还没有找到全部字段
+            if not self.divDepth:
+                raise _Done()
+
+
+    def handle_data(self, data):
+        if self.inH2:
+            self.phaseParts.append(data)
+
+
+
+class _QueryLessonScriptExtractor(_Extractor):
+    r"""
+    提取`id`为`queryLesson_script`的`<script>`元素的`src`。
+    """
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "script":
+            attrs = dict(attrs)
+            if attrs.get("id") == "queryLesson_script" and attrs.get("src") is not None:
+                self.result = {"src": attrs["src"]}
+                self.done()
+
+
+
+def extract_login_form(html:str, form_id:str) -> dict[str, str]|None:
+    r"""
+    提取`id`为`form_id`的`<form>`元素下所有`<input>`元素的`name`和`value`，读到`</form>`就停止。
+
+    ## 返回
+
+    - `dict[str, str]|None`：以`name`为键、`value`为值的字典，没有`value`的为`""`；如果找不到完整的表单，返回`None`。
+    """
+
+    return _LoginFormExtractor(form_id).extract(html)
+
+
+def extract_std_elect_course_page(html:str) -> dict[str, str]|None:
+    r"""
+    从选课入口页面中提取`"phase"`（选课阶段的原文）、`"action"`（表单的相对 URL）和`"electionProfile.id"`，
+    读到`electionProfile.id`就停止。
+
+    ## 返回
+
+    - `dict[str, str]|None`：包含以上三个键的字典；如果找不到选课通知板或其中缺少任何一个字段，返回`None`。
+    """
+
+    result = _StdElectCoursePageExtractor().extract(html)
+    if result is None or None in (result.get("phase"), result.get("action"), result.get("electionProfile.id")):
+        return None
+    return result
+
+
+def extract_std_elect_course_default_page(html:str) -> dict[str, str]|None:
+    r"""
+    从选课默认页面中提取`<script id="queryLesson_script">`的`"src"`，读到它就停止。
+
+    ## 返回
+
+    - `dict[str, str]|None`：`{"src": 查询课程的相对 URL}`；如果找不到，返回`None`。
+    """
+
+    # 先直接找到这个`<script>`元素的开头，只解析从那里开始的部分
+    index = html.find("queryLesson_script")
+    if index == -1:
+        return None
+    start = max(html.rfind("<script", 0, index), 0)
+
+    return _QueryLessonScriptExtractor().extract(html[start:])
@@ -5,19 +5,22 @@ function: parse_std_elect_course_page
 function: parse_std_elect_course_default_page
 function: simplify_phase
 function: jsonfy_query_response
+function: jsonfy_query_counts
 """
 
 import json
-import re
-
-from bs4 import BeautifulSoup
 
 from config.constants import BASE_URL
 from config.constants import PHASES_INFORMATION
 from src.model.error import EntranceNotFoundError, EntranceNotOpenedError, HTMLError
+from src.core.extract import extract_std_elect_course_page, extract_std_elect_course_default_page
 from src.util.log import log
 
 
+# 解码 JSON 的解码器，`raw_decode`可以从字符串的任意位置开始解码
+_json_decoder = json.JSONDecoder()
+
+
 def parse_std_elect_course_page(html: str) -> dict[str, str]:
     r"""
     解析学生选课页面，并提取有关当前选课阶段和选课入口ID的信息。
@@ -47,6 +50,35 @@ def parse_std_elect_course_page(html: str) -> dict[str, str]:
     # 要返回的数据
     data = {}
 
+    # 先用轻量的提取器，失败了再用`BeautifulSoup`完整地解析
+    fields = extract_std_elect_course_page(html)
+    if fields is None:
+        fields = _soup_std_elect_course_page(html)
+
+    # 本次选课的阶段，如`"2024-2025 学年 2 学期 第三轮"`
+    data["phase"] = fields["phase"]
+
+    # 表单被提交的目标 URL
+    data["action_url"] = BASE_URL + fields["action"]
+
+    # electionProfile.id 的值，如"3045"
+    data["electionProfile.id"] = fields["electionProfile.id"]
+
+    return data
+
+
+def _soup_std_elect_course_page(html: str) -> dict[str, str]:
+    r"""
+    用`BeautifulSoup`解析选课入口页面，返回与`extract_std_elect_course_page`相同的字段。
+
+    异常与`parse_std_elect_course_page`相同。
+    """
+
+    from bs4 import BeautifulSoup
+
+    # 要返回的数据
+    fields = {}
+
     # 解析 html 文档
     soup = BeautifulSoup(html, "html.parser")
 
@@ -55,38 +87,38 @@ def parse_std_elect_course_page(html: str) -> dict[str, str]:
 
     # 如果没有找到选课通知板，说明当前没有任何选课入口
     if notice_div is None:
-        log("parse_std_elect_course_page：没有找到任何选课入口")
+        log("parse_std_elect_course_page：没有找到任何选课入口", "ERROR")
         raise EntranceNotFoundError("There is no course selection entrance.")
 
     # 提取本次选课的阶段，如`"2024-2025 学年 2 学期 第三轮"`
-    data["phase"] = notice_div.find("h2").text
+    fields["phase"] = notice_div.find("h2").text
 
     # 选课表单
     elect_course_form = notice_div.find("form", {"name":"stdElectCourseIndexForm0"})
 
     # 表单被提交的目标 URL
-    data["action_url"] = BASE_URL + elect_course_form["action"]
+    fields["action"] = elect_course_form["action"]
 
     # 提取藏有 "electionProfile.id" 的 <input> 元素
     input_tag = elect_course_form.find("input", {"name":"electionProfile.id"})
 
     # 如果没有找到该元素，说明当前没有开放的选课入口
     if input_tag is None:
-        log("parse_std_elect_course_page：没有开放的选课入口")
+        log("parse_std_elect_course_page：没有开放的选课入口", "ERROR")
         raise EntranceNotOpenedError("There is no course selection entrance opened.")
 
     # 提取 electionProfile.id 的值，如"3045"
-    data["electionProfile.id"] = input_tag["value"]
+    fields["electionProfile.id"] = input_tag["value"]
 
-    return data
+    return fields
 
 
 def parse_std_elect_course_default_page(html: str) -> dict[str, str]:
     r"""
     解析学生选课默认页面的 HTML，提取并返回包含查询课程 API 的 URL。
 
-    该函数接收一个 HTML 字符串作为输入，通过`BeautifulSoup`库解析此 HTML，
-    并查找特定 ID 的`<script>`标签来获取查询课程的 API 地址。最终，将 API 地址
+    该函数接收一个 HTML 字符串作为输入，先用`src.core.extract`中的轻量提取器查找特定 ID 的`<script>`标签，
+    找不到时再通过`BeautifulSoup`库完整地解析此 HTML，以获取查询课程的 API 地址。最终，将 API 地址
     以字典的形式返回。
 
     ## 参数
@@ -116,19 +148,26 @@ def parse_std_elect_course_default_page(html: str) -> dict[str, str]:
     # 要解析出并返回的数据
     outcome = {}
 
-    # 解析 html 文档
-    soup = BeautifulSoup(html, 'html.parser')
+    # 先用轻量的提取器，失败了再用`BeautifulSoup`完整地解析
+    fields = extract_std_elect_course_default_page(html)
+    if fields is None:
+        from bs4 import BeautifulSoup
 
-    # 提取存有查询课程的 API 的 <script> 元素
-    query_lesson_script = soup.find("script", {"id": "queryLesson_script"})
+        # 解析 html 文档
+        soup = BeautifulSoup(html, 'html.parser')
 
-    # 如果找不到该元素，则报错
-    if query_lesson_script is None:
-        log(f'parse_std_elect_course_default_page：解析页面失败，没有找到 <script id="queryLesson_script"> 元素。\n{html}')
-        raise HTMLError('expected <script id="queryLesson_script"> not found in this HTML document', html)
+        # 提取存有查询课程的 API 的 <script> 元素
+        query_lesson_script = soup.find("script", {"id": "queryLesson_script"})
+
+        # 如果找不到该元素，则报错
+        if query_lesson_script is None:
+            log(f'parse_std_elect_course_default_page：解析页面失败，没有找到 <script id="queryLesson_script"> 元素。\n{html}', "ERROR")
+            raise HTMLError('expected <script id="queryLesson_script"> not found in this HTML document', html)
+
+        fields = {"src": query_lesson_script["src"]}
 
     # 提取查询课程的 API ，例如"https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3025"
-    outcome["query_lesson_url"] = BASE_URL + query_lesson_script["src"]
+    outcome["query_lesson_url"] = BASE_URL + fields["src"]
 
     return outcome
 
@@ -159,13 +198,40 @@ def simplify_phase(phase_text: str) -> str:
     raise ValueError(f"Unable to find information about the course selection phase in {phase_text}")
 
 
+def _find_assignment(response_text:str, name:str, start:int = 0) -> int:
+    r"""
+    在`response_text`中从`start`开始寻找对`name`的赋值语句，返回等号右边第一个非空白字符的下标。
+
+    ## 异常
+
+    - `ValueError`：如果找不到对`name`的赋值。
+    """
+
+    index = response_text.find(name, start)
+    while index != -1:
+        # 跳过变量名和等号前后的空白字符
+        position = index + len(name)
+        while position < len(response_text) and response_text[position].isspace():
+            position += 1
+        if position < len(response_text) and response_text[position] == "=":
+            position += 1
+            while position < len(response_text) and response_text[position].isspace():
+                position += 1
+            return position
+
+        # 这里只是提到了`name`，不是赋值，继续往后找
+        index = response_text.find(name, index + len(name))
+
+    raise ValueError(f"cannot find the assignment to `{name}` in `response_text`: {response_text}")
+
+
 def jsonfy_query_response(response_text:str) -> {"lessonJSONs":list[dict[str, object]], "lessonId2Counts":dict[str, dict[str, int]]}:
     r"""
     从给定的 `response_text` 中提取并解析 `lessonJSONs` 和 `lessonId2Counts` 数据。
     
     ## 参数
 
-    - `response_text`（`str`）：包含需要解析数据的响应文本。格式示例参考：static/javascript/case/query_result.js
+    - `response_text`（`str`）：包含需要解析数据的响应文本。格式示例参考：static/javascript/case/result.js
     
     ## 返回
     
@@ -175,54 +241,75 @@ def jsonfy_query_response(response_text:str) -> {"lessonJSONs":list[dict[str, ob
     
     ## 异常
 
-    - `ValueError`：当在 `response_text` 中无法匹配到 `lessonJSONs` 或 `lessonId2Counts`，或者它们的字符串内容不符合 JSON 编码格式时抛出。
+    - `ValueError`：当在 `response_text` 中找不到 `lessonJSONs` 或 `lessonId2Counts`，或者它们的字符串内容不符合 JSON 编码格式时抛出。
     
     ## 注意
 
-    - `response_text` 应遵循特定的格式，其中 `lessonJSONs` 和 `lessonId2Counts` 分别通过正则表达式模式匹配和提取。
-    - 在处理 `lessonId2Counts_string` 时，会进行特定的替换（如将单引号替换成双引号）以确保其符合标准的 JSON 格式要求。
-    - 该函数假设 `response_text` 包含有效的 JavaScript 代码片段，从中可以提取出目标 JSON 字符串。
+    - 不使用正则表达式：先用`str.find`找到`lessonJSONs`的赋值语句，再用`json.JSONDecoder.raw_decode`直接在`response_text`上解码，
+      不需要先把几 MB 的 JSON 字符串复制出来。
+    - `lessonId2Counts` 的解析见 `jsonfy_query_counts`，它从 `lessonJSONs` 结束的位置接着往后找。
     """
 
-    # 正则匹配模式
-    lessonJSONs_pattern = r"var\s+lessonJSONs\s*=\s*(\[.*?\])\s*;"
-    lessonId2Counts_pattern = r"window\s*\.\s*lessonId2Counts\s*=\s*({.*?})\s*(?:;|$)"
-
-    # 开始匹配
-    lessonJSONs_match = re.search(lessonJSONs_pattern, response_text, re.DOTALL) # re.DOTALL 使 `.` 匹配包括换行符在内的一切字符
-    lessonId2Counts_match = re.search(lessonId2Counts_pattern, response_text, re.DOTALL)
-
-    # 检查匹配结果
-    if lessonJSONs_match is None:
-        raise ValueError(f"cannot match `lessonJSONs` ({lessonJSONs_pattern}) in `response_text`: {response_text}")
-    if lessonId2Counts_match is None:
-        raise ValueError(f"cannot match `lessonId2Counts` ({lessonId2Counts_pattern}) in `response_text`: {response_text}")
-
-    # 获取并处理匹配到的 JSON 字符串
-    lessonJSONs_string = lessonJSONs_match.group(1)
-    lessonId2Counts_string = lessonId2Counts_match.group(1)
-    replacement = {
-        "\'": "\"",
-        "sc": "\"sc\"",
-        "lc": "\"lc\""
-    }
-    for (old, new) in replacement.items():
-        # 将 `lessonId2Counts_string` 转换为标准的 JSON 字符串
-        lessonId2Counts_string = lessonId2Counts_string.replace(old, new)
-
-    # 将 JSON 字符串解码为 Python 对象
+    # 找到`lessonJSONs`的值的开头，并原地解码
+    start = _find_assignment(response_text, "lessonJSONs")
     try:
-        lessonJSONs = json.loads(lessonJSONs_string)
+        lessonJSONs, end = _json_decoder.raw_decode(response_text, start)
     except json.decoder.JSONDecodeError as error:
-        message = f"The string in the `lessonJSONs` section does not conform to the JSON encoding format ({str(error)}) : {lessonJSONs_string}"
+        message = f"The string in the `lessonJSONs` section does not conform to the JSON encoding format ({str(error)}) : {response_text[start:start + 200]}"
         raise ValueError(message) from error
+
+    return {
+        "lessonJSONs": lessonJSONs,
+        "lessonId2Counts": jsonfy_query_counts(response_text, end)
+    }
+
+
+def jsonfy_query_counts(response_text:str, start:int|None = None) -> dict[str, dict[str, int]]:
+    r"""
+    只从给定的 `response_text` 中提取并解析 `lessonId2Counts` 数据，不解析体积大得多的 `lessonJSONs`。
+
+    用于只需要更新选课人数的场合，例如`src.core.refresh`。
+
+    ## 参数
+
+    - `response_text`（`str`）：包含需要解析数据的响应文本。格式示例参考：static/javascript/case/result.js
+    - `start`（`int|None`，可选）：从哪里开始寻找。默认为`None`，即从最后一个`lessonId2Counts`开始，跳过前面的`lessonJSONs`。
+
+    ## 返回
+
+    - `dict[str, dict[str, int]]`：以课程`id`为键，以`{"sc": 已选人数, "lc": 上限人数}`为值的字典。
+
+    ## 异常
+
+    - `ValueError`：当在 `response_text` 中找不到 `lessonId2Counts`，或者它的字符串内容不符合 JSON 编码格式时抛出。
+
+    ## 注意
+
+    - `lessonId2Counts` 是 JavaScript 对象字面量（如`{'737991':{sc:51,lc:100}}`），而不是 JSON ，
+      所以只把这一小段取出来，进行特定的替换（如将单引号替换成双引号）后再解码。
+    """
+
+    if start is None:
+        start = max(response_text.rfind("lessonId2Counts"), 0)
+    start = _find_assignment(response_text, "lessonId2Counts", start)
+
+    # 每门课的选课人数都形如`{sc:51,lc:100}`，不含嵌套，所以第一个`}}`就是整个对象的结尾
+    if response_text.startswith("{}", start):
+        end = start + 2
+    else:
+        end = response_text.find("}}", start) + 2
+    # 响应被截断时，赋值号之后可能什么也没有
+    if not response_text.startswith("{", start) or end == 1:
+        raise ValueError(f"cannot find the object assigned to `lessonId2Counts` in `response_text`: {response_text[start:start + 200]}")
+
+    # 将 `lessonId2Counts_string` 转换为标准的 JSON 字符串
+    lessonId2Counts_string = response_text[start:end].replace("\'", "\"").replace("sc:", "\"sc\":").replace("lc:", "\"lc\":")
+
+    # 将 JSON 字符串解码为 Python 对象
     try:
         lessonId2Counts = json.loads(lessonId2Counts_string)
     except json.decoder.JSONDecodeError as error:
         message = f"The string in the `lessonId2Counts` section does not conform to the JSON encoding format ({str(error)}) : {lessonId2Counts_string}"
         raise ValueError(message) from error
 
-    return {
-        "lessonJSONs": lessonJSONs,
-        "lessonId2Counts": lessonId2Counts
-    }
+    return lessonId2Counts
@@ -0,0 +1,80 @@
+r"""
+只刷新选课人数，并重新排序已经排好的课表。
+
+选课人数（`lessonId2Counts`）是查询结果中唯一会变化的部分，所以刷新时不必重新创建`Course`、`Arrangement`、`Room`、`ExamTime`等对象，
+也不必重新检查冲突，只需要更新每门课的`selectCount`、`score`和`probability`，再对已有的课表重新排序。
+
+function: refresh_counts
+function: refresh_schedule
+"""
+
+from config.user import COURSE_CODES
+from src.model.course import Course
+from src.model.time_table import TimeTable
+from src.core.std_election_course import query_lessons
+from src.util.log import log
+
+
+def refresh_counts(session:"Session", query_lesson_url:str, course_codes = COURSE_CODES) -> list[Course]:
+    r"""
+    重新查询`course_codes`中所有课程代码的选课人数，并原地更新已经创建过了的`Course`对象。
+
+    ## 参数
+
+    - `session`（`requests.Session`）：已经进入了选课界面的会话对象。
+    - `query_lesson_url`（`str`）：查询课程的 API URL。
+    - `course_codes`（`Iterable[str]`，可选）：要刷新的课程代码，默认为`COURSE_CODES`。
+
+    ## 返回
+
+    - `list[Course]`：选课人数或上限人数发生了变化的课程。
+
+    ## 异常
+
+    - 与`query_lesson`相同。
+    """
+
+    # 并发地查询，只解析选课人数
+    query_results = query_lessons(session, query_lesson_url, course_codes, counts_only = True)
+
+    lessonId2Counts = {}
+    for query_result in query_results.values():
+        lessonId2Counts |= query_result["lessonId2Counts"]
+
+    # 原地更新课程；课程得分变了时，`Course.countsVersion`随之改变，课表记住的课程得分会在下次使用时重新计算
+    changed_courses = Course.refreshCounts(lessonId2Counts)
+
+    log(f"refresh_counts: 选课人数刷新完毕，有 {len(changed_courses)} 门课的人数发生了变化。")
+    return changed_courses
+
+
+def refresh_schedule(session:"Session", query_lesson_url:str, candidates:list[tuple[int]]) -> list[tuple[int]]:
+    r"""
+    刷新选课人数，并按照新的得分对`candidates`重新排序。
+
+    ## 参数
+
+    - `session`（`requests.Session`）：已经进入了选课界面的会话对象。
+    - `query_lesson_url`（`str`）：查询课程的 API URL。
+    - `candidates`（`list[tuple[int]]`）：已经排好的、没有冲突的候选课表，例如`arrange_schedule`返回的`"candidates"`。
+
+    ## 返回
+
+    - `list[tuple[int]]`：原地重新排好序的`candidates`。
+
+    ## 注意
+
+    - 不会重新检查冲突，也不会因为课程报满而去掉课表；需要随报满情况增删课表时，请使用`src.core.watch`。
+
+    ## 示例
+
+    ```python
+    >>> data = arrange_schedule()
+    >>> refresh_schedule(data["session"], data["query_lesson_url"], data["candidates"])
+    ```
+    """
+
+    if refresh_counts(session, query_lesson_url):
+        candidates.sort(key = TimeTable.scoreSectionIds, reverse = True)
+
+    return candidates
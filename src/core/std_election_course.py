@@ -3,22 +3,74 @@ r"""
 
 function: enter_std_elect_course_page 将一个已登录的`requests.Session`对象进入选课页面。
 function: query_lesson 通过一个已进入选课页面的`requests.Session`对象向指定的查询 URL 发送查询课程请求。
-"""
+function: query_lessons 并发地查询多个课程代码。
 
-from time import sleep
+以上函数都是同名的`async_`异步版本的同步包装。
+"""
 
-from requests import Session, HTTPError
+import asyncio
 
 from config.constants import XK_STD_ELECT_COURSE_URL, QUERY_INTERVAL_TIME
-from src.model.error import EnterFailure, QueryError
+from src.model.error import EnterFailure, HTMLError, QueryError
 from src.core.check import check_enter_response, check_query_response
 from src.core.parse import parse_std_elect_course_page, parse_std_elect_course_default_page
-from src.core.parse import simplify_phase, jsonfy_query_response
+from src.core.parse import simplify_phase, jsonfy_query_response, jsonfy_query_counts
 from src.util.log import log
-from src.util.file import write_to_file
+from src.util import dump
+from src.util import rate_limit
+from src.util.profiling import span
+
+
+async def async_enter_std_elect_course_page(session: "Session") -> {"phase": str, "query_lesson_url": str}:
+    r"""
+    `enter_std_elect_course_page`的异步版本，参数、返回值和异常都与之相同。
+
+    请求在线程池中发出，并且和其它请求共用`src.util.rate_limit`中的限速器。
+    """
+
+    # 返回的数据
+    outcome = {}
+
+    # 向选课入口网页发送 GET 请求
+    await rate_limit.acquire()
+    response = await asyncio.to_thread(session.get, XK_STD_ELECT_COURSE_URL)
+    dump.record("stdElectCourse.action.html", response.text)
+
+    # 解析网页，获取数据
+    try:
+        data = parse_std_elect_course_page(response.text)
+    except (EnterFailure, HTMLError):
+        dump.dump_on_error("stdElectCourse.action.html", response.text)
+        raise
+    log(f"获得数据：{repr(data)}", "DEBUG")
+    outcome["phase"] = simplify_phase(data["phase"])
+
+    # 发送 POST 请求，进入该选课入口
+    await rate_limit.acquire()
+    response = await asyncio.to_thread(session.post, data["action_url"], data = {
+        "electionProfile.id": data["electionProfile.id"]
+    })
+    dump.record("stdElectCourse!defaultPage.action.html", response.text)
+
+    # 检查进入情况
+    try:
+        check_enter_response(response.text)
+    except EnterFailure as error:
+        log(f"enter_std_elect_course_page：进入选课入口失败：{str(error)}", "ERROR")
+        dump.dump_on_error("stdElectCourse!defaultPage.action.html", response.text)
+        raise error from error
+
+    # 提取查询课程的 API ，例如"https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3025"
+    try:
+        outcome["query_lesson_url"] = parse_std_elect_course_default_page(response.text)["query_lesson_url"]
+    except HTMLError:
+        dump.dump_on_error("stdElectCourse!defaultPage.action.html", response.text)
+        raise
+
+    return outcome
 
 
-def enter_std_elect_course_page(session: Session) -> {"phase": str, "query_lesson_url": str}:
+def enter_std_elect_course_page(session: "Session") -> {"phase": str, "query_lesson_url": str}:
     r"""
     通过给定的会话对象（已登录）访问选课入口页面，并尝试进入选课系统。
 
@@ -45,6 +97,7 @@ def enter_std_elect_course_page(session: Session) -> {"phase": str, "query_lesso
 
     ## 注意
 
+    - 这是`async_enter_std_elect_course_page`的同步包装，不能在正在运行的事件循环中调用。
     - 在调用此函数之前，请确保 `session` 对象已经过正确的认证并且有效。
     - 此函数依赖于 `parse_std_elect_course_page` 和 `check_enter_response` 函数来解析网页内容和处理响应结果。
 
@@ -58,38 +111,72 @@ def enter_std_elect_course_page(session: Session) -> {"phase": str, "query_lesso
     'https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3025'
     """
 
-    # 返回的数据
-    outcome = {}
+    return asyncio.run(async_enter_std_elect_course_page(session))
 
-    # 向选课入口网页发送 GET 请求
-    response = session.get(XK_STD_ELECT_COURSE_URL)
-    write_to_file(r"tmp\stdElectCourse.action.html", response.text)
 
-    # 解析网页，获取数据
-    data = parse_std_elect_course_page(response.text)
-    log(f"获得数据：{repr(data)}")
-    outcome["phase"] = simplify_phase(data["phase"])
+async def async_query_lesson(session:"Session", url:str, *, lesson_no:str = "", course_code:str = "", course_name:str = "", counts_only:bool = False):
+    r"""
+    `query_lesson`的异步版本，参数、返回值和异常都与之相同。
 
-    # 发送 POST 请求，进入该选课入口
-    response = session.post(data["action_url"], data = {
-        "electionProfile.id": data["electionProfile.id"]
-    })
-    write_to_file(r"tmp\stdElectCourse!defaultPage.action.html", response.text)
+    请求在线程池中发出，并且和其它请求共用`src.util.rate_limit`中的限速器；响应文本的解析也在线程池中进行，
+    所以在解析一个响应的同时，其它查询请求仍在进行。
+    """
 
-    # 检查进入情况
+    # 打包要发送的查询数据
+    data = {
+        "lessonNo": lesson_no,
+        "courseCode": course_code,
+        "courseName": course_name
+    }
+
+    # `session`已经创建，`requests`已经导入了
+    from requests import HTTPError
+
+    sleep_time = QUERY_INTERVAL_TIME
+    while True:
+        # 发送POST请求以查询课程
+        await rate_limit.acquire()
+        response = await asyncio.to_thread(session.post, url, data = data)
+        log(f"query_lesson: 发送查询请求：{data}", "DEBUG")
+        dump.record("stdElectCourse!queryLesson.action.html", response.text)
+
+        # 检查请求是否成功
+        try:
+            response.raise_for_status()
+        except HTTPError as error:
+            log(f"query_lesson：请求查询课程失败：{str(error)}", "ERROR")
+            dump.dump_on_error("stdElectCourse!queryLesson.action.html", response.text)
+            raise error from error
+
+        # 检查响应的内容是否有错误
+        try:
+            check_query_response(response.text, data)
+            break
+        except QueryError as error:
+            if str(error) == "click too quickly":
+                rate_limit.penalize(sleep_time) # 等待一会，否则会发生“请不要过快点击”
+                sleep_time *= 2
+                continue
+            log(f"query_lesson：查询课程信息失败：{str(error)}", "ERROR")
+            dump.dump_on_error("stdElectCourse!queryLesson.action.html", response.text)
+            raise error from error
+
+    # 将返回的文本解析为 Python 对象，在线程池中进行，这样其它请求可以同时进行
     try:
-        check_enter_response(response.text)
-    except EnterFailure as error:
-        log(f"enter_std_elect_course_page：进入选课入口失败：{str(error)}")
+        with span("parse"):
+            if counts_only:
+                result_data = {"lessonId2Counts": await asyncio.to_thread(jsonfy_query_counts, response.text)}
+            else:
+                result_data = await asyncio.to_thread(jsonfy_query_response, response.text)
+    except ValueError as error:
+        log(f"query_lesson：提取课程信息失败：{str(error)}", "ERROR")
+        dump.dump_on_error("stdElectCourse!queryLesson.action.html", response.text)
         raise error from error
 
-    # 提取查询课程的 API ，例如"https://xk.fudan.edu.cn/xk/stdElectCourse!queryLesson.action?profileId=3025"
-    outcome["query_lesson_url"] = parse_std_elect_course_default_page(response.text)["query_lesson_url"]
-
-    return outcome
+    return result_data
 
 
-def query_lesson(session:Session, url:str, *, lesson_no:str = "", course_code:str = "", course_name:str = ""):
+def query_lesson(session:"Session", url:str, *, lesson_no:str = "", course_code:str = "", course_name:str = "", counts_only:bool = False):
     r"""
     `query_lesson` 函数用于查询课程信息。它通过登录选课系统，进入选课页面，并调用查询课程的 API，根据用户提供的课程序号、课程代码或课程名称等参数，返回匹配的课程信息。
 
@@ -100,6 +187,7 @@ def query_lesson(session:Session, url:str, *, lesson_no:str = "", course_code:st
     - `lesson_no`：（`str`，可选）课程序号。默认为空字符串。
     - `course_code`：（`str`，可选）课程代码。默认为空字符串。
     - `course_name`：（`str`，可选）课程名称。默认为空字符串。
+    - `counts_only`：（`bool`，可选）是否只解析选课人数。默认为`False`。为`True`时，返回的字典中只有`"lessonId2Counts"`。
 
     **注意**：至少需要提供一个参数（`lesson_no`、`course_code` 或 `course_name`）用于查询。
 
@@ -122,7 +210,8 @@ def query_lesson(session:Session, url:str, *, lesson_no:str = "", course_code:st
     1. 在调用此函数之前，请确保选课系统处于开放状态，且当前用户可以成功登录。
     2. 查询参数（`lesson_no`、`course_code`、`course_name`）的输入应符合选课系统的规范。例如，课程序号和课程代码通常需要至少 6 个字符，课程名称至少需要 4 个字符或 2 个汉字。
     3. 如果查询结果为空，可能是因为查询参数不准确或当前没有匹配的课程。请检查输入参数或在选课系统中手动确认。
-    4. 此函数依赖于 `uis_login` 函数进行登录操作，依赖于 `enter_std_elect_course_page` 函数进入选课页面，并依赖于 `check_query_response` 和 `jsonfy_query_response` 函数处理查询结果。
+    4. 这是`async_query_lesson`的同步包装，不能在正在运行的事件循环中调用。
+    5. 此函数依赖于 `uis_login` 函数进行登录操作，依赖于 `enter_std_elect_course_page` 函数进入选课页面，并依赖于 `check_query_response` 和 `jsonfy_query_response` 函数处理查询结果。
 
     ## 示例
 
@@ -141,44 +230,46 @@ def query_lesson(session:Session, url:str, *, lesson_no:str = "", course_code:st
     ```
     """
 
-    # 打包要发送的查询数据
-    data = {
-        "lessonNo": lesson_no,
-        "courseCode": course_code,
-        "courseName": course_name
-    }
+    return asyncio.run(async_query_lesson(session, url, lesson_no = lesson_no, course_code = course_code, course_name = course_name, counts_only = counts_only))
 
-    sleep_time = QUERY_INTERVAL_TIME
-    while True:
-        # 发送POST请求以查询课程
-        response = session.post(url, data = data)
-        log(f"query_lesson: 发送查询请求：{data}")
-        write_to_file(r"tmp\stdElectCourse!queryLesson.action.html", response.text, mode = "w")
 
-        # 检查请求是否成功
-        try:
-            response.raise_for_status()
-        except HTTPError as error:
-            log(f"query_lesson：请求查询课程失败：{str(error)}")
-            raise error from error
+async def async_query_lessons(session:"Session", url:str, course_codes, *, counts_only:bool = False) -> dict[str, dict]:
+    r"""
+    并发地查询`course_codes`中的每一个课程代码。
 
-        # 检查响应的内容是否有错误
-        try:
-            check_query_response(response.text, data)
-            break
-        except QueryError as error:
-            if str(error) == "click too quickly":
-                sleep(sleep_time) # 等待一会，否则会发生“请不要过快点击”
-                sleep_time *= 2
-                continue
-            log(f"query_lesson：查询课程信息失败：{str(error)}")
-            raise error from error
+    所有请求共用`src.util.rate_limit`中的限速器，所以不会比逐个查询更容易触发“请不要过快点击”。
 
-    # 将返回的文本解析为 Python 对象
-    try:
-        result_data = jsonfy_query_response(response.text)
-    except ValueError as error:
-        log(f"query_lesson：提取课程信息失败：{str(error)}")
-        raise error from error
+    ## 参数
 
-    return result_data
+    - `session`：（`requests.Session`）已经进入了选课界面的`Session`对象，用于发送查询请求。
+    - `url`：（`str`）发送查询请求的目标 API URL 。
+    - `course_codes`：（`Iterable[str]`）要查询的课程代码。
+    - `counts_only`：（`bool`，可选）是否只解析选课人数，详见`query_lesson`。默认为`False`。
+
+    ## 返回
+
+    - `dict[str, dict]`：以课程代码为键，以该课程代码的`query_lesson`查询结果为值的字典，键的顺序与`course_codes`相同。
+
+    ## 异常
+
+    - 与`query_lesson`相同。任意一个查询失败时，抛出它的异常。
+    """
+
+    course_codes = list(course_codes)
+
+    # 每个查询记为一个片段，见`src.util.profiling`
+    async def query(code:str) -> dict:
+        with span("query"):
+            return await async_query_lesson(session, url, course_code = code, counts_only = counts_only)
+
+    results = await asyncio.gather(*(query(code) for code in course_codes))
+
+    return dict(zip(course_codes, results))
+
+
+def query_lessons(session:"Session", url:str, course_codes, *, counts_only:bool = False) -> dict[str, dict]:
+    r"""
+    `async_query_lessons`的同步包装，参数、返回值和异常都与之相同。
+    """
+
+    return asyncio.run(async_query_lessons(session, url, course_codes, counts_only = counts_only))
@@ -6,16 +6,15 @@ The response situation encountered is as follows:
 - static/html/case/quickly_click.html
 """
 
-from time import sleep
-
-from requests import Session
-from bs4 import BeautifulSoup
+import asyncio
 
 from config.constants import XK_LOGIN_URL as URL
 from config.constants import LOGIN_FORM_ID, LOGIN_FAIL_INFORMATION, LOGIN_INTERVAL_TIME
 from config.user import USERNAME, PASSWORD
 from src.model.error import LoginError
+from src.core.extract import extract_login_form
 from src.util.log import log
+from src.util import rate_limit
 
 
 def parse_login_form(html: str, login_form_id: str) -> dict[str, str]:
@@ -40,7 +39,13 @@ def parse_login_form(html: str, login_form_id: str) -> dict[str, str]:
     - 此函数假定HTML结构是正确且预期的。如果HTML不遵循预期格式，可能需要增强错误处理逻辑。
     """
 
-    # 解析 html 文档
+    # 先用轻量的提取器，读到 </form> 就停止
+    payload = extract_login_form(html, login_form_id)
+    if payload is not None:
+        return payload
+
+    # 提取失败，再用`BeautifulSoup`完整地解析 html 文档
+    from bs4 import BeautifulSoup
     soup = BeautifulSoup(html, "html.parser")
 
     # 提取登录时提交的 <form> 元素
@@ -92,12 +97,11 @@ def check_login_response(response_text: str):
             raise LoginError(prompt)
 
 
-def uis_login(username:str = USERNAME, password:str = PASSWORD) -> Session:
+async def async_uis_login(username:str = USERNAME, password:str = PASSWORD) -> "Session":
     r"""
-    通过提供的用户名和密码登录到选课系统。
+    `uis_login`的异步版本。
 
-    此函数将尝试使用给定的用户名和密码进行登录，并处理“请不要过快点击”的登录错误。
-    如果登录成功，该函数会返回一个维持登录状态的会话对象。如果登录过程中遇到其他错误，则抛出相应的异常。
+    请求在线程池中发出，并且和其它请求共用`src.util.rate_limit`中的限速器，所以可以与其它协程并发执行。
 
     ## 参数
 
@@ -113,11 +117,15 @@ def uis_login(username:str = USERNAME, password:str = PASSWORD) -> Session:
     - `LoginError`: 当登录失败时抛出此异常。
     """
 
+    # `requests`导入较慢，到第一次登录时才导入
+    from requests import Session
+
     # 创建一个会话对象以维持会话状态
     session = Session()
 
     # 发送GET请求获取登录页面
-    response = session.get(URL)
+    await rate_limit.acquire()
+    response = await asyncio.to_thread(session.get, URL)
 
     # 获取表单数据
     payload = parse_login_form(response.text, LOGIN_FORM_ID)
@@ -127,8 +135,9 @@ def uis_login(username:str = USERNAME, password:str = PASSWORD) -> Session:
     sleep_time = LOGIN_INTERVAL_TIME
     while True:
         # 发送POST请求进行登录
-        response = session.post(URL, data=payload)
-        log("uis_login：发送登录请求")
+        await rate_limit.acquire()
+        response = await asyncio.to_thread(session.post, URL, data=payload)
+        log("uis_login：发送登录请求", "DEBUG")
 
         # 处理登录错误
         try:
@@ -137,16 +146,44 @@ def uis_login(username:str = USERNAME, password:str = PASSWORD) -> Session:
             break
         except LoginError as error:
             if str(error) == "click too quickly":
-                sleep(sleep_time) # 等待一会，否则会发生“请不要过快点击”
+                rate_limit.penalize(sleep_time) # 等待一会，否则会发生“请不要过快点击”
                 sleep_time *= 2
                 continue
-            log(f"uis_login：登录失败：{str(error)}")
+            log(f"uis_login：登录失败：{str(error)}", "ERROR")
             raise error from error
 
     log("uis_login：登录成功")
     return session
 
 
+def uis_login(username:str = USERNAME, password:str = PASSWORD) -> "Session":
+    r"""
+    通过提供的用户名和密码登录到选课系统。
+
+    此函数将尝试使用给定的用户名和密码进行登录，并处理“请不要过快点击”的登录错误。
+    如果登录成功，该函数会返回一个维持登录状态的会话对象。如果登录过程中遇到其他错误，则抛出相应的异常。
+
+    ## 参数
+
+    - `username` （`str`）：用户名。
+    - `password` （`str`）：密码。
+
+    ## 返回
+
+    - `requests.Session`：一个已登录的会话对象，可以用于后续的请求以保持登录状态。
+
+    ## 异常
+
+    - `LoginError`: 当登录失败时抛出此异常。
+
+    ## 注意
+
+    - 这是`async_uis_login`的同步包装，不能在正在运行的事件循环中调用。
+    """
+
+    return asyncio.run(async_uis_login(username, password))
+
+
 if __name__ == "__main__":
     uis_login()
     print("密码正确")
@@ -0,0 +1,79 @@
+r"""
+监视模式：持续刷新选课人数，增量地维护可行课表的集合，并在排名前列的课表发生变化时重写输出文件。
+
+第二轮、第三轮选课时，课程的名额随时可能空出或被占满。监视模式只在开始时排一次课表，
+之后每一轮只刷新选课人数（见`src.core.refresh`），并且只更新含有状态发生了变化的课的课表，不会重新检查冲突。
+
+function: watch
+"""
+
+import os
+from time import sleep
+
+from config.constants import RESULT_PATH
+from config.user import MAX_SCHEDULES_TO_OUTPUT, WATCH_INTERVAL_TIME
+from src.model.feasible_set import FeasibleSet
+from src.core.arrange_schedule import initialize, classify, combine_courses, rank_time_tables, is_blocked, output_results
+from src.core.refresh import refresh_counts
+from src.util.log import log
+from src.util.profiling import span
+
+
+def watch(interval:float = WATCH_INTERVAL_TIME, rounds:int|None = None) -> FeasibleSet:
+    r"""
+    进入监视模式。
+
+    ## 参数
+
+    - `interval`（`float`，可选）：两次刷新之间的时间间隔（秒），默认为`WATCH_INTERVAL_TIME`。每一轮的查询请求仍然受`src.util.rate_limit`限速。
+    - `rounds`（`int|None`，可选）：刷新的轮数，默认为`None`，即一直运行，直到被`KeyboardInterrupt`（Ctrl+C）打断。
+
+    ## 返回
+
+    - `FeasibleSet`：最后的可行课表的集合。
+
+    ## 注意
+
+    - 为了在课程空出时能立刻排进课表，开始时会保留所有的课（包括已经满了的），所以第一次排课可能比`arrange_schedule`更耗时。
+    - 输出文件固定为`RESULT_PATH`下的 watch.csv 等（格式见`config.user.RESULT_FORMATS`），每次排名变化时被覆盖，不会自动打开。
+    """
+
+    # 排一次课表，保留满了的课
+    with span("initialize"):
+        data = initialize(use_catalogue = False)
+    with span("classify"):
+        tags = classify(**data, full_ok = True)
+    with span("combine"):
+        course_combinitions = combine_courses(tags)
+    candidates = rank_time_tables(course_combinitions)
+
+    phase = data["phase"]
+    feasible_set = FeasibleSet(candidates, lambda course: is_blocked(course, phase))
+    log(f"watch: 共有 {len(candidates)} 种没有冲突的课程表，其中 {len(feasible_set)} 种可行。")
+
+    base_path = os.path.join(RESULT_PATH, "watch")
+    last_top = None
+    round_count = 0
+
+    try:
+        while True:
+            # 排名前列的课表变了才重写输出文件
+            top = feasible_set.top(MAX_SCHEDULES_TO_OUTPUT)
+            if top != last_top:
+                output_results(top, base_path, open_file = False)
+                last_top = top
+
+            if rounds is not None and round_count >= rounds:
+                break
+            round_count += 1
+
+            # 等待，然后只刷新选课人数
+            sleep(interval)
+            with span("refresh"):
+                changed_courses = refresh_counts(data["session"], data["query_lesson_url"])
+            if feasible_set.update(changed_courses):
+                log(f"watch: 有课程报满或空出，现在有 {len(feasible_set)} 种可行的课程表。")
+    except KeyboardInterrupt:
+        log("watch: 监视模式已停止。")
+
+    return feasible_set
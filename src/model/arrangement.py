@@ -2,6 +2,8 @@ r"""
 class: Arrangement
 """
 
+from sys import intern
+
 from config.constants import WEEKDAY_MAPPING, MAX_CLASSES_PER_DAY
 from src.util.verify_parameters import type_verifier
 from src.model.building import Building
@@ -17,17 +19,33 @@ class Arrangement():
     - `course: Course`：与此安排关联的`Course`实例。
     - `endUnit: int`：课程结束的节次，如`13`。
     - `isOnline: bool`：是否是在线教学，如`True`。
+    - `locationId: int`：上课地点（第一间教室）在`src.util.location`的地点索引中的编号，在线教学为`-1`。
     - `nearestCanteen: Building|None`：距离这个安排的地点最近的食堂，如`Building('H本部食堂')`、`None`（对于在线教学）。
-    - `rooms: list[Room]`：上课的教室，如`[Room('HGX507')]`、`[]`（对于在线教学）。
+    - `rooms: tuple[Room]`：上课的教室，如`(Room('HGX507'),)`、`()`（对于在线教学）。
     - `roomsString: str`：教室的字符串表示，如`"HGX507"`、`"在线教学"`。
     - `startUnit: int`：课程开始的节次，如`11`。
     - `weekDay: int`：上课在星期几，`0`表示星期一，如`6`（表示星期日）。
-    - `weekState: str`：若`weekState[n]`为`'1'`，表示在第`n`周有课，若`weekState[n]`为`'0'`，表示在第`n`周没课。如：`"01111111111111111000000000000000000000000000000000000"`。
+    - `weekState: str`：若`weekState[n]`为`'1'`，表示在第`n`周有课，若`weekState[n]`为`'0'`，表示在第`n`周没课。如：`"01111111111111111000000000000000000000000000000000000"`。不单独储存，由`weekStateDigit`还原。
     - `weekStateDigest: str`：以摘要的形式表示`weekState`，如`"1-16"`。
     - `weekStateDigit: int`：以二进制整型的形式表示`weekState`，如`4503530907893760`（即`0b01111111111111111000000000000000000000000000000000000`）。
 
     """
 
+    __slots__ = (
+        "course",
+        "endUnit",
+        "isOnline",
+        "locationId",
+        "nearestCanteen",
+        "rooms",
+        "roomsString",
+        "startUnit",
+        "weekDay",
+        "weekStateDigest",
+        "weekStateDigit",
+        "_weekStateLength",
+    )
+
     # 可以从`arrangeJSON`原封不动赋过来的键值对的键
     unchangedJSONKeys = {
         "endUnit",
@@ -56,6 +74,14 @@ class Arrangement():
         - `weekStateDigest: str`
         """
 
+        self._initialize(weekState, weekStateDigest, weekDay, startUnit, endUnit, roomsString)
+
+
+    def _initialize(self, weekState:str, weekStateDigest:str, weekDay:int, startUnit:int, endUnit:int, roomsString:str) -> None:
+        r"""
+        `__init__`的实际内容，不检查参数的类型。`fromJSONFast`直接调用它。
+        """
+
         # 检查参数
         if startUnit < 1:
             raise ValueError(f"the first class is `1`, so you can't pass a `startUnit` (`{startUnit}`) less than `1`")
@@ -66,31 +92,43 @@ class Arrangement():
 
         # 获取教室信息、是否在线教学信息，如果是在线教学，则`rooms`为空列表`[]`
         if roomsString == "在线教学":
-            self.rooms = [] # 没有上课教室
+            self.rooms = () # 没有上课教室
             self.isOnline = True # 是在线教学
             self.nearestCanteen = None
+            self.locationId = -1
         else:
             # 解析`roomsString`信息为`Room`对象
-            self.rooms = list(map(Room.fromString, roomsString.split(",")))
+            self.rooms = tuple(map(Room.fromString, roomsString.split(",")))
             self.isOnline = False # 不是在线教学
             self.nearestCanteen = self.rooms[0].nearestCanteen
+            self.locationId = self.rooms[0].locationId
 
         self.course = None
 
         # 将`weekState`以二进制形式转换为整数，方便在后续判断安排是否冲突时进行“按位与”运算
+        # 只储存这个整数和字符串的长度，`weekState`由它们还原
         self.weekStateDigit = int(weekState, 2)
+        self._weekStateLength = len(weekState)
 
-        # 赋值
+        # 赋值，重复出现的字符串共用同一个对象
         self.endUnit = endUnit
-        self.roomsString = roomsString
+        self.roomsString = intern(roomsString)
         self.startUnit = startUnit
         self.weekDay = weekDay
-        self.weekState = weekState
-        self.weekStateDigest = weekStateDigest
+        self.weekStateDigest = intern(weekStateDigest)
+
+
+    @property
+    def weekState(self) -> str:
+        r"""
+        由`weekStateDigit`还原的`weekState`字符串，如`"01111111111111111000000000000000000000000000000000000"`。
+        """
+
+        return format(self.weekStateDigit, "b").zfill(self._weekStateLength)
 
 
     def __hash__(self) -> int:
-        return hash((self.weekState, self.weekDay, self.startUnit, self.endUnit, self.roomsString))
+        return hash((self.weekStateDigit, self.weekDay, self.startUnit, self.endUnit, self.roomsString))
 
 
     def __getitem__(self, name: str) -> object:
@@ -231,6 +269,26 @@ class Arrangement():
         return cls(**attributes)
 
 
+    @classmethod
+    def fromJSONFast(cls, arrangeJSON: dict[str, int|str]) -> "Arrangement":
+        r"""
+        与`fromJSON`相同，但是不经过`type_verifier`检查参数类型，也不逐个地拷贝键值对。
+
+        用于批量创建课程（`Course.fromJSONs`），`arrangeJSON`应当来自选课系统的查询结果。
+        """
+
+        arrangement = cls.__new__(cls)
+        arrangement._initialize(
+            arrangeJSON["weekState"],
+            arrangeJSON["weekStateDigest"],
+            arrangeJSON["weekDay"] - 1,
+            arrangeJSON["startUnit"],
+            arrangeJSON["endUnit"],
+            arrangeJSON["rooms"],
+        )
+        return arrangement
+
+
     def toJSON(self) -> dict[str, int|str]:
         r"""
         将当前 `Arrangement` 实例的状态序列化为字典（可直接转换为 JSON 格式）。
@@ -6,7 +6,8 @@ from importlib import import_module
 
 from config.constants import CANTEEN_CODES, TEACHING_BUILDING_CODES, DORMITORY_BUILDING_CODES, BUILDING_CODES
 from config.constants import BUILDING_NAMES, BUILDING_LOCATIONS
-from src.util.geography import degrees_to_meters
+from src.util.geography import manhattan_distance, get_geography
+from src.util import location
 from src.model.campus import Campus
 
 
@@ -20,29 +21,26 @@ class Building():
     - `isCanteen: bool`（只读）：这栋楼是否是食堂。
     - `isDormitoryBuilding: bool`（只读）：这栋楼是否是宿舍楼。
     - `isTeachingBuilding: bool`（只读）：这栋楼是否是教学楼。
+    - `locationId: int`：这栋楼在`src.util.location`的地点索引中的编号。
     - `name: str`：楼的名称。
     - `nearestCanteen: Building`：距离这栋楼最近的食堂，如`Building('H本部食堂')`。
     - `location: (float, float)`：`(经度, 纬度)`，楼的正门的经纬度。
 
-    ## 类属性
+    ## 注意
 
-    - `buildings: dict[str:Building]`（只读）：存储了复旦大学的一些楼，以`code:Building实例`对的形式储存。
-    - `canteens: dict[str:Building]`：存储了复旦大学的食堂，以`code:Building实例`对的形式储存。
-    - `dormitoryBuildings: dict[str:Building]`：存储了复旦大学的宿舍楼，以`code:Building实例`对的形式储存。
-    - `teachingBuildings: dict[str:Building]`：存储了复旦大学的教学楼，以`code:Building实例`对的形式储存。
+    - 复旦大学所有的楼都由`src.model.geography.Geography`在第一次使用时一次性创建，
+      通常用`Building.fromCode`取得，而不是直接创建。
     """
 
-    canteens = {}
-    teachingBuildings = {}
-    dormitoryBuildings = {}
-
-    def __init__(self, code:str):
+    def __init__(self, code:str, campus:Campus, nearestCanteen:"Building|None" = None):
         r"""
         根据建筑代码初始化`Building`实例。
 
         ## 参数:
 
         - `code: str`：建筑代码，必须是预定义代码之一。
+        - `campus: Campus`：这栋楼所在的校区。
+        - `nearestCanteen: Building|None`：离这栋楼最近的食堂；这栋楼是食堂时可以省略，即它自己。
         
         ## 异常:
 
@@ -51,21 +49,21 @@ class Building():
 
         if code not in BUILDING_CODES:
             raise ValueError(f"unknown building code: {code}")
-        if code[0] not in Campus.campuses:
-            raise ValueError(f"unknown campus which this building belongs to: {code}")
 
         self.code = code
-        self.campus = Campus.campuses[code[0]]
+        self.campus = campus
         self.name = BUILDING_NAMES[code]
         self.location = BUILDING_LOCATIONS[code]
 
-        # 检查楼的类型
-        if self.isCanteen:
-            # 离这栋楼最近的食堂
-            self.nearestCanteen = self
-        else:
-            # 离这栋楼最近的食堂
-            self.nearestCanteen = min(Building.canteens.values(), key = self.manhattanDistance)
+        # 离这栋楼最近的食堂，食堂就是它自己
+        if nearestCanteen is None:
+            if not self.isCanteen:
+                raise ValueError(f"nearest canteen of building {code} is required")
+            nearestCanteen = self
+        self.nearestCanteen = nearestCanteen
+
+        # 登记到地点索引中
+        self.locationId = location.register(self)
 
 
     def __eq__(self, other):
@@ -112,38 +110,27 @@ class Building():
 
 
     @classmethod
-    def getBuildings(cls) -> dict[str, "Building"]:
+    def getBuildings(cls) -> "Mapping[str, Building]":
         r"""
-        返回已创建的所有楼对象。
+        返回复旦大学所有的楼，以楼的代码为键的只读字典。
         """
 
-        return cls.canteens | cls.teachingBuildings | cls.dormitoryBuildings
+        return get_geography().buildings
 
 
     @classmethod
     def fromCode(cls, code) -> "Building":
         r"""
-        从`code`创建`Building`实例。
-
-        如果之前已经用相同的`code`创建过了，就直接返回已经创建的。
-        """
-
-        # 检查是否已经创建了该实例
-        if code in cls.getBuildings():
-            return cls.getBuildings()[code]
+        返回代码为`code`的楼，相同的`code`总是返回同一个实例。
 
-        # 创建新实例
-        building = Building(code)
+        ## 异常
 
-        # 给对象分类
-        if building.isCanteen:
-            cls.canteens[code] = building
-        elif building.isTeachingBuilding:
-            cls.teachingBuildings[code] = building
-        elif building.isDormitoryBuilding:
-            cls.dormitoryBuildings[code] = building
+        - `ValueError`：如果`code`不是已知的楼的代码。
+        """
 
-        # 返回新创建的对象
+        building = get_geography().buildings.get(code)
+        if building is None:
+            raise ValueError(f"unknown building code: {code}")
         return building
 
 
@@ -160,7 +147,7 @@ class Building():
         - `float`：两栋楼之间的曼哈顿距离，单位为米。
         """
 
-        return sum(degrees_to_meters(*self.location, *other.location))
+        return manhattan_distance(self.location, other.location)
 
 
     def commuteTime(self, other: "Building") -> float:
@@ -191,17 +178,3 @@ class Building():
         Arrangement = import_module("src.model.arrangement").Arrangement
         if isinstance(other, Room | Arrangement):
             return other.commuteTime(self)
-
-
-
-# 创建复旦大学的食堂
-for code in CANTEEN_CODES:
-    Building.fromCode(code)
-
-# 创建复旦大学的教学楼
-for code in TEACHING_BUILDING_CODES:
-    Building.fromCode(code)
-
-# 创建复旦大学的寝室楼
-for code in DORMITORY_BUILDING_CODES:
-    Building.fromCode(code)
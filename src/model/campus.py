@@ -15,9 +15,9 @@ class Campus():
     - `code: str`：校区代码，如`"H"`。
     - `name: str`：校区名，如`"邯郸校区"`。
 
-    ## 类属性
+    ## 注意
 
-    - `campuses: dict[str, Campus]`：存储了复旦大学的四个校区，以`code:Campus实例`对的形式存储。
+    - 复旦大学所有的校区都由`src.model.geography.Geography`在第一次使用时创建，通常用`Campus.fromCode`取得。
     """
 
     def __init__(self, code:str):
@@ -56,6 +56,25 @@ class Campus():
         return f"{self.code}{self.name}"
 
 
+    @classmethod
+    def fromCode(cls, code:str) -> "Campus":
+        r"""
+        返回代码为`code`的校区，相同的`code`总是返回同一个实例。
+
+        ## 异常
+
+        - `ValueError`：如果`code`不是已知的校区代码。
+        """
+
+        # 在函数中导入，避免循环导入
+        from src.util.geography import get_geography
+
+        campus = get_geography().campuses.get(code)
+        if campus is None:
+            raise ValueError(f"unknown campus code: {code}")
+        return campus
+
+
     def commuteTime(self, other: "Campus") -> int:
         r"""
         从`self`校区到`other`校区乘校车的通勤时间，单位：分钟。
@@ -68,8 +87,3 @@ class Campus():
         if self == other:
             return 0
         return CAMPUS_COMMUTE_TIMES[(self.code, other.code)]
-
-
-
-# 复旦大学所有的校区
-Campus.campuses = {code: Campus(code) for code in CAMPUS_CODES}
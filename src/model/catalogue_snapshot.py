@@ -0,0 +1,189 @@
+r"""
+class: CatalogueSnapshot
+"""
+
+import json
+import time
+import zlib
+import struct
+import hashlib
+
+from src.util.file import write_to_file
+
+
+class CatalogueSnapshot():
+    r"""
+    课程目录的快照：上一次运行时查询到的所有课程（`crawl`返回的`phase`和`query_results`）。
+
+    在有效期内重新运行时，直接读入快照，不必再登录、进入选课页面和查询，之后的`classify`和排课与查询到的完全相同。
+
+    ## 文件格式
+
+    文件头（`HEADER`，小端序）之后是 zlib 压缩的 JSON 数据：
+
+    - `magic: bytes`：`b"FDCS"`。
+    - `version: int`：格式的版本（`VERSION`），不同时快照无效。
+    - `configDigest: bytes`：生成快照时的配置的 SHA-256 摘要，见`src.util.catalogue.config_digest`，与当前配置不同时快照无效。
+    - `payloadDigest: bytes`：压缩后的数据的 SHA-256 摘要，用来发现文件损坏或被截断。
+    - `createdAt: float`：生成快照的时间戳。
+    - `payloadLength: int`：压缩后的数据的长度。
+
+    JSON 数据按列存储：所有课程代码的`lessonJSONs`首尾相接，每个键的值存为一列，课程代码只记录自己的课在其中的起止位置；
+    `lessonId2Counts`同样按列存储。课程的各个字段在每一行中重复出现的键名只存一次。
+
+    ## 属性
+
+    - `phase: str`：选课阶段。
+    - `queryResults: dict[str, dict]`：以课程代码为键，以查询结果（`lessonJSONs`和`lessonId2Counts`）为值，见`query_lesson`。
+    - `createdAt: float`：生成快照的时间戳。
+    """
+
+    MAGIC = b"FDCS"
+
+    VERSION = 1
+
+    HEADER = struct.Struct("<4sH32s32sdQ")
+
+    __slots__ = ("phase", "queryResults", "createdAt")
+
+    def __init__(self, phase:str, queryResults:dict[str, dict], createdAt:float|None = None):
+        r"""
+        ## 参数
+
+        - `phase`（`str`）：选课阶段。
+        - `queryResults`（`dict[str, dict]`）：以课程代码为键的查询结果。
+        - `createdAt`（`float|None`，可选）：生成快照的时间戳，默认为`None`，即现在。
+        """
+
+        self.phase = phase
+        self.queryResults = queryResults
+        self.createdAt = time.time() if createdAt is None else createdAt
+
+
+    @staticmethod
+    def _toColumns(records:list[dict]) -> dict:
+        r"""
+        把字典组成的列表按列存储：`{"keys": 键, "columns": 每个键的值, "missing": 缺少的(行, 键)}`。
+        """
+
+        keys = list(dict.fromkeys(key for record in records for key in record))
+        columns = {key: [] for key in keys}
+        missing = []
+        for (index, record) in enumerate(records):
+            for key in keys:
+                if key in record:
+                    columns[key].append(record[key])
+                else:
+                    columns[key].append(None)
+                    missing.append((index, key))
+        return {"keys": keys, "columns": columns, "missing": missing}
+
+
+    @staticmethod
+    def _fromColumns(table:dict) -> list[dict]:
+        r"""
+        `_toColumns`的逆操作。
+        """
+
+        keys = table["keys"]
+        columns = [table["columns"][key] for key in keys]
+        records = [dict(zip(keys, row)) for row in zip(*columns)] if keys else []
+        for (index, key) in table["missing"]:
+            del records[index][key]
+        return records
+
+
+    def _payload(self) -> bytes:
+        r"""
+        返回压缩后的 JSON 数据。
+        """
+
+        codes = list(self.queryResults)
+        lessons = []
+        counts = []
+        lessonOffsets = [0]
+        countOffsets = [0]
+        for code in codes:
+            lessons += self.queryResults[code]["lessonJSONs"]
+            counts += [{"id": lessonId, **count} for (lessonId, count) in self.queryResults[code]["lessonId2Counts"].items()]
+            lessonOffsets.append(len(lessons))
+            countOffsets.append(len(counts))
+
+        document = {
+            "phase": self.phase,
+            "codes": codes,
+            "lessonOffsets": lessonOffsets,
+            "countOffsets": countOffsets,
+            "lessons": self._toColumns(lessons),
+            "counts": self._toColumns(counts),
+        }
+        return zlib.compress(json.dumps(document, ensure_ascii = False, separators = (",", ":")).encode("utf-8"))
+
+
+    def dump(self, path:str, configDigest:bytes) -> None:
+        r"""
+        把快照写入文件`path`。
+
+        ## 参数
+
+        - `path`（`str`）：文件的路径。
+        - `configDigest`（`bytes`）：当前配置的 SHA-256 摘要（32 字节）。
+        """
+
+        payload = self._payload()
+        header = self.HEADER.pack(
+            self.MAGIC, self.VERSION, configDigest, hashlib.sha256(payload).digest(), self.createdAt, len(payload),
+        )
+        write_to_file(path, header + payload, mode = "wb", encoding = None)
+
+
+    @classmethod
+    def load(cls, path:str, configDigest:bytes, maxAge:float|None = None) -> "CatalogueSnapshot|None":
+        r"""
+        从文件`path`读入快照。
+
+        ## 参数
+
+        - `path`（`str`）：文件的路径。
+        - `configDigest`（`bytes`）：当前配置的 SHA-256 摘要，与生成快照时的不同则快照无效。
+        - `maxAge`（`float|None`，可选）：快照的有效期（秒），默认为`None`，即不过期。
+
+        ## 返回
+
+        - `CatalogueSnapshot|None`：读入的快照；如果文件不存在、格式或版本不对、配置不同、数据损坏或者已经过期，返回`None`。
+        """
+
+        try:
+            with open(path, "rb") as file:
+                header = file.read(cls.HEADER.size)
+                (magic, version, digest, payloadDigest, createdAt, payloadLength) = cls.HEADER.unpack(header)
+                if magic != cls.MAGIC or version != cls.VERSION or digest != configDigest:
+                    return None
+                if maxAge is not None and not 0 <= time.time() - createdAt <= maxAge:
+                    return None
+                payload = file.read(payloadLength + 1)
+        except (OSError, struct.error):
+            return None
+
+        if len(payload) != payloadLength or hashlib.sha256(payload).digest() != payloadDigest:
+            return None
+
+        try:
+            document = json.loads(zlib.decompress(payload).decode("utf-8"))
+        except (zlib.error, ValueError):
+            return None
+
+        lessons = cls._fromColumns(document["lessons"])
+        counts = cls._fromColumns(document["counts"])
+        (lessonOffsets, countOffsets) = (document["lessonOffsets"], document["countOffsets"])
+        queryResults = {}
+        for (index, code) in enumerate(document["codes"]):
+            queryResults[code] = {
+                "lessonJSONs": lessons[lessonOffsets[index]: lessonOffsets[index + 1]],
+                "lessonId2Counts": {
+                    count.pop("id"): count
+                    for count in counts[countOffsets[index]: countOffsets[index + 1]]
+                },
+            }
+
+        return cls(document["phase"], queryResults, createdAt)
@@ -0,0 +1,219 @@
+r"""
+class: ConfigSnapshot
+"""
+
+import os
+import re
+import json
+from csv import reader
+
+import config.constants
+from config.constants import COURSE_CODES_PATH, TAGS_PATH
+from config.constants import COURSE_QUANTITY_LIMIT, WEEKDAY_MAPPING
+from src.util.file import write_to_file
+
+
+class ConfigSnapshot():
+    r"""
+    配置的快照：检查过的`course_codes.csv`、`tags.csv`，以及由`config.constants`派生出来的、编译好的数据。
+
+    配置只在第一次运行或源文件被修改后编译一次，之后每次运行都用`ConfigSnapshot.load`一次性读入快照。
+    通常不直接使用，而是通过`src.util.config_snapshot.get_config_snapshot`取得。
+
+    快照文件是 JSON，只保存检查过的数据和正则表达式的字符串，读入时再编译正则表达式（`re`有缓存，很快），
+    读入快照不会执行任何代码。
+
+    ## 属性
+
+    - `sources: dict[str, int]`：快照的源文件，以路径为键，以编译时的修改时间（纳秒）为值。
+    - `courseCodes: dict[str, str]`：`course_codes.csv`中的课程代码及其 tag，即`config.user.COURSE_CODES`。
+    - `tagsCount: dict[str, int]`：`tags.csv`中每个 tag 要选的课的数量，即`config.user.TAGS_COUNT`。
+    - `quantityLimits: dict[str, (re.Pattern, int)]`：以`COURSE_QUANTITY_LIMIT`中的正则表达式为键，以`(编译好的正则表达式, 门数上限)`为值。
+    - `weekdayNames: tuple[str]`：星期的中文名称，下标是星期的编号（星期一为`0`）。
+    - `weekdayIds: dict[str, int]`：星期的中文名称到编号的映射。
+    - `examTimePattern: re.Pattern`：解析考试时间字符串的正则表达式，见`ExamTime.fromString`。
+    """
+
+    # 快照的格式的版本，格式改变时加一，旧的快照会被重新编译
+    VERSION = 2
+
+    __slots__ = (
+        "sources",
+        "courseCodes",
+        "tagsCount",
+        "quantityLimits",
+        "weekdayNames",
+        "weekdayIds",
+        "examTimePattern",
+    )
+
+    @staticmethod
+    def sourcePaths() -> tuple[str]:
+        r"""
+        返回快照的源文件的路径。
+        """
+
+        return (config.constants.__file__, COURSE_CODES_PATH, TAGS_PATH)
+
+
+    @staticmethod
+    def _modifiedTimes(paths:"Iterable[str]") -> dict[str, int]:
+        r"""
+        返回`paths`中每个文件的修改时间（纳秒）。
+
+        ## 异常
+
+        - `OSError`：如果某个文件不存在。
+        """
+
+        return {path: os.stat(path).st_mtime_ns for path in paths}
+
+
+    @staticmethod
+    def _readCSV(path:str) -> list[list[str]]:
+        r"""
+        读取 GBK 编码的 csv 文件`path`，跳过空行；每一行都至少要有两列，只用前两列。
+
+        ## 异常
+
+        - `ValueError`：如果某一行少于两列。
+        """
+
+        with open(path, "r", encoding = "gbk") as file:
+            rows = [row for row in reader(file) if row]
+
+        for (lineNumber, row) in enumerate(rows, start = 1):
+            if len(row) < 2:
+                raise ValueError(f"{path}: row {lineNumber} should have at least 2 columns, but got {len(row)}: {row}")
+        return [row[:2] for row in rows]
+
+
+    @classmethod
+    def compile(cls) -> "ConfigSnapshot":
+        r"""
+        读取、检查所有的源文件，编译出新的快照。
+
+        ## 异常
+
+        - `ValueError`：如果`tags.csv`中的数量不是非负整数、`course_codes.csv`中有未知的 tag、
+          `COURSE_QUANTITY_LIMIT`中有无效的正则表达式，或者`WEEKDAY_MAPPING`不是一一对应的。
+        - `OSError`：如果某个源文件不存在。
+        """
+
+        snapshot = object.__new__(cls)
+
+        # 先记下修改时间，编译期间源文件被修改的话，下次运行会重新编译
+        snapshot.sources = cls._modifiedTimes(cls.sourcePaths())
+
+        # tags.csv
+        snapshot.tagsCount = {}
+        for (tag, count) in cls._readCSV(TAGS_PATH):
+            if not count.strip().isdigit():
+                raise ValueError(f"{TAGS_PATH}: the count of tag {tag} should be a non-negative integer, but got {count}")
+            snapshot.tagsCount[tag] = int(count)
+
+        # course_codes.csv
+        snapshot.courseCodes = {}
+        for (code, tag) in cls._readCSV(COURSE_CODES_PATH):
+            if tag not in snapshot.tagsCount:
+                raise ValueError(f"{COURSE_CODES_PATH}: unknown tag {tag} of course {code}, which is not in {TAGS_PATH}")
+            snapshot.courseCodes[code] = tag
+
+        # 星期
+        snapshot.weekdayNames = tuple(WEEKDAY_MAPPING[weekday] for weekday in range(7))
+
+        # 选课门数限制、星期的编号、考试时间
+        snapshot._compilePatterns(COURSE_QUANTITY_LIMIT)
+        if any(WEEKDAY_MAPPING.get(name) != weekday for (name, weekday) in snapshot.weekdayIds.items()):
+            raise ValueError("WEEKDAY_MAPPING should map the weekdays and their names one-to-one")
+
+        return snapshot
+
+
+    def _compilePatterns(self, quantityLimits:dict[str, int]) -> None:
+        r"""
+        由`quantityLimits`（与`COURSE_QUANTITY_LIMIT`的格式相同）和`weekdayNames`编译出`quantityLimits`、`weekdayIds`和`examTimePattern`。
+
+        ## 异常
+
+        - `ValueError`：如果`quantityLimits`中有无效的正则表达式。
+        """
+
+        self.quantityLimits = {}
+        for (pattern, limit) in quantityLimits.items():
+            try:
+                self.quantityLimits[pattern] = (re.compile(pattern), limit)
+            except re.error as error:
+                raise ValueError(f"invalid pattern in COURSE_QUANTITY_LIMIT: {pattern}: {error}") from error
+
+        self.weekdayIds = {name: weekday for (weekday, name) in enumerate(self.weekdayNames)}
+
+        # 考试时间，如`"2025-06-16 13:00-15:00 第16周 星期一"`
+        self.examTimePattern = re.compile(
+            r"(?P<datetimeInfo>\d{4}-\d{2}-\d{2} \d{2}:\d{2}-\d{2}:\d{2}) "
+            fr"第(?P<weekInfo>\d{{1,2}})周 星期(?P<weekdayInfo>[{''.join(self.weekdayNames)}])"
+        )
+
+
+    def isFresh(self) -> bool:
+        r"""
+        返回快照是否仍然有效，即源文件都没有被修改过。
+        """
+
+        try:
+            return tuple(self.sources) == self.sourcePaths() and self._modifiedTimes(self.sources) == self.sources
+        except OSError:
+            return False
+
+
+    def dump(self, path:str) -> None:
+        r"""
+        把快照以 JSON 格式写入文件`path`。
+        """
+
+        document = {
+            "version": self.VERSION,
+            "sources": self.sources,
+            "courseCodes": self.courseCodes,
+            "tagsCount": self.tagsCount,
+            "quantityLimits": {pattern: limit for (pattern, (_, limit)) in self.quantityLimits.items()},
+            "weekdayNames": self.weekdayNames,
+        }
+        write_to_file(path, json.dumps(document, ensure_ascii = False))
+
+
+    @classmethod
+    def load(cls, path:str) -> "ConfigSnapshot|None":
+        r"""
+        从文件`path`读入快照。
+
+        ## 返回
+
+        - `ConfigSnapshot|None`：读入的快照；如果文件不存在、无法读取、格式的版本不同或者已经失效，返回`None`。
+        """
+
+        try:
+            with open(path, "r", encoding = "utf-8") as file:
+                document = json.load(file)
+            if document["version"] != cls.VERSION:
+                return None
+
+            snapshot = object.__new__(cls)
+            snapshot.sources = document["sources"]
+            if not snapshot.isFresh():
+                return None
+            snapshot.courseCodes = document["courseCodes"]
+            snapshot.tagsCount = document["tagsCount"]
+            snapshot.weekdayNames = tuple(document["weekdayNames"])
+            snapshot._compilePatterns(document["quantityLimits"])
+        except Exception:
+            return None
+        return snapshot
+
+
+
+if __name__ == "__main__":
+    snapshot = ConfigSnapshot.compile()
+    print(snapshot.courseCodes)
+    print(snapshot.tagsCount)
+    print(snapshot.examTimePattern.search("2025-06-16 13:00-15:00 第16周 星期一").groupdict())
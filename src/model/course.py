@@ -3,12 +3,12 @@ class: Course
 """
 
 from re import fullmatch
-from functools import cache
+from sys import intern
+from math import exp
 from itertools import product
 
-from scipy.stats import norm
-
 from config.user import OPTIMAL_PROPORTION_OF_SELECTION, SIGMA
+from src.util.config_snapshot import get_config_snapshot
 from src.model.exam_time import ExamTime
 from src.model.arrangement import Arrangement
 
@@ -23,6 +23,7 @@ class Course():
     - `campusCode: str`：上课所在的校区代码，如`"H"`。
     - `campusName: str`：上课所在的校区名，如`"邯郸校区"`。
     - `canApplyPnp: bool`：能否申请 PNP，如`False`。
+    - `cells: tuple[tuple[int, int, Arrangement]]`：这门课在课程表中占用的格子`(星期, 节次, 安排)`，按（星期，节次）排好序，星期一为`0`，第一节课为`1`。
     - `credits: float`：学分，如`5.0`。
     - `courseCode: str`：课程代码，如`"MATH120017"`。
     - `courseId: str`：标识（比较小的那个），如"42996"。
@@ -38,11 +39,14 @@ class Course():
     - `hasTextBook: bool`：是否有教材，例如`false`。
     - `id: str`：课程标识（比较大的那个），如`"737991"`。
     - `isAPlus: bool`：是否含 A+ 成绩，如`True`。
+    - `isSelected: bool`：是否已经选了这门课，由`classify`标记，默认为`False`。
     - `limitCount: int`：选课人数上限，如`100`。
+    - `limitedPatterns: tuple[str]`：`COURSE_QUANTITY_LIMIT`中与`courseNo`匹配的正则表达式，大多数课是空元组。
     - `period: int`：总时间（单位：课时），如`108`。
     - `remark: str`：备注，如`"递进性/混合式教学；国家一流线下课程；在线资源：B站，账号：力学数学-谢锡麟。"`。
     - `scheduled: bool`：是否被安排，如`true`。
     - `score: float`：对这门课的评分。
+    - `sectionId: int`：这门课在`Course.sections`中的下标，创建时分配，候选课表用它来表示这门课。
     - `selectCount: int`：当前已选人数，如`51`。
     - `startWeek: int`：开始时的周数，如`1`。
     - `teachDepartName: str`：开课院系名，如`"航空航天系"`。
@@ -60,6 +64,45 @@ class Course():
     给这门课评分。选的人太少或太多都会降低这门课的得分，当 选课人数/上限人数 = OPTIMAL_PROPORTION_OF_SELECTION 时，得满分（`1`分）。
     """
 
+    __slots__ = (
+        "arrangements",
+        "campusCode",
+        "campusName",
+        "canApplyPnp",
+        "cells",
+        "credits",
+        "courseCode",
+        "courseId",
+        "courseName",
+        "courseNo",
+        "courseTypeCode",
+        "courseTypeId",
+        "courseTypeName",
+        "endWeek",
+        "examFormName",
+        "examTime",
+        "examTimeString",
+        "hasTextBook",
+        "id",
+        "isAPlus",
+        "isSelected",
+        "limitCount",
+        "limitedPatterns",
+        "period",
+        "remark",
+        "scheduled",
+        "score",
+        "sectionId",
+        "selectCount",
+        "startWeek",
+        "teachDepartName",
+        "teacherNames",
+        "teachers",
+        "textbooks",
+        "weekHour",
+        "withdrawable",
+    )
+
     # 可以从`lessonJSON`原封不动赋过来的键值对的键
     unchangedJSONKeys = {
         "campusCode",
@@ -101,6 +144,16 @@ class Course():
     # 储存已经创建过了的课程实例
     courses = {}
 
+    # 按照创建的顺序储存课程实例，课程的`sectionId`就是它在这里的下标
+    sections = []
+
+    # 两门课是否冲突的缓存，以两门课的`id`（小的在前）组成的元组为键，所以`(a, b)`和`(b, a)`共用一项；
+    # 课程的`id`只在课程目录中出现，所以缓存的大小不超过课程目录中课程对的数量
+    conflicts = {}
+
+    # 选课人数的版本号，每当有课程的选课人数变化时加一，用于让课表中记住的课程得分失效
+    countsVersion = 0
+
 
     def __init__(self, **attributes):
         r"""
@@ -142,6 +195,8 @@ class Course():
 
         self.examTime = ExamTime.fromString(self["examTimeString"])
         self.teacherNames = self["teachers"].split(",")
+        self.limitedPatterns = self.limitedPatternsOf(self["courseNo"])
+        self.isSelected = False
         self.selectCount, self.limitCount = self.getCount(self["id"])
 
         # 评分
@@ -151,6 +206,12 @@ class Course():
         for arrangement in self["arrangements"]:
             arrangement.course = self
 
+        self.cells = self.cellsOf(self["arrangements"])
+
+        # 分配课程编号
+        self.sectionId = len(Course.sections)
+        Course.sections.append(self)
+
 
     def __getitem__(self, name: str) -> object:
         r"""
@@ -256,6 +317,43 @@ class Course():
         return (cls.lessonId2Counts[id]["sc"], cls.lessonId2Counts[id]["lc"])
 
 
+    def refreshCount(self) -> None:
+        r"""
+        根据`Course.lessonId2Counts`重新设置这门课的`selectCount`、`limitCount`和`score`。
+
+        `probability`是根据`selectCount`和`limitCount`计算的，也会随之更新。
+        """
+
+        self.selectCount, self.limitCount = self.getCount(self["id"])
+        self.score = self.norm(self.selectCount / self.limitCount)
+        Course.countsVersion += 1
+
+
+    @classmethod
+    def refreshCounts(cls, lessonId2Counts:dict[str, dict[str, int]]) -> list["Course"]:
+        r"""
+        用新查询到的选课人数原地更新已经创建过了的课程实例，而不重新创建它们。
+
+        ## 参数
+
+        - `lessonId2Counts`（`dict[str, dict[str, int]]`）：以课程`id`为键，以`{"sc": 已选人数, "lc": 上限人数}`为值的字典。
+
+        ## 返回
+
+        - `list[Course]`：选课人数或上限人数发生了变化的课程。
+        """
+
+        cls.lessonId2Counts |= lessonId2Counts
+
+        changedCourses = []
+        for course in cls.courses.values():
+            if course["id"] in lessonId2Counts and (course.selectCount, course.limitCount) != course.getCount(course["id"]):
+                course.refreshCount()
+                changedCourses.append(course)
+
+        return changedCourses
+
+
     @classmethod
     def fromJSON(cls, lessonJSON: dict[str, object]) -> "Course":
         r"""
@@ -377,6 +475,98 @@ class Course():
         return course
 
 
+    @classmethod
+    def fromJSONs(cls, lessonJSONs: list[dict[str, object]]) -> list["Course"]:
+        r"""
+        根据一次查询结果中的所有`lessonJSON`，批量地创建`Course`实例，结果与对每个`lessonJSON`调用`fromJSON`相同。
+
+        与`fromJSON`不同，这里不经过`__init__(**attributes)`的`setattr`循环和`__getitem__`，
+        每个属性都直接赋值；`Arrangement`也不经过`type_verifier`的类型检查（见`Arrangement.fromJSONFast`）。
+
+        ## 参数
+
+        - `lessonJSONs`（`list[dict[str, object]]`）：查询结果中的`"lessonJSONs"`。
+
+        ## 返回
+
+        - `list[Course]`：与`lessonJSONs`一一对应的`Course`实例，已经创建过了的课程直接返回那个已创建的。
+
+        ## 异常
+
+        - `KeyError`: 如果某个字典缺少必要的键，或者`lessonId2Counts`中没有这门课。
+        """
+
+        courses = []
+        createdCourses = cls.courses
+        sections = cls.sections
+        lessonId2Counts = cls.lessonId2Counts
+        norm = cls.norm
+        fromJSONFast = Arrangement.fromJSONFast
+        examTimeFromString = ExamTime.fromString
+
+        for lessonJSON in lessonJSONs:
+            # 如果这节课已经创建过了，就直接使用那个已创建的
+            course = createdCourses.get(lessonJSON["id"])
+            if course is not None:
+                courses.append(course)
+                continue
+
+            course = cls.__new__(cls)
+
+            # 需要转换的项目
+            course.arrangements = arrangements = [fromJSONFast(arrangeJSON) for arrangeJSON in lessonJSON["arrangeInfo"]]
+            course.courseCode = intern(lessonJSON["code"])
+            course.courseId = str(lessonJSON["courseId"])
+            course.courseName = lessonJSON["name"]
+            course.courseNo = lessonJSON["no"]
+            course.examTimeString = intern(lessonJSON["examTime"])
+            course.id = str(lessonJSON["id"])
+
+            # 不用变的项目，即`unchangedJSONKeys`，很多课都相同的字符串共用同一个对象
+            course.campusCode = intern(lessonJSON["campusCode"])
+            course.campusName = intern(lessonJSON["campusName"])
+            course.canApplyPnp = lessonJSON["canApplyPnp"]
+            course.credits = lessonJSON["credits"]
+            course.courseTypeCode = intern(lessonJSON["courseTypeCode"])
+            course.courseTypeId = lessonJSON["courseTypeId"]
+            course.courseTypeName = intern(lessonJSON["courseTypeName"])
+            course.endWeek = lessonJSON["endWeek"]
+            course.examFormName = intern(lessonJSON["examFormName"])
+            course.hasTextBook = lessonJSON["hasTextBook"]
+            course.isAPlus = lessonJSON["isAPlus"]
+            course.period = lessonJSON["period"]
+            course.remark = lessonJSON["remark"]
+            course.scheduled = lessonJSON["scheduled"]
+            course.startWeek = lessonJSON["startWeek"]
+            course.teachDepartName = intern(lessonJSON["teachDepartName"])
+            course.teachers = lessonJSON["teachers"]
+            course.textbooks = lessonJSON["textbooks"]
+            course.weekHour = lessonJSON["weekHour"]
+            course.withdrawable = lessonJSON["withdrawable"]
+
+            # 与`__init__`中相同的派生属性
+            course.examTime = examTimeFromString(course.examTimeString)
+            course.teacherNames = course.teachers.split(",")
+            course.limitedPatterns = Course.limitedPatternsOf(course.courseNo)
+            course.isSelected = False
+            counts = lessonId2Counts[course.id]
+            course.selectCount = counts["sc"]
+            course.limitCount = counts["lc"]
+            course.score = norm(course.selectCount / course.limitCount)
+
+            # 与自己的安排建立联系
+            for arrangement in arrangements:
+                arrangement.course = course
+
+            course.cells = cls.cellsOf(arrangements)
+            course.sectionId = len(sections)
+            sections.append(course)
+            createdCourses[lessonJSON["id"]] = course
+            courses.append(course)
+
+        return courses
+
+
     def toJSON(self) -> dict[str, object]:
         """
         将当前 `Course` 实例的状态序列化为字典（可直接转换为 JSON 格式）。
@@ -407,7 +597,6 @@ class Course():
         return lessonJSON
 
 
-    @cache
     def is_conflict_with(self, other:"Course") -> bool:
         r"""
         检查当前课程`self`与另一门课程`other`之间是否存在冲突。
@@ -428,16 +617,23 @@ class Course():
 
         ## 注意
 
-        - 此方法经过`cache`修饰，可以记忆参数与输出，实现性能加速。
+        - 结果记在`Course.conflicts`中，`a.is_conflict_with(b)`和`b.is_conflict_with(a)`共用同一项。
         """
 
-        # 检查上课时间是否冲突
-        for (selfArrangement, otherArrangement) in product(self["arrangements"], other["arrangements"]):
-            if selfArrangement.is_conflict_with(otherArrangement):
-                return True
+        # 先查缓存
+        key = (self.id, other.id) if self.id <= other.id else (other.id, self.id)
+        conflict = Course.conflicts.get(key)
+        if conflict is not None:
+            return conflict
 
-        # 检查期末考试时间是否冲突，或者课程代码是否相同
-        return self.examTime.is_conflict_with(other.examTime) or (self["courseCode"] == other["courseCode"])
+        # 检查上课时间是否冲突，然后检查期末考试时间是否冲突，或者课程代码是否相同
+        conflict = any(
+            selfArrangement.is_conflict_with(otherArrangement)
+            for (selfArrangement, otherArrangement) in product(self.arrangements, other.arrangements)
+        ) or self.examTime.is_conflict_with(other.examTime) or (self.courseCode == other.courseCode)
+
+        Course.conflicts[key] = conflict
+        return conflict
 
 
     @property
@@ -459,6 +655,38 @@ class Course():
         return bool(fullmatch(pattern, self["courseNo"]))
 
 
+    @staticmethod
+    def limitedPatternsOf(courseNo:str) -> tuple[str]:
+        r"""
+        返回`COURSE_QUANTITY_LIMIT`中与`courseNo`完全匹配的正则表达式，用配置快照中编译好的正则表达式匹配。
+        """
+
+        return tuple(
+            pattern
+            for (pattern, (compiledPattern, _)) in get_config_snapshot().quantityLimits.items()
+            if compiledPattern.fullmatch(courseNo)
+        )
+
+
+    @staticmethod
+    def cellsOf(arrangements:list[Arrangement]) -> tuple[tuple[int, int, Arrangement]]:
+        r"""
+        返回`arrangements`在课程表中占用的格子`(星期, 节次, 安排)`，按（星期，节次）排好序。
+
+        同一个格子有多个安排时，只保留最后一个，与把这些安排依次填入安排表（见`TimeTable.arrangementTableOf`）的结果相同。
+        """
+
+        cells = {}
+        for arrangement in arrangements:
+            for slot in range(arrangement.startUnit, arrangement.endUnit + 1):
+                cells[(arrangement.weekDay, slot)] = arrangement
+
+        return tuple(
+            (weekDay, slot, arrangement)
+            for ((weekDay, slot), arrangement) in sorted(cells.items(), key = lambda item: item[0])
+        )
+
+
     @staticmethod
     def norm(x:float) -> float:
         r"""
@@ -468,7 +696,10 @@ class Course():
 
         `SIGMA`指定了正态分布函数的离散程度，即本函数的趋近速度。
         """
-        return float(norm.pdf(x, loc = OPTIMAL_PROPORTION_OF_SELECTION, scale = SIGMA) / norm.pdf(0))
+
+        # 即`scipy.stats.norm.pdf(x, loc = OPTIMAL_PROPORTION_OF_SELECTION, scale = SIGMA) / scipy.stats.norm.pdf(0)`，
+        # 两个`1 / sqrt(2 * pi)`约掉了，直接用`math.exp`计算要快得多
+        return exp(-((x - OPTIMAL_PROPORTION_OF_SELECTION) / SIGMA) ** 2 / 2) / SIGMA
 
 
 
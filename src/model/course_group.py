@@ -21,6 +21,8 @@ class CourseGroup():
     - `limitedCoursesCount: dict[str, int]`：某一数量受限制的类型（键，正则表达式）的课的数量（值）。
     """
 
+    __slots__ = ("courses", "isConflict", "limitedCoursesCount")
+
     def __init__(self, courses:list[Course]|None = None):
         """
         初始化一个新的课程组实例。
@@ -40,7 +42,7 @@ class CourseGroup():
         # 某一数量受限制的类型的课的数量
         self.limitedCoursesCount = {
             pattern: sum(
-                course.matchNo(pattern)
+                pattern in course.limitedPatterns
                 for course in courses
             )
             for pattern in COURSE_QUANTITY_LIMIT
@@ -56,6 +58,34 @@ class CourseGroup():
         )
 
 
+    @staticmethod
+    def isConflicting(courses:"Sequence[Course]") -> bool:
+        r"""
+        不创建课程组，直接判断`courses`中的课程是否冲突，结果与`CourseGroup(courses).isConflict`相同。
+
+        ## 参数
+
+        - `courses`（`Sequence[Course]`）：要检查的课程。
+
+        ## 返回
+
+        - `bool`：任意两门课程冲突，或者数量受限制的类型的课的数量超过了限制时，返回`True`。
+        """
+
+        # 先检查数量限制（用每门课预先匹配好的`limitedPatterns`），再检查两两之间的冲突，发现冲突就立即返回
+        limitedCoursesCount = {}
+        for course in courses:
+            for pattern in course.limitedPatterns:
+                limitedCoursesCount[pattern] = limitedCoursesCount.get(pattern, 0) + 1
+                if limitedCoursesCount[pattern] > COURSE_QUANTITY_LIMIT[pattern]:
+                    return True
+
+        return any(
+            course.is_conflict_with(otherCourse)
+            for (course, otherCourse) in combinations(courses, 2)
+        )
+
+
     def __iter__(self):
         r"""
         迭代。
@@ -96,7 +126,7 @@ class CourseGroup():
 
         # 检测最大选课门数限制冲突
         for (pattern, limit) in COURSE_QUANTITY_LIMIT.items():
-            self.limitedCoursesCount[pattern] += course.matchNo(pattern)
+            self.limitedCoursesCount[pattern] += pattern in course.limitedPatterns
             self.isConflict = self.isConflict or (self.limitedCoursesCount[pattern] > limit)
 
         # 添加课程
@@ -28,6 +28,9 @@ class DateDuration():
     ```
     """
 
+    __slots__ = ("start", "end", "dateFormat")
+
+
     @type_verifier
     def __init__(self, start:date, end:date, dateFormat:str = r"%Y-%m-%d"):
         r"""
@@ -55,7 +58,9 @@ class DateDuration():
 
 
     def __repr__(self):
-        parameters = ", ".join((f"{para_name}={repr(value)}" for (para_name, value) in self.__dict__.items()))
+        # 没有`__dict__`，按照各个类的`__slots__`的顺序列出属性
+        names = [name for cls in reversed(type(self).__mro__) for name in getattr(cls, "__slots__", ())]
+        parameters = ", ".join((f"{para_name}={repr(getattr(self, para_name))}" for para_name in names if hasattr(self, para_name)))
         return f"{type(self).__name__}({parameters})"
 
 
@@ -174,6 +179,9 @@ class TimeDuration(DateDuration):
     时间段类。
     """
 
+    __slots__ = ("timeFormat",)
+
+
     @type_verifier
     def __init__(self, start:datetime, end:datetime, dateFormat:str = r"%Y-%m-%d", timeFormat:str = r"%H:%M:%S"):
         r"""
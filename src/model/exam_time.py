@@ -2,13 +2,13 @@ r"""
 class: ExamTime
 """
 
-from re import search
 from datetime import datetime
 
 from config.constants import EXAM_START_WEEK, EXAM_END_WEEK
 from config.constants import WEEKDAY_MAPPING
 from src.util.verify_parameters import type_verifier
 from src.model.datetime_duration import TimeDuration
+from src.util.config_snapshot import get_config_snapshot
 
 
 class ExamTime(TimeDuration):
@@ -25,6 +25,12 @@ class ExamTime(TimeDuration):
     ExamTime(datetime.datetime(2025, 6, 13, 15, 30), datetime.datetime(2025, 6, 13, 17, 30), 17, 4)
     """
 
+    __slots__ = ("week", "weekday")
+
+    # 以考试时间的字符串为键，储存已经解析过了的实例
+    examTimes = {}
+
+
     @type_verifier
     def __init__(self, start:datetime|None = None, end:datetime|None = None, week:int|None = None, weekday:int|None = None):
         r"""
@@ -180,23 +186,35 @@ class ExamTime(TimeDuration):
         ## 异常
 
         - `ValueError`：如果传入的字符串格式不正确或无法匹配预期模式。
+
+        ## 缓存机制
+
+        同一门课的各个课程序号的考试时间往往相同，所以此方法使用字典 `ExamTime.examTimes` 存储已经解析过的字符串，
+        同一个字符串只解析一次，返回的是同一个实例。
         """
 
-        # 处理空字符串的情况
-        if string == "":
-            return ExamTime()
+        # 如果已经解析过了该字符串
+        if string in cls.examTimes:
+            return cls.examTimes[string]
 
-        # 定义日期时间的正则表达式模式
-        datetimePattern = r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}-\d{2}:\d{2}"
+        examTime = cls._parseString(string)
+        cls.examTimes[string] = examTime
+        return examTime
 
-        # 根据`config.constants.WEEKDAY_MAPPING`构建中文星期几的字符集
-        weekdayNames = "".join(name for name in WEEKDAY_MAPPING if isinstance(name, str))
 
-        # 构造完整的正则表达式模式
-        pattern = fr"(?P<datetimeInfo>{datetimePattern}) 第(?P<weekInfo>\d{{1,2}})周 星期(?P<weekdayInfo>[{weekdayNames}])"
+    @staticmethod
+    def _parseString(string:str) -> "ExamTime":
+        r"""
+        `fromString`的实际内容，不使用缓存。
+        """
+
+        # 处理空字符串的情况
+        if string == "":
+            return ExamTime()
 
-        # 使用正则表达式搜索输入字符串
-        match = search(pattern, string)
+        # 使用配置快照中编译好的正则表达式搜索输入字符串
+        snapshot = get_config_snapshot()
+        match = snapshot.examTimePattern.search(string)
         if not match:
             raise ValueError(f"failed to parse `string`: {string}")
 
@@ -209,7 +227,7 @@ class ExamTime(TimeDuration):
         week = int(match["weekInfo"])
 
         # 解析星期几的信息
-        weekday = WEEKDAY_MAPPING[match["weekdayInfo"]]
+        weekday = snapshot.weekdayIds[match["weekdayInfo"]]
 
         # 返回新的 ExamTime 实例
         return ExamTime(start=start, end=end, week=week, weekday=weekday)
@@ -0,0 +1,132 @@
+r"""
+class: FeasibleSet
+"""
+
+from heapq import nlargest
+
+from src.model.course import Course
+from src.model.time_table import TimeTable
+
+
+class FeasibleSet():
+    r"""
+    可行课表的集合，随课程的报满与空出而增量地更新。
+
+    集合里保存的是所有没有冲突的候选课表（课程的`sectionId`组成的元组），其中不含“被阻挡”的课的课表才是可行的。
+    每个课表记录了它含有的被阻挡的课的数量，某门课被阻挡或不再被阻挡时，只需更新含有这门课的课表，
+    而不用重新检查冲突。
+
+    ## 属性
+
+    - `candidates: list[tuple[int]]`：所有没有冲突的候选课表。
+    - `isBlocked: Callable[[Course], bool]`：判断一门课是否被阻挡（如已经报满）的函数。
+    - `blockedCounts: list[int]`：`candidates`中每个课表含有的被阻挡的课的数量。
+    - `blockedSections: set[int]`：当前被阻挡的课的`sectionId`。
+    - `commuteTimes: list[float|None]`：`candidates`中每个课表的通勤时间，第一次排名时才计算。通勤时间不随选课人数变化。
+    """
+
+    def __init__(self, candidates:list[tuple[int]], isBlocked):
+        r"""
+        ## 参数
+
+        - `candidates`（`list[tuple[int]]`）：所有没有冲突的候选课表。
+        - `isBlocked`（`Callable[[Course], bool]`）：判断一门课是否被阻挡的函数。
+        """
+
+        self.candidates = list(candidates)
+        self.isBlocked = isBlocked
+        self.commuteTimes = [None] * len(self.candidates)
+
+        # 每门课出现在哪些课表中（`candidates`中的下标）
+        self._indexes = {}
+        for (index, candidate) in enumerate(self.candidates):
+            for sectionId in candidate:
+                self._indexes.setdefault(sectionId, []).append(index)
+
+        self.blockedSections = {
+            sectionId
+            for sectionId in self._indexes
+            if isBlocked(Course.sections[sectionId])
+        }
+        self.blockedCounts = [
+            sum(sectionId in self.blockedSections for sectionId in candidate)
+            for candidate in self.candidates
+        ]
+
+
+    def __len__(self) -> int:
+        r"""
+        可行课表的数量。
+        """
+
+        return self.blockedCounts.count(0)
+
+
+    @property
+    def feasible(self) -> list[tuple[int]]:
+        r"""
+        当前可行的候选课表。
+        """
+
+        return [
+            candidate
+            for (candidate, blockedCount) in zip(self.candidates, self.blockedCounts)
+            if blockedCount == 0
+        ]
+
+
+    def update(self, courses:list[Course]) -> bool:
+        r"""
+        重新判断`courses`是否被阻挡，并更新含有它们的课表。
+
+        ## 参数
+
+        - `courses`（`list[Course]`）：选课人数发生了变化的课，例如`Course.refreshCounts`的返回值。
+
+        ## 返回
+
+        - `bool`：是否有课被阻挡或不再被阻挡，即可行课表的集合是否可能发生了变化。
+        """
+
+        changed = False
+        for course in courses:
+            blocked = self.isBlocked(course)
+            if blocked == (course.sectionId in self.blockedSections):
+                continue
+
+            # 这门课的状态变了，更新含有它的课表
+            changed = True
+            if blocked:
+                self.blockedSections.add(course.sectionId)
+                delta = 1
+            else:
+                self.blockedSections.remove(course.sectionId)
+                delta = -1
+            for index in self._indexes.get(course.sectionId, ()):
+                self.blockedCounts[index] += delta
+
+        return changed
+
+
+    def getScore(self, index:int) -> float:
+        r"""
+        返回`candidates[index]`的综合得分，与`TimeTable.scoreSectionIds`相同，但通勤时间只计算一次。
+        """
+
+        courses = [Course.sections[sectionId] for sectionId in self.candidates[index]]
+        if self.commuteTimes[index] is None:
+            self.commuteTimes[index] = TimeTable.commuteTimeOf(courses)
+        return TimeTable.scoreOf(self.commuteTimes[index], TimeTable.courseScoreOf(courses))
+
+
+    def top(self, k:int) -> list[tuple[int]]:
+        r"""
+        返回得分最高的`k`个可行的候选课表，按得分从高到低排列。
+        """
+
+        indexes = [
+            index
+            for (index, blockedCount) in enumerate(self.blockedCounts)
+            if blockedCount == 0
+        ]
+        return [self.candidates[index] for index in nlargest(k, indexes, key = self.getScore)]
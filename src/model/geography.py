@@ -0,0 +1,108 @@
+r"""
+class: Geography
+"""
+
+from types import MappingProxyType
+
+from config.constants import CAMPUS_CODES, CANTEEN_CODES, TEACHING_BUILDING_CODES, DORMITORY_BUILDING_CODES
+from config.constants import BUILDING_CODES, BUILDING_LOCATIONS
+from src.model.campus import Campus
+from src.model.building import Building
+from src.model.prefix_trie import PrefixTrie
+from src.model.spatial_index import SpatialIndex
+
+
+class Geography():
+    r"""
+    复旦大学的校区和楼的注册表。
+
+    创建时一次性创建所有的`Campus`和`Building`，之后不能再修改：各个字典都是只读的`MappingProxyType`，
+    属性也不能重新赋值。通常不直接创建，而是通过`src.util.geography.get_geography`取得那个在第一次使用时才创建的共享实例，
+    这样导入各个模型模块时不会有任何副作用。
+
+    ## 属性
+
+    - `campuses: Mapping[str, Campus]`：所有的校区，以校区代码为键。
+    - `buildings: Mapping[str, Building]`：所有的楼，以楼的代码为键。
+    - `canteens: Mapping[str, Building]`：所有的食堂。
+    - `teachingBuildings: Mapping[str, Building]`：所有的教学楼。
+    - `dormitoryBuildings: Mapping[str, Building]`：所有的寝室楼。
+    - `buildingTrie: PrefixTrie`：以楼的代码为键、以楼为值的前缀树，用于从教室代码中找出楼。
+    - `canteenIndex: SpatialIndex`：所有的食堂的空间索引。
+    - `buildingIndex: SpatialIndex`：所有的楼的空间索引。
+    """
+
+    __slots__ = (
+        "campuses",
+        "buildings",
+        "canteens",
+        "teachingBuildings",
+        "dormitoryBuildings",
+        "buildingTrie",
+        "canteenIndex",
+        "buildingIndex",
+    )
+
+    def __init__(self):
+        r"""
+        创建所有的校区和楼。
+
+        ## 异常
+
+        - `ValueError`：如果某栋楼的代码的第一个字符不是已知的校区代码。
+        """
+
+        set_ = object.__setattr__
+
+        # 校区
+        campuses = {code: Campus(code) for code in sorted(CAMPUS_CODES)}
+
+        # 空间索引
+        canteenIndex = SpatialIndex({code: BUILDING_LOCATIONS[code] for code in CANTEEN_CODES})
+        buildingIndex = SpatialIndex({code: BUILDING_LOCATIONS[code] for code in BUILDING_CODES})
+
+        def campusOf(code:str) -> Campus:
+            if code[0] not in campuses:
+                raise ValueError(f"unknown campus which this building belongs to: {code}")
+            return campuses[code[0]]
+
+        # 先创建食堂，它们离自己最近；再创建其它的楼，从食堂的空间索引中查询离它们最近的食堂
+        canteens = {code: Building(code, campusOf(code)) for code in sorted(CANTEEN_CODES)}
+        teachingBuildings = {
+            code: Building(code, campusOf(code), canteens[canteenIndex.nearestCode(BUILDING_LOCATIONS[code])])
+            for code in sorted(TEACHING_BUILDING_CODES - CANTEEN_CODES)
+        }
+        dormitoryBuildings = {
+            code: Building(code, campusOf(code), canteens[canteenIndex.nearestCode(BUILDING_LOCATIONS[code])])
+            for code in sorted(DORMITORY_BUILDING_CODES - CANTEEN_CODES - TEACHING_BUILDING_CODES)
+        }
+        buildings = canteens | teachingBuildings | dormitoryBuildings
+
+        set_(self, "campuses", MappingProxyType(campuses))
+        set_(self, "buildings", MappingProxyType(buildings))
+        set_(self, "canteens", MappingProxyType(canteens))
+        set_(self, "teachingBuildings", MappingProxyType(teachingBuildings))
+        set_(self, "dormitoryBuildings", MappingProxyType(dormitoryBuildings))
+        set_(self, "buildingTrie", PrefixTrie(buildings))
+        set_(self, "canteenIndex", canteenIndex)
+        set_(self, "buildingIndex", buildingIndex)
+
+
+    def __setattr__(self, name:str, value:object):
+        raise AttributeError(f"{type(self).__name__} is frozen, can't set attribute {name!r}")
+
+
+    def __delattr__(self, name:str):
+        raise AttributeError(f"{type(self).__name__} is frozen, can't delete attribute {name!r}")
+
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(campuses={len(self.campuses)}, buildings={len(self.buildings)})"
+
+
+
+if __name__ == "__main__":
+    geography = Geography()
+    print(geography)
+    print(geography.buildings["HGX"].nearestCanteen)
+    print(geography.buildingTrie.longestPrefix("H南区9301"))
@@ -0,0 +1,89 @@
+r"""
+class: LocationIndex
+"""
+
+from array import array
+
+
+class LocationIndex():
+    r"""
+    地点索引：给每个地点（`Room`或`Building`）分配一个整数编号，并预先计算任意两个地点之间的通勤时间。
+
+    通勤时间储存在一个稠密的`array('d')`矩阵中，`matrix[i * size + j]`就是`locations[i].commuteTime(locations[j])`，
+    包括上下楼的时间和寝室。这样，计算课表的通勤时间时只需要查表，而不用再经过`commuteTime`的类型分派、
+    经纬度换算等。
+
+    新的地点随时可以登记，矩阵在下一次被用到（`getMatrix`）时才扩充，已经算好的部分会被复制过去，不会重新计算。
+
+    ## 属性
+
+    - `locations: list[Room|Building]`：已经登记的地点，地点的编号就是它在这里的下标。
+    - `matrix: array`：通勤时间矩阵（单位：分钟），按行储存。
+    - `size: int`：`matrix`的行数（也是列数）；小于`len(locations)`时，说明有新登记的地点还没有算进矩阵。
+    """
+
+    def __init__(self):
+        self.locations = []
+        self.matrix = array("d")
+        self.size = 0
+
+
+    def __len__(self) -> int:
+        return len(self.locations)
+
+
+    def register(self, location:"Room|Building") -> int:
+        r"""
+        登记一个新的地点，返回它的编号。
+
+        ## 注意
+
+        - 同一个地点不要登记两次；`Room`和`Building`在创建实例时各自登记一次。
+        """
+
+        self.locations.append(location)
+        return len(self.locations) - 1
+
+
+    def getMatrix(self) -> tuple[array, int]:
+        r"""
+        返回`(matrix, size)`，必要时先把新登记的地点算进矩阵。
+        """
+
+        if self.size != len(self.locations):
+            self._extend()
+        return (self.matrix, self.size)
+
+
+    def commuteTime(self, fromId:int, toId:int) -> float:
+        r"""
+        从编号为`fromId`的地点到编号为`toId`的地点的通勤时间（单位：分钟）。
+        """
+
+        (matrix, size) = self.getMatrix()
+        return matrix[fromId * size + toId]
+
+
+    def _extend(self) -> None:
+        r"""
+        把新登记的地点算进矩阵。
+        """
+
+        (oldMatrix, oldSize) = (self.matrix, self.size)
+        locations = self.locations
+        size = len(locations)
+
+        matrix = array("d", bytes(8 * size * size))
+        for (i, location) in enumerate(locations):
+            # 旧的部分直接复制
+            if i < oldSize:
+                matrix[i * size : i * size + oldSize] = oldMatrix[i * oldSize : (i + 1) * oldSize]
+                start = oldSize
+            else:
+                start = 0
+
+            # 新的部分调用`commuteTime`计算
+            for j in range(start, size):
+                matrix[i * size + j] = location.commuteTime(locations[j])
+
+        (self.matrix, self.size) = (matrix, size)
@@ -0,0 +1,221 @@
+r"""
+class: Logger
+"""
+
+import os
+import sys
+import json
+import time
+import atexit
+from queue import Queue, Empty
+from threading import Thread
+
+
+class Logger():
+    r"""
+    分级的、带缓冲的日志，用来代替每记录一条消息就打开、写入、关闭一次日志文件。
+
+    `log`只在调用者的线程中输出到标准输出，写文件的工作交给后台线程：它把积攒下来的消息一次性写入文件，
+    文件超过`maxBytes`时轮换（`log.md`→`log.md.1`→`log.md.2`……），程序退出前等待它写完。
+
+    ## 级别
+
+    `"DEBUG"`、`"INFO"`、`"WARNING"`、`"ERROR"`，由低到高。低于`consoleLevel`的消息不输出到标准输出，低于`fileLevel`的消息不写入文件。
+
+    ## 属性
+
+    - `path: str`：日志文件的路径，每行形如`[2025-02-14 21:44:02][INFO]消息`。
+    - `jsonPath: str|None`：结构化日志文件的路径，每行是一个 JSON 对象（JSON Lines）；为`None`时不写入。
+    - `consoleLevel: str`：输出到标准输出的最低级别。
+    - `fileLevel: str`：写入文件的最低级别。
+    - `maxBytes: int`：日志文件的大小上限（字节），超过时轮换；为`0`时不轮换。
+    - `backupCount: int`：轮换时保留的旧日志文件的数量。
+    - `timeFormat: str`：时间的格式，如`config.constants.STR_TIME_FORMAT`。
+    """
+
+    levels = {"DEBUG": 10, "INFO": 20, "WARNING": 30, "ERROR": 40}
+
+    def __init__(
+        self,
+        path:str,
+        jsonPath:str|None = None,
+        *,
+        consoleLevel:str = "INFO",
+        fileLevel:str = "DEBUG",
+        maxBytes:int = 1 << 20,
+        backupCount:int = 3,
+        timeFormat:str = r"%Y-%m-%d %H:%M:%S",
+    ):
+        r"""
+        ## 参数
+
+        见类的属性。
+
+        ## 异常
+
+        - `ValueError`：如果`consoleLevel`或`fileLevel`不是已知的级别。
+        """
+
+        for level in (consoleLevel, fileLevel):
+            if level not in self.levels:
+                raise ValueError(f"level should be one of {tuple(self.levels)}, but got {level!r}")
+
+        self.path = path
+        self.jsonPath = jsonPath
+        self.consoleLevel = consoleLevel
+        self.fileLevel = fileLevel
+        self.maxBytes = maxBytes
+        self.backupCount = backupCount
+        self.timeFormat = timeFormat
+
+        # 后台写入线程，在第一次需要时启动
+        self._queue = None
+        self._thread = None
+
+
+    def log(self, message:str, level:str = "INFO") -> None:
+        r"""
+        记录一条消息。在请求和搜索的路径上调用，不会同步地写文件。
+
+        ## 参数
+
+        - `message`（`str`）：消息。
+        - `level`（`str`，可选）：级别，默认为`"INFO"`。
+
+        ## 异常
+
+        - `KeyError`：如果`level`不是已知的级别。
+        """
+
+        number = self.levels[level]
+
+        if number >= self.levels[self.fileLevel]:
+            self._startWriter()
+            self._queue.put((time.time(), level, message))
+
+        if number >= self.levels[self.consoleLevel]:
+            print(message)
+
+
+    def flush(self) -> None:
+        r"""
+        等待后台线程把所有已经交给它的消息写入文件。
+        """
+
+        if self._queue is not None:
+            self._queue.join()
+
+
+    def clear(self) -> None:
+        r"""
+        写完已经记录的消息，然后清空日志文件（不包括轮换出来的旧日志文件）。
+
+        ## 异常
+
+        - `FileNotFoundError`：如果日志文件不存在。
+        """
+
+        self.flush()
+        if not os.path.isfile(self.path):
+            raise FileNotFoundError(self.path)
+        for path in (self.path, self.jsonPath):
+            if path is not None and os.path.isfile(path):
+                with open(path, mode = "w", encoding = "utf-8"):
+                    pass
+
+
+    def _startWriter(self) -> None:
+        r"""
+        启动后台写入线程，并在程序退出前等待它写完。
+        """
+
+        if self._thread is not None:
+            return
+
+        self._queue = Queue()
+        self._thread = Thread(target = self._writeForever, daemon = True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+
+    def _writeForever(self) -> None:
+        while True:
+            # 等到第一条消息，再取走此时积攒下来的所有消息，一次性写入
+            records = [self._queue.get()]
+            try:
+                while True:
+                    records.append(self._queue.get_nowait())
+            except Empty:
+                pass
+
+            # 任何异常都不能结束这个线程，否则之后的消息没有人取走，退出时的`flush`会一直等待
+            try:
+                self._write(records)
+            except Exception as error:
+                print(f"写入日志失败：{type(error).__name__}: {str(error)}", file = sys.stderr)
+            finally:
+                for _ in records:
+                    self._queue.task_done()
+
+
+    def _write(self, records:list[tuple[float, str, str]]) -> None:
+        r"""
+        把`records`（`(时间戳, 级别, 消息)`）写入日志文件和结构化日志文件。
+        """
+
+        lines = []
+        jsonLines = []
+        for (timestamp, level, message) in records:
+            strTime = time.strftime(self.timeFormat, time.localtime(timestamp))
+            lines.append(f"[{strTime}][{level}]{message}\n")
+            if self.jsonPath is not None:
+                jsonLines.append(json.dumps({"time": strTime, "timestamp": timestamp, "level": level, "message": message}, ensure_ascii = False) + "\n")
+
+        self._append(self.path, "".join(lines))
+        if self.jsonPath is not None:
+            self._append(self.jsonPath, "".join(jsonLines))
+
+
+    def _append(self, path:str, content:str) -> None:
+        r"""
+        把`content`追加到`path`文件末尾，文件会超过`maxBytes`时先轮换。
+        """
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+
+        size = os.path.getsize(path) if os.path.isfile(path) else 0
+        if self.maxBytes and size and size + len(content.encode("utf-8")) > self.maxBytes:
+            self._rotate(path)
+
+        with open(path, mode = "a", encoding = "utf-8") as file:
+            file.write(content)
+
+
+    def _rotate(self, path:str) -> None:
+        r"""
+        轮换日志文件：`path.{n-1}`→`path.{n}`，……，`path`→`path.1`，最旧的被删除；`backupCount`为`0`时直接清空`path`。
+        """
+
+        if self.backupCount <= 0:
+            os.remove(path)
+            return
+
+        for index in range(self.backupCount - 1, 0, -1):
+            if os.path.isfile(f"{path}.{index}"):
+                os.replace(f"{path}.{index}", f"{path}.{index + 1}")
+        os.replace(path, f"{path}.1")
+
+
+
+if __name__ == "__main__":
+    from tempfile import TemporaryDirectory
+
+    with TemporaryDirectory() as directory:
+        logger = Logger(os.path.join(directory, "log.md"), os.path.join(directory, "log.jsonl"), maxBytes = 200, backupCount = 2)
+        for index in range(10):
+            logger.log(f"第 {index} 条消息", "DEBUG" if index % 2 else "INFO")
+            logger.flush()
+        print(sorted(os.listdir(directory)))
+        with open(os.path.join(directory, "log.md"), encoding = "utf-8") as file:
+            print(file.read())
@@ -0,0 +1,76 @@
+r"""
+class: PrefixTrie
+"""
+
+
+class PrefixTrie():
+    r"""
+    前缀树，用来查询一个字符串以哪个已知的键开头（最长前缀匹配）。
+
+    每个节点是一个字典，以字符为键指向子节点；一个键的最后一个字符所在的节点中，`PrefixTrie.END`对应这个键的值。
+    查询的时间与被查询的字符串的长度成正比，与键的数量无关。
+
+    ## 属性
+
+    - `root: dict`：根节点。
+    """
+
+    # 节点中表示“有一个键在这里结束”的特殊键，不会与任何字符相同
+    END = None
+
+    def __init__(self, items:dict[str, object]|None = None):
+        r"""
+        ## 参数
+
+        - `items`（`dict[str, object]|None`，可选）：要插入的键值对，默认为`None`，即创建空的前缀树。
+        """
+
+        self.root = {}
+        self._count = 0
+        for (key, value) in (items or {}).items():
+            self.insert(key, value)
+
+
+    def __len__(self) -> int:
+        return self._count
+
+
+    def insert(self, key:str, value:object) -> None:
+        r"""
+        插入键`key`及其值`value`，键已经存在时覆盖它的值。
+        """
+
+        node = self.root
+        for character in key:
+            node = node.setdefault(character, {})
+        if self.END not in node:
+            self._count += 1
+        node[self.END] = value
+
+
+    def longestPrefix(self, text:str) -> tuple[str, object]|None:
+        r"""
+        查询`text`以哪个键开头，有多个时取最长的那个。
+
+        ## 返回
+
+        - `(str, object)|None`：`(键, 值)`；如果`text`不以任何键开头，返回`None`。
+        """
+
+        node = self.root
+        match = None
+        for (index, character) in enumerate(text):
+            node = node.get(character)
+            if node is None:
+                break
+            if self.END in node:
+                match = (text[: index + 1], node[self.END])
+        return match
+
+
+
+if __name__ == "__main__":
+    trie = PrefixTrie({"H": 1, "HGX": 2, "H南区9": 3})
+    print(trie.longestPrefix("HGX507"))
+    print(trie.longestPrefix("H南区9301"))
+    print(trie.longestPrefix("JA101"))
@@ -0,0 +1,329 @@
+r"""
+class: Profiler
+"""
+
+import json
+import threading
+import tracemalloc
+import unicodedata
+from time import perf_counter
+from contextvars import ContextVar
+from contextlib import contextmanager, nullcontext
+
+
+class Profiler():
+    r"""
+    记录程序各阶段用时的剖析器。
+
+    用`span`给一段代码命名，片段可以嵌套，嵌套的片段以`/`连接的路径区分，如`"initialize/query/parse"`。
+    同一路径的片段可以执行多次（如每个查询请求），报告中合计它们的次数、总用时、平均用时和最长用时。
+    计时用`time.perf_counter`。
+
+    当前所在的片段记在`contextvars.ContextVar`中，所以并发的协程（`asyncio.gather`）和`asyncio.to_thread`的线程中，
+    片段也能正确地嵌套。并发执行的片段的总用时会重复计算，可能超过实际经过的时间。
+
+    `cProfile`和`pstats`（导入较慢）只在第一次剖析时才导入。
+
+    另外可以选择一些片段的名称：
+    - `profiled`中的片段用`cProfile`剖析，报告中列出累计用时最长的函数。同一时间只剖析一个片段，且只剖析进入片段的那个线程。
+    - `traced`中的片段用`tracemalloc`记录内存分配，报告中列出净分配的和峰值的内存。`tracemalloc`会使程序明显变慢。
+      第一个被记录的片段进入时开始`tracemalloc`，最后一个退出时才停止，所以重叠的片段（如并发的查询中的`parse`）都能完整地记录。
+      `tracemalloc`统计的是整个进程的内存，重叠期间其它片段的分配也会计入各自的净分配；它们还会互相重置峰值，此时峰值偏小。
+
+    ## 属性
+
+    - `enabled: bool`：是否记录。为`False`时`span`什么也不做。
+    - `profiled: frozenset[str]`：用`cProfile`剖析的片段的名称。
+    - `traced: frozenset[str]`：用`tracemalloc`记录内存分配的片段的名称。
+    - `records: dict[str, dict]`：以片段的路径为键，按第一次进入的顺序排列，值包含`count`、`total`、`max`（秒），
+      被记录内存分配的片段还有`allocated`（净分配的字节数之和）和`peak`（峰值的字节数的最大值）。
+
+    ## 示例
+
+    >>> profiler = Profiler(profiled = ("combine",))
+    >>> with profiler.span("combine"):
+    ...     combine_courses(tags)
+    >>> print(profiler.format())
+    """
+
+    # 报告中列出的累计用时最长的函数的数量
+    topFunctions = 10
+
+    # 表格的表头及每列的宽度，与`format`中的格式一致
+    headings = (
+        ("阶段", 32), ("次数", 8), ("总用时/ms", 12), ("平均/ms", 10), ("最长/ms", 10), ("占比", 8),
+        ("净分配/KiB", 12), ("峰值/KiB", 10),
+    )
+
+    def __init__(self, enabled:bool = True, profiled:"Iterable[str]" = (), traced:"Iterable[str]" = ()):
+        r"""
+        ## 参数
+
+        - `enabled`（`bool`，可选）：是否记录，默认为`True`。
+        - `profiled`（`Iterable[str]`，可选）：用`cProfile`剖析的片段的名称，默认为空。
+        - `traced`（`Iterable[str]`，可选）：用`tracemalloc`记录内存分配的片段的名称，默认为空。
+        """
+
+        self.enabled = enabled
+        self.profiled = frozenset(profiled)
+        self.traced = frozenset(traced)
+        self.records = {}
+        self._stats = {}
+        self._path = ContextVar("path", default = ())
+        self._lock = threading.Lock()
+        self._profiling = False
+        self._tracing = 0
+        self._startedAt = perf_counter()
+
+
+    def span(self, name:str) -> "ContextManager":
+        r"""
+        返回一个上下文管理器，把其中的代码记为名为`name`的片段。
+
+        ## 示例
+
+        >>> with profiler.span("login"):
+        ...     session = uis_login()
+        """
+
+        if not self.enabled:
+            return nullcontext()
+        return self._span(name)
+
+
+    @contextmanager
+    def _span(self, name:str):
+        path = self._path.get() + (name,)
+        token = self._path.set(path)
+
+        # 进入时就占好位置，使报告按第一次进入的顺序排列，外层的片段在内层的之前
+        with self._lock:
+            self.records.setdefault("/".join(path), {"count": 0, "total": 0.0, "max": 0.0})
+
+        profile = self._startProfile(name)
+        memory = self._startTrace(name)
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = perf_counter() - start
+            (allocated, peak) = self._stopTrace(memory)
+            self._stopProfile(name, profile)
+            self._path.reset(token)
+            self._record("/".join(path), elapsed, allocated, peak)
+
+
+    def _startProfile(self, name:str) -> "cProfile.Profile|None":
+        r"""
+        如果要剖析名为`name`的片段，并且没有正在剖析的片段，开始剖析。
+        """
+
+        if name not in self.profiled:
+            return None
+        with self._lock:
+            if self._profiling:
+                return None
+            self._profiling = True
+
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # 已经有别的剖析工具（如调试器）在运行
+            with self._lock:
+                self._profiling = False
+            return None
+        return profile
+
+
+    def _stopProfile(self, name:str, profile:"cProfile.Profile|None") -> None:
+        if profile is None:
+            return
+        profile.disable()
+
+        import io
+        import pstats
+
+        with self._lock:
+            self._profiling = False
+            if name in self._stats:
+                self._stats[name].add(profile)
+            else:
+                self._stats[name] = pstats.Stats(profile, stream = io.StringIO())
+
+
+    def _startTrace(self, name:str) -> int|None:
+        r"""
+        如果要记录名为`name`的片段的内存分配，返回开始时已分配的字节数。
+
+        `_tracing`是尚未退出的被记录的片段的数量，由`0`变为`1`时开始`tracemalloc`。
+        """
+
+        if name not in self.traced:
+            return None
+        with self._lock:
+            if self._tracing == 0 and not tracemalloc.is_tracing():
+                tracemalloc.start()
+            self._tracing += 1
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+
+
+    def _stopTrace(self, before:int|None) -> tuple[int|None, int|None]:
+        r"""
+        返回片段的`(净分配的字节数, 峰值的字节数)`。`_tracing`由`1`变为`0`时停止`tracemalloc`。
+        """
+
+        if before is None:
+            return (None, None)
+        with self._lock:
+            (current, peak) = tracemalloc.get_traced_memory()
+            self._tracing -= 1
+            if self._tracing == 0:
+                tracemalloc.stop()
+        return (current - before, max(peak - before, 0))
+
+
+    def _record(self, path:str, elapsed:float, allocated:int|None, peak:int|None) -> None:
+        with self._lock:
+            record = self.records[path]
+            record["count"] += 1
+            record["total"] += elapsed
+            record["max"] = max(record["max"], elapsed)
+            if allocated is not None:
+                record["allocated"] = record.get("allocated", 0) + allocated
+                record["peak"] = max(record.get("peak", 0), peak)
+
+
+    def report(self) -> dict:
+        r"""
+        返回报告。
+
+        ## 返回
+
+        - `dict`：包含以下键的字典，可以直接转换为 JSON：
+            - `"elapsed"`：创建剖析器以来经过的时间（秒）。
+            - `"spans"`：每个路径的片段一项，包含`path`、`count`、`total`、`mean`、`max`（秒），
+              以及`allocated`和`peak`（字节，只有被记录内存分配的片段才有）。
+            - `"profiles"`：以被剖析的片段的名称为键，以累计用时最长的函数为值，每个函数包含`function`、`calls`、`total`、`cumulative`。
+        """
+
+        with self._lock:
+            spans = [
+                {"path": path, **record, "mean": record["total"] / record["count"]}
+                for (path, record) in self.records.items()
+                if record["count"]
+            ]
+            profiles = {name: self._topFunctions(stats) for (name, stats) in self._stats.items()}
+
+        return {
+            "elapsed": perf_counter() - self._startedAt,
+            "spans": spans,
+            "profiles": profiles,
+        }
+
+
+    @classmethod
+    def _topFunctions(cls, stats:"pstats.Stats") -> list[dict]:
+        r"""
+        返回累计用时最长的`topFunctions`个函数，不含剖析器自己的函数。
+        """
+
+        functions = sorted(
+            (item for item in stats.stats.items() if item[0][0] != __file__),
+            key = lambda item: item[1][3],
+            reverse = True,
+        )
+        return [
+            {
+                "function": f"{file}:{line}({function})",
+                "calls": calls,
+                "total": total,
+                "cumulative": cumulative,
+            }
+            for ((file, line, function), (_, calls, total, cumulative, _)) in functions[: cls.topFunctions]
+        ]
+
+
+    @staticmethod
+    def _pad(text:str, width:int, left:bool = False) -> str:
+        r"""
+        把`text`补齐到`width`个半角字符宽，全角字符（如汉字）算两个。
+        """
+
+        length = sum(2 if unicodedata.east_asian_width(char) in "WF" else 1 for char in text)
+        padding = " " * max(width - length, 0)
+        return text + padding if left else padding + text
+
+
+    def format(self, report:dict|None = None) -> str:
+        r"""
+        把报告（默认为`report()`）格式化为表格。
+        """
+
+        report = self.report() if report is None else report
+        elapsed = report["elapsed"]
+
+        lines = ["".join(
+            self._pad(heading, width, left = index == 0)
+            for (index, (heading, width)) in enumerate(self.headings)
+        )]
+        for span in report["spans"]:
+            # 嵌套的片段按层级缩进，只显示最后一级的名称
+            depth = span["path"].count("/")
+            name = "  " * depth + span["path"].rsplit("/", 1)[-1]
+            memory = (
+                f"{span['allocated'] / 1024:>12.1f}{span['peak'] / 1024:>10.1f}"
+                if "allocated" in span else ""
+            )
+            lines.append(
+                f"{name:<32}{span['count']:>8}{span['total'] * 1000:>12.1f}{span['mean'] * 1000:>10.2f}"
+                f"{span['max'] * 1000:>10.1f}{span['total'] / elapsed:>8.1%}{memory}"
+            )
+        lines.append(f"共 {elapsed:.3f} 秒")
+
+        for (name, functions) in report["profiles"].items():
+            lines.append(f"\n{name} 中累计用时最长的函数：")
+            for function in functions:
+                lines.append(f"{function['cumulative'] * 1000:>10.1f} ms {function['calls']:>8} 次  {function['function']}")
+
+        return "\n".join(lines)
+
+
+    def dump(self, path:str, report:dict|None = None) -> None:
+        r"""
+        把报告（默认为`report()`）以 JSON 格式写入文件`path`。
+        """
+
+        from src.util.file import write_to_file
+
+        report = self.report() if report is None else report
+        write_to_file(path, json.dumps(report, ensure_ascii = False, indent = 2))
+
+
+
+if __name__ == "__main__":
+    import asyncio
+    from time import sleep
+
+    profiler = Profiler(profiled = ("combine",), traced = ("parse",))
+
+    async def query(index:int) -> list[int]:
+        with profiler.span("query"):
+            await asyncio.sleep(0.01)
+            with profiler.span("parse"):
+                return await asyncio.to_thread(lambda: list(range(index * 10000)))
+
+    async def crawl() -> None:
+        await asyncio.gather(*(query(index) for index in range(5)))
+
+    with profiler.span("initialize"):
+        with profiler.span("login"):
+            sleep(0.02)
+        asyncio.run(crawl())
+    with profiler.span("combine"):
+        sum(sorted(range(200000), key = lambda value: -value))
+
+    print(profiler.format())
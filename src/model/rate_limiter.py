@@ -0,0 +1,61 @@
+r"""
+class: RateLimiter
+"""
+
+from asyncio import sleep
+from time import monotonic
+
+
+class RateLimiter():
+    r"""
+    异步限速器。
+
+    保证通过同一个限速器发出的任意两个请求，它们的开始时间至少间隔`interval`秒。
+
+    ## 属性
+
+    - `interval: float`：两次请求之间的最小时间间隔（秒）。
+
+    ## 注意
+
+    - 不使用`asyncio.Lock`：在`acquire`中，读取和更新`_next`之间没有`await`，所以在单个事件循环内是原子的；
+      这样同一个限速器也可以被多次`asyncio.run`共用。
+    """
+
+    def __init__(self, interval:float):
+        r"""
+        ## 参数
+
+        - `interval`（`float`）：两次请求之间的最小时间间隔（秒）。
+        """
+
+        self.interval = interval
+
+        # 下一个请求最早可以开始的时刻（`time.monotonic()`）
+        self._next = 0.0
+
+
+    async def acquire(self) -> None:
+        r"""
+        等待，直到可以发出下一个请求。
+        """
+
+        now = monotonic()
+
+        # 预约一个时间槽，并把下一个时间槽往后推
+        start = max(now, self._next)
+        self._next = start + self.interval
+
+        await sleep(start - now)
+
+
+    def penalize(self, delay:float) -> None:
+        r"""
+        让之后的所有请求都至少再等待`delay`秒，用于服务器返回“请不要过快点击”之后的退避。
+
+        ## 参数
+
+        - `delay`（`float`）：从现在起需要等待的时间（秒）。
+        """
+
+        self._next = max(self._next, monotonic() + delay)
@@ -0,0 +1,153 @@
+r"""
+class: ResponseDumper
+"""
+
+import os
+import sys
+import atexit
+from collections import deque
+from queue import Queue
+from threading import Thread
+
+
+class ResponseDumper():
+    r"""
+    响应文本的诊断输出，用来代替在每次请求后同步地写文件。
+
+    ## 模式
+
+    - `"off"`：平时什么也不记录，只在出错时把出错的那一个响应写入文件。
+    - `"ring"`：在内存中保留最近的`ringSize`个响应，出错时把它们全部写入文件。
+    - `"async"`：每个响应都交给后台线程写入文件，请求本身不等待磁盘。
+
+    ## 属性
+
+    - `mode: str`：模式，为`"off"`、`"ring"`、`"async"`之一。
+    - `path: str`：写入文件的文件夹。
+    - `ring: deque[tuple[str, str]]`：`"ring"`模式下最近的`(文件名, 响应文本)`。
+    """
+
+    modes = ("off", "ring", "async")
+
+    def __init__(self, mode:str = "ring", path:str = "tmp", ringSize:int = 16):
+        r"""
+        ## 参数
+
+        - `mode`（`str`）：模式，为`"off"`、`"ring"`、`"async"`之一。
+        - `path`（`str`）：写入文件的文件夹。
+        - `ringSize`（`int`）：`"ring"`模式下在内存中保留的响应的数量。
+
+        ## 异常
+
+        - `ValueError`：如果`mode`不是以上三种之一。
+        """
+
+        if mode not in self.modes:
+            raise ValueError(f"`mode` should be one of {self.modes}, but got {mode!r}")
+
+        self.mode = mode
+        self.path = path
+        self.ring = deque(maxlen = ringSize)
+
+        # 后台写入线程，在第一次需要时启动
+        self._queue = None
+        self._thread = None
+
+
+    def record(self, name:str, text:str) -> None:
+        r"""
+        记录一个响应。在请求的路径上调用，不会同步地写文件。
+
+        ## 参数
+
+        - `name`（`str`）：写入时的文件名，如`"stdElectCourse.action.html"`。
+        - `text`（`str`）：响应文本。
+        """
+
+        if self.mode == "ring":
+            self.ring.append((name, text))
+        elif self.mode == "async":
+            self._startWriter()
+            self._queue.put((name, text))
+
+
+    def dumpOnError(self, name:str, text:str) -> None:
+        r"""
+        出错时调用：把出错的响应以及`"ring"`模式下保留的响应写入文件。
+
+        ## 参数
+
+        - `name`（`str`）：出错的响应的文件名。
+        - `text`（`str`）：出错的响应文本。
+        """
+
+        if self.mode == "off":
+            self._write(name, text)
+        elif self.mode == "ring":
+            self.dump()
+        else:
+            # 已经交给后台线程了，等它写完
+            self.flush()
+
+
+    def dump(self) -> list[str]:
+        r"""
+        把`"ring"`模式下保留的响应全部写入文件，按时间先后在文件名前加上序号，并清空保留的响应。
+
+        ## 返回
+
+        - `list[str]`：写入的文件的路径。
+        """
+
+        paths = []
+        for (index, (name, text)) in enumerate(self.ring):
+            paths.append(self._write(f"{index:02d}_{name}", text))
+        self.ring.clear()
+        return paths
+
+
+    def flush(self) -> None:
+        r"""
+        等待后台线程写完所有已经交给它的响应。
+        """
+
+        if self._queue is not None:
+            self._queue.join()
+
+
+    def _startWriter(self) -> None:
+        r"""
+        启动后台写入线程，并在程序退出前等待它写完。
+        """
+
+        if self._thread is not None:
+            return
+
+        self._queue = Queue()
+        self._thread = Thread(target = self._writeForever, daemon = True)
+        self._thread.start()
+        atexit.register(self.flush)
+
+
+    def _writeForever(self) -> None:
+        while True:
+            (name, text) = self._queue.get()
+            # 任何异常都不能结束这个线程，否则之后的响应没有人取走，`dumpOnError`和退出时的`flush`会一直等待
+            try:
+                self._write(name, text)
+            except Exception as error:
+                print(f"写入响应失败：{type(error).__name__}: {str(error)}", file = sys.stderr)
+            finally:
+                self._queue.task_done()
+
+
+    def _write(self, name:str, text:str) -> str:
+        r"""
+        将`text`写入`path`文件夹下的`name`文件，返回文件的路径。
+        """
+
+        os.makedirs(self.path, exist_ok = True)
+        path = os.path.join(self.path, name)
+        with open(path, mode = "w", encoding = "utf-8") as file:
+            file.write(text)
+        return path
@@ -0,0 +1,258 @@
+r"""
+class: ResultDatabase
+"""
+
+import os
+import time
+import sqlite3
+
+from config.user import COMMUTE_TIME_WEIGHT, COURSE_SCORE_WEIGHT
+from src.model.course import Course
+
+
+class ResultDatabase():
+    r"""
+    保存每次运行排出的所有课表的 SQLite 数据库，用来比较不同的运行，或查询“含有某门课的最好的课表”。
+
+    ## 表
+
+    - `runs`：每次运行一行，记录时间、选课阶段、权重和课表的数量。
+    - `sections`：每个课程序号一行，记录课程代码、名称、教师和学分。不同的运行共用同一行。
+    - `schedules`：每个课表一行，记录所属的运行、名次、通勤时间、课程得分和综合得分。
+    - `schedule_sections`：课表与课的对应关系，冗余地记录了课表的综合得分，
+      因此按课程序号查询得分最高的课表时，只需沿着主键`(sectionId, score, scheduleId)`逆序扫描，不用排序。
+
+    `schedules`上另有`(runId, score)`和`score`的索引，`schedule_sections`上另有`(scheduleId, position)`的索引。
+
+    一次运行的所有课表在同一个事务中用`executemany`批量写入。可以用作上下文管理器。
+
+    ## 属性
+
+    - `path: str`：数据库文件的路径。
+    - `connection: sqlite3.Connection`：数据库连接。
+
+    ## 示例
+
+    >>> with ResultDatabase("result/results.sqlite3") as database:
+    ...     database.best(1, courseNos = ("MATH120017.06",))
+    """
+
+    SCHEMA = r"""
+    CREATE TABLE IF NOT EXISTS runs (
+        id INTEGER PRIMARY KEY,
+        createdAt REAL NOT NULL,
+        phase TEXT,
+        commuteTimeWeight REAL NOT NULL,
+        courseScoreWeight REAL NOT NULL,
+        scheduleCount INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS sections (
+        id INTEGER PRIMARY KEY,
+        courseNo TEXT NOT NULL UNIQUE,
+        courseCode TEXT,
+        name TEXT,
+        teachers TEXT,
+        credits REAL
+    );
+    CREATE TABLE IF NOT EXISTS schedules (
+        id INTEGER PRIMARY KEY,
+        runId INTEGER NOT NULL REFERENCES runs (id),
+        rank INTEGER NOT NULL,
+        commuteTime REAL NOT NULL,
+        courseScore REAL NOT NULL,
+        score REAL NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS schedule_sections (
+        sectionId INTEGER NOT NULL REFERENCES sections (id),
+        score REAL NOT NULL,
+        scheduleId INTEGER NOT NULL REFERENCES schedules (id),
+        position INTEGER NOT NULL,
+        PRIMARY KEY (sectionId, score, scheduleId)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS schedules_run_score ON schedules (runId, score);
+    CREATE INDEX IF NOT EXISTS schedules_score ON schedules (score);
+    CREATE INDEX IF NOT EXISTS schedule_sections_schedule ON schedule_sections (scheduleId, position, sectionId);
+    """
+
+    def __init__(self, path:str):
+        r"""
+        ## 参数
+
+        - `path`（`str`）：数据库文件的路径，不存在时自动创建。
+        """
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        self.connection.executescript(self.SCHEMA)
+
+
+    def __enter__(self) -> "ResultDatabase":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+
+    def close(self) -> None:
+        r"""
+        关闭数据库连接。
+        """
+
+        self.connection.close()
+
+
+    def _sectionIds(self, sectionIds:"Iterable[int]") -> dict[int, int]:
+        r"""
+        把本次运行中的`sectionId`对应的课写入`sections`（已有的不变），返回它们在数据库中的`id`。
+        """
+
+        courses = {sectionId: Course.sections[sectionId] for sectionId in set(sectionIds)}
+        self.connection.executemany(
+            "INSERT OR IGNORE INTO sections (courseNo, courseCode, name, teachers, credits) VALUES (?, ?, ?, ?, ?)",
+            (
+                (course.courseNo, course.courseCode, course.courseName, course.teachers, course.credits)
+                for course in courses.values()
+            ),
+        )
+        ids = dict(self.connection.execute(
+            f"SELECT courseNo, id FROM sections WHERE courseNo IN ({', '.join('?' * len(courses))})",
+            [course.courseNo for course in courses.values()],
+        )) if courses else {}
+        return {sectionId: ids[course.courseNo] for (sectionId, course) in courses.items()}
+
+
+    def addRun(self, phase:str|None, candidates:"Sequence[tuple[int]]", components:"Sequence[tuple[float, float, float]]") -> int:
+        r"""
+        在一个事务中写入一次运行排出的所有课表。
+
+        ## 参数
+
+        - `phase`（`str|None`）：选课阶段，如`"第三轮"`。
+        - `candidates`（`Sequence[tuple[int]]`）：已经按照评分排好序的候选课表，名次从`1`开始。
+        - `components`（`Sequence[tuple[float, float, float]]`）：每个课表的通勤时间、课程得分和综合得分。
+
+        ## 返回
+
+        - `int`：这次运行的`id`。
+        """
+
+        with self.connection:
+            runId = self.connection.execute(
+                "INSERT INTO runs (createdAt, phase, commuteTimeWeight, courseScoreWeight, scheduleCount) VALUES (?, ?, ?, ?, ?)",
+                (time.time(), phase, COMMUTE_TIME_WEIGHT, COURSE_SCORE_WEIGHT, len(candidates)),
+            ).lastrowid
+
+            sectionIds = self._sectionIds(sectionId for candidate in candidates for sectionId in candidate)
+
+            # 课表的`id`连续分配，不必逐行取`lastrowid`
+            firstId = self.connection.execute("SELECT COALESCE(MAX(id), 0) + 1 FROM schedules").fetchone()[0]
+            self.connection.executemany(
+                "INSERT INTO schedules (id, runId, rank, commuteTime, courseScore, score) VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    (firstId + index, runId, index + 1, commuteTime, courseScore, score)
+                    for (index, (commuteTime, courseScore, score)) in enumerate(components)
+                ),
+            )
+            self.connection.executemany(
+                "INSERT INTO schedule_sections (sectionId, score, scheduleId, position) VALUES (?, ?, ?, ?)",
+                (
+                    (sectionIds[sectionId], score, firstId + index, position)
+                    for (index, (candidate, (_, _, score))) in enumerate(zip(candidates, components))
+                    for (position, sectionId) in enumerate(candidate)
+                ),
+            )
+
+        return runId
+
+
+    def runs(self) -> list[dict]:
+        r"""
+        返回所有的运行，最近的在前。
+        """
+
+        cursor = self.connection.execute("SELECT * FROM runs ORDER BY id DESC")
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor]
+
+
+    def best(self, limit:int = 10, runId:int|None = None, courseNos:"Sequence[str]" = ()) -> list[dict]:
+        r"""
+        查询得分最高的课表。
+
+        ## 参数
+
+        - `limit`（`int`，可选）：返回的数量，默认为`10`。
+        - `runId`（`int|None`，可选）：只查询这次运行的课表，默认为`None`，即所有的运行。
+        - `courseNos`（`Sequence[str]`，可选）：只查询含有所有这些课的课表，默认为空，即不限。
+
+        ## 返回
+
+        - `list[dict]`：按综合得分从高到低排列（相同时后写入的在前，与索引的顺序一致，不用排序），每个课表包含`id`、`runId`、`rank`、`commuteTime`、`courseScore`、`score`，
+          以及课表中的课的课程序号`courseNos`（与写入时的顺序相同）。
+
+        ## 示例
+
+        >>> database.best(1, courseNos = ("MATH120017.06",))
+        [{'id': 1024, 'runId': 3, 'rank': 5, ..., 'courseNos': ['MATH120017.06', ...]}]
+        """
+
+        conditions = []
+        parameters = []
+        if courseNos:
+            # 沿着第一门课的主键按得分逆序扫描，其余的课用`(scheduleId, position, sectionId)`索引检查
+            source = "schedule_sections AS first JOIN schedules ON schedules.id = first.scheduleId"
+            conditions.append("first.sectionId = (SELECT id FROM sections WHERE courseNo = ?)")
+            parameters.append(courseNos[0])
+            for courseNo in courseNos[1:]:
+                conditions.append(
+                    "EXISTS (SELECT 1 FROM schedule_sections WHERE scheduleId = schedules.id"
+                    " AND sectionId = (SELECT id FROM sections WHERE courseNo = ?))"
+                )
+                parameters.append(courseNo)
+            order = "first.score DESC, first.scheduleId DESC"
+        else:
+            source = "schedules"
+            order = "schedules.score DESC, schedules.id DESC"
+        if runId is not None:
+            conditions.append("schedules.runId = ?")
+            parameters.append(runId)
+
+        cursor = self.connection.execute(
+            f"SELECT schedules.* FROM {source}"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" ORDER BY {order} LIMIT ?",
+            (*parameters, limit),
+        )
+        columns = [column[0] for column in cursor.description]
+        schedules = [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+        for schedule in schedules:
+            schedule["courseNos"] = [
+                courseNo
+                for (courseNo,) in self.connection.execute(
+                    "SELECT sections.courseNo FROM schedule_sections JOIN sections ON sections.id = schedule_sections.sectionId"
+                    " WHERE schedule_sections.scheduleId = ? ORDER BY schedule_sections.position",
+                    (schedule["id"],),
+                )
+            ]
+        return schedules
+
+
+
+if __name__ == "__main__":
+    from sys import argv
+
+    from config.constants import RESULT_DATABASE_PATH
+
+    # 用法：python -m src.model.result_database [课程序号 ...]
+    with ResultDatabase(RESULT_DATABASE_PATH) as database:
+        for run in database.runs()[:5]:
+            print(run)
+        for schedule in database.best(5, courseNos = argv[1:]):
+            print(schedule)
@@ -0,0 +1,173 @@
+r"""
+class: ResultWriter
+"""
+
+import os
+import csv
+import json
+from html import escape
+
+
+class ResultWriter():
+    r"""
+    把排好序的课程表写入输出文件，用来代替每写一个课程表就重新打开一次文件。
+
+    创建时按`formats`打开每个输出文件（各一次，带缓冲），之后每个课程表依次流式写入，`close`时补上文件的结尾并关闭。
+    可以用作上下文管理器。
+
+    ## 格式
+
+    - `"csv"`：与`TimeTable.toCsv`相同的表格，编码为`csvEncoding`（`"gbk"`便于用 Excel 打开，`"utf-8"`便于用其它程序读取）。
+    - `"jsonl"`：每行是一个课程表的`TimeTable.toJSON`，加上名次`rank`，编码为 UTF-8。
+    - `"html"`：不依赖任何外部文件的网页，用浏览器打开即可查看所有课程表，编码为 UTF-8。
+
+    ## 属性
+
+    - `paths: dict[str, str]`：以格式为键，以输出文件的路径（`basePath`加上扩展名）为值。
+    - `count: int`：已经写入的课程表的数量。
+
+    ## 示例
+
+    >>> with ResultWriter("result/watch", ("csv", "html")) as writer:
+    ...     for timeTable in timeTables:
+    ...         writer.write(timeTable)
+    """
+
+    formats = ("csv", "jsonl", "html")
+
+    extensions = {"csv": ".csv", "jsonl": ".jsonl", "html": ".html"}
+
+    # 每个输出文件的缓冲区大小（字节）
+    bufferSize = 1 << 16
+
+    def __init__(self, basePath:str, formats:"Iterable[str]" = ("csv",), csvEncoding:str = "gbk", title:str = "课程表"):
+        r"""
+        ## 参数
+
+        - `basePath`（`str`）：不带扩展名的输出路径，文件已存在时会被覆盖。
+        - `formats`（`Iterable[str]`，可选）：输出的格式，默认为`("csv",)`。
+        - `csvEncoding`（`str`，可选）：CSV 文件的编码，默认为`"gbk"`。
+        - `title`（`str`，可选）：网页的标题，默认为`"课程表"`。
+
+        ## 异常
+
+        - `ValueError`：如果`formats`为空，或者其中有未知的格式。
+        """
+
+        formats = tuple(dict.fromkeys(formats))
+        if not formats or any(format_ not in self.formats for format_ in formats):
+            raise ValueError(f"`formats` should be some of {self.formats}, but got {formats!r}")
+
+        self.paths = {format_: basePath + self.extensions[format_] for format_ in formats}
+        self.count = 0
+
+        if os.path.dirname(basePath):
+            os.makedirs(os.path.dirname(basePath), exist_ok = True)
+
+        # 打开所有输出文件，有一个打不开时关闭已经打开的
+        self._files = {}
+        try:
+            for (format_, path) in self.paths.items():
+                encoding = csvEncoding if format_ == "csv" else "utf-8"
+                self._files[format_] = open(path, mode = "w", newline = "", encoding = encoding, buffering = self.bufferSize)
+        except BaseException:
+            self.close()
+            raise
+
+        self._csvWriter = csv.writer(self._files["csv"]) if "csv" in self._files else None
+        if "html" in self._files:
+            self._files["html"].write(self._htmlHead(title))
+
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+
+    def write(self, timeTable:"TimeTable") -> None:
+        r"""
+        写入一个课程表，名次是`count + 1`。
+        """
+
+        self.count += 1
+
+        if self._csvWriter is not None or "html" in self._files:
+            rows = timeTable.toCsvRows()
+        if self._csvWriter is not None:
+            self._csvWriter.writerows(rows)
+        if "jsonl" in self._files:
+            self._files["jsonl"].write(json.dumps({"rank": self.count, **timeTable.toJSON()}, ensure_ascii = False) + "\n")
+        if "html" in self._files:
+            self._files["html"].write(self._htmlSection(self.count, rows))
+
+
+    def writeAll(self, timeTables:"Iterable[TimeTable]") -> int:
+        r"""
+        依次写入`timeTables`中的课程表，返回写入的数量。
+        """
+
+        count = 0
+        for timeTable in timeTables:
+            self.write(timeTable)
+            count += 1
+        return count
+
+
+    def close(self) -> None:
+        r"""
+        补上文件的结尾，写出缓冲区并关闭所有输出文件。可以重复调用。
+        """
+
+        files = self._files
+        self._files = {}
+        try:
+            if "html" in files:
+                files["html"].write("</body>\n</html>\n")
+        finally:
+            for file in files.values():
+                file.close()
+
+
+    @staticmethod
+    def _htmlHead(title:str) -> str:
+        return (
+            "<!DOCTYPE html>\n"
+            "<html lang=\"zh-CN\">\n"
+            "<head>\n"
+            "<meta charset=\"utf-8\">\n"
+            f"<title>{escape(title)}</title>\n"
+            "<style>\n"
+            "body { font-family: sans-serif; margin: 2em; }\n"
+            "table { border-collapse: collapse; margin-bottom: 2em; }\n"
+            "th, td { border: 1px solid #999; padding: 0.3em 0.6em; font-size: 0.9em; }\n"
+            "th { background: #eee; }\n"
+            "td:not(:empty) { background: #e8f0fe; }\n"
+            "td:nth-child(-n+2) { background: none; white-space: nowrap; }\n"
+            "</style>\n"
+            "</head>\n"
+            "<body>\n"
+            f"<h1>{escape(title)}</h1>\n"
+        )
+
+
+    @staticmethod
+    def _htmlSection(rank:int, rows:list[list[str]]) -> str:
+        r"""
+        由`TimeTable.toCsvRows`的各行生成一个课程表的网页片段：第一行是得分，第二行是表头，最后一行是空行。
+        """
+
+        (scores, heading, *body, _) = rows
+        parts = [
+            f"<h2>第 {rank} 名</h2>\n",
+            f"<p>{escape('，'.join(score for score in scores if score))}</p>\n",
+            "<table>\n<tr>",
+            "".join(f"<th>{escape(cell)}</th>" for cell in heading),
+            "</tr>\n",
+        ]
+        for row in body:
+            parts.append("<tr>" + "".join(f"<td>{escape(cell)}</td>" for cell in row) + "</tr>\n")
+        parts.append("</table>\n")
+        return "".join(parts)
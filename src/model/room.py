@@ -4,10 +4,10 @@ class: Room
 
 from importlib import import_module
 
-from config.constants import BUILDING_CODES, DORMITORY_CODE
+from config.constants import DORMITORY_CODE
 from src.model.building import Building
-
-BUILDING_CODES = tuple(sorted(BUILDING_CODES, reverse = True))
+from src.util import location
+from src.util.geography import get_geography
 
 
 class Room():
@@ -20,10 +20,13 @@ class Room():
     - `code: str`：教室代码，如`"HGX507"`。
     - `building: src.model.Building.Building`：教室所在的楼，如`Building('HGX')`。
     - `floor: int`：楼层数，如`5`。
+    - `locationId: int`：这间教室在`src.util.location`的地点索引中的编号。
     - `nearestCanteen: Building`：距离这间教室最近的食堂，如`Building('H本部食堂')`。
     - `number: str`：房间序号，如`"07"`。
     """
 
+    __slots__ = ("code", "building", "floor", "number", "nearestCanteen", "locationId")
+
     rooms = {}
 
     def __init__(self, code:str):
@@ -39,6 +42,9 @@ class Room():
         self._parseCode(code)
         self.nearestCanteen = self.building.nearestCanteen
 
+        # 登记到地点索引中
+        self.locationId = location.register(self)
+
 
     def _parseCode(self, code:str) -> None:
         """
@@ -52,17 +58,13 @@ class Room():
 
         - `ValueError`：当无法识别教学楼或楼层时抛出。
         """
-        index = 0
-
-        # 提取楼层信息
-        for building_code in BUILDING_CODES:
-            if code.startswith(building_code):
-                self.building = Building.getBuildings()[building_code]
-                index += len(building_code)
-                break
-        else:
+        # 提取楼的信息，取最长的匹配的楼的代码，如`"H南区9301"`是`"H南区9"`而不是`"H"`开头的楼
+        match = get_geography().buildingTrie.longestPrefix(code)
+        if match is None:
             # 没有找到预定义的教学楼
             raise ValueError(f"unknown building which this room belongs to: {code}")
+        (building_code, self.building) = match
+        index = len(building_code)
 
         # 如果除了楼的信息还有别的信息，那就是楼层和序号了
         if len(code) > index:
@@ -129,6 +131,15 @@ class Room():
         return room
 
 
+    @classmethod
+    def getDormitory(cls) -> "Room":
+        r"""
+        返回寝室，即代码为`DORMITORY_CODE`的`Room`实例。
+        """
+
+        return cls.fromString(DORMITORY_CODE)
+
+
     def commuteTime(self, other: "Arrangement|Room|Building") -> float:
         r"""
         从这间教室`self`到另一间教室`other`的预期时间（单位：分钟）。
@@ -162,9 +173,3 @@ class Room():
         Arrangement = import_module("src.model.arrangement").Arrangement
         if isinstance(other, Arrangement):
             return other.commuteTime(self)
-
-
-
-# 添加寝室
-Room.dormitory = Room.fromString(DORMITORY_CODE)
-Room.rooms[DORMITORY_CODE] = Room.dormitory
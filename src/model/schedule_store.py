@@ -0,0 +1,322 @@
+r"""
+class: ScheduleStoreWriter, ScheduleStore
+"""
+
+import os
+import json
+import time
+import struct
+
+from config.user import COMMUTE_TIME_WEIGHT, COURSE_SCORE_WEIGHT
+from src.model.course import Course
+
+
+MAGIC = b"FDSS"
+
+VERSION = 1
+
+# 文件头（小端序，补齐到 64 字节）：magic、版本、每行的课的数量、行数、元数据的位置和长度
+HEADER = struct.Struct("<4sHHQQQ32x")
+
+
+class ScheduleStoreWriter():
+    r"""
+    把没有冲突的候选课表逐行写入课表库文件，见`ScheduleStore`。
+
+    每行的宽度固定：`width`个课程的`sectionId`（`int32`，不足的用`-1`补齐），之后是通勤时间、课程得分、综合得分（`float64`）。
+    写入时不需要 NumPy，也不在内存中保留已经写入的行。`close`时补上文件头和元数据（每个`sectionId`对应的课程序号、权重等）。
+    可以用作上下文管理器。
+
+    ## 属性
+
+    - `path: str`：文件的路径。
+    - `width: int`：每行的课的数量。
+    - `count: int`：已经写入的行数。
+
+    ## 示例
+
+    >>> with ScheduleStoreWriter("result/schedules.bin", 8) as writer:
+    ...     writer.append(candidate, commuteTime, courseScore, score)
+    """
+
+    # 写文件的缓冲区大小（字节）
+    bufferSize = 1 << 20
+
+    def __init__(self, path:str, width:int):
+        r"""
+        ## 参数
+
+        - `path`（`str`）：文件的路径，已存在时会被覆盖。
+        - `width`（`int`）：每行的课的数量，即候选课表的长度的最大值。
+        """
+
+        self.path = path
+        self.width = width
+        self.count = 0
+        self._row = struct.Struct(f"<{width}i3d")
+        self._padding = (-1,) * width
+
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok = True)
+
+        # 先写一个行数为`0`的文件头，`close`时再改正
+        self._file = open(path, "wb", buffering = self.bufferSize)
+        self._file.write(HEADER.pack(MAGIC, VERSION, width, 0, 0, 0))
+
+
+    def __enter__(self) -> "ScheduleStoreWriter":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+
+    def append(self, sectionIds:"Sequence[int]", commuteTime:float, courseScore:float, score:float) -> None:
+        r"""
+        写入一个候选课表及其得分的各个部分。
+
+        ## 异常
+
+        - `ValueError`：如果候选课表的长度超过了`width`。
+        """
+
+        if len(sectionIds) > self.width:
+            raise ValueError(f"the candidate has {len(sectionIds)} sections, but the store is {self.width} wide")
+
+        self._file.write(self._row.pack(*sectionIds, *self._padding[len(sectionIds):], commuteTime, courseScore, score))
+        self.count += 1
+
+
+    def close(self) -> None:
+        r"""
+        写入元数据，改正文件头中的行数，并关闭文件。可以重复调用。
+        """
+
+        if self._file is None:
+            return
+
+        (file, self._file) = (self._file, None)
+        with file:
+            metadata = json.dumps({
+                "sections": [course.courseNo for course in Course.sections],
+                "commuteTimeWeight": COMMUTE_TIME_WEIGHT,
+                "courseScoreWeight": COURSE_SCORE_WEIGHT,
+                "createdAt": time.time(),
+            }, ensure_ascii = False).encode("utf-8")
+            metadataOffset = HEADER.size + self.count * self._row.size
+            file.write(metadata)
+            file.seek(0)
+            file.write(HEADER.pack(MAGIC, VERSION, self.width, self.count, metadataOffset, len(metadata)))
+
+
+class ScheduleStore():
+    r"""
+    用 NumPy 内存映射的课表库文件（由`ScheduleStoreWriter`写入），用来分析全部的可行课表，而不只是排名靠前的几个。
+
+    `rows`直接映射文件中的各行，`rows["sectionIds"]`、`rows["score"]`等列都是它的视图，不会把文件读入内存，
+    过滤、统计、重新排序时只按需读取用到的列。NumPy 在打开时才导入，没有安装时会抛出`ModuleNotFoundError`。
+
+    行中的`sectionId`是写入时那次运行中的编号，只应通过`sections`（课程序号）与其它运行比较。
+
+    ## 属性
+
+    - `path: str`：文件的路径。
+    - `width: int`：每行的课的数量。
+    - `rows: numpy.memmap`：结构化数组，字段为`sectionIds`（`int32`，形状为`(width,)`，不足的为`-1`）、`commuteTime`、`courseScore`、`score`。
+    - `sections: list[str]`：以写入时的`sectionId`为下标的课程序号，如`"MATH120017.06"`。
+    - `commuteTimeWeight: float`、`courseScoreWeight: float`：写入时计算`score`所用的权重。
+    - `createdAt: float`：写入的时间戳。
+
+    ## 示例
+
+    >>> with ScheduleStore("result/schedules.bin") as store:
+    ...     mask = store.containing("MATH120017.06")
+    ...     print(mask.sum(), store.lessonsAt(store.rank(1, mask = mask)[0]))
+    """
+
+    def __init__(self, path:str):
+        r"""
+        ## 参数
+
+        - `path`（`str`）：文件的路径。
+
+        ## 异常
+
+        - `ValueError`：如果文件不是课表库，或者版本不同。
+        - `ModuleNotFoundError`：如果没有安装 NumPy。
+        """
+
+        import numpy as np
+
+        with open(path, "rb") as file:
+            (magic, version, width, count, metadataOffset, metadataLength) = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC or version != VERSION:
+                raise ValueError(f"{path!r} is not a schedule store of version {VERSION}")
+            file.seek(metadataOffset)
+            metadata = json.loads(file.read(metadataLength).decode("utf-8"))
+
+        self.path = path
+        self.width = width
+        self.sections = metadata["sections"]
+        self.commuteTimeWeight = metadata["commuteTimeWeight"]
+        self.courseScoreWeight = metadata["courseScoreWeight"]
+        self.createdAt = metadata["createdAt"]
+        self._sectionIds = {}
+        for (sectionId, courseNo) in enumerate(self.sections):
+            self._sectionIds.setdefault(courseNo, []).append(sectionId)
+
+        dtype = np.dtype([
+            ("sectionIds", "<i4", (width,)),
+            ("commuteTime", "<f8"),
+            ("courseScore", "<f8"),
+            ("score", "<f8"),
+        ])
+        # 没有行时不能映射长度为`0`的区域
+        if count:
+            self.rows = np.memmap(path, dtype = dtype, mode = "r", offset = HEADER.size, shape = (count,))
+        else:
+            self.rows = np.empty(0, dtype = dtype)
+
+
+    def __enter__(self) -> "ScheduleStore":
+        return self
+
+
+    def __exit__(self, *exception) -> None:
+        self.close()
+
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+    def close(self) -> None:
+        r"""
+        释放对内存映射的引用，由`rows`得到的视图也都释放后，文件随之关闭。
+        """
+
+        import numpy as np
+
+        self.rows = np.empty(0, dtype = self.rows.dtype)
+
+
+    def sectionIdsOf(self, courseNo:str) -> list[int]:
+        r"""
+        返回课程序号`courseNo`在这个课表库中的`sectionId`，通常只有一个。
+
+        ## 异常
+
+        - `KeyError`：如果写入时没有这门课。
+        """
+
+        return self._sectionIds[courseNo]
+
+
+    def containing(self, *courseNos:str) -> "numpy.ndarray":
+        r"""
+        返回布尔数组，表示每个课表是否含有`courseNos`中的所有课。
+
+        ## 示例
+
+        >>> store.containing("MATH120017.06", "PHYS120003.02").sum()
+        """
+
+        import numpy as np
+
+        sectionIds = self.rows["sectionIds"]
+        mask = np.ones(len(self.rows), dtype = bool)
+        for courseNo in courseNos:
+            mask &= np.isin(sectionIds, self.sectionIdsOf(courseNo)).any(axis = 1)
+        return mask
+
+
+    def sectionCounts(self, mask:"numpy.ndarray|None" = None) -> dict[str, int]:
+        r"""
+        统计每门课出现在多少个课表中。
+
+        ## 参数
+
+        - `mask`（`numpy.ndarray|None`，可选）：只统计其中为`True`的课表，默认为`None`，即全部。
+
+        ## 返回
+
+        - `dict[str, int]`：以课程序号为键，按出现次数从多到少排列，不含没有出现的课。
+        """
+
+        import numpy as np
+
+        sectionIds = self.rows["sectionIds"] if mask is None else self.rows["sectionIds"][mask]
+        sectionIds = sectionIds[sectionIds >= 0]
+        counts = np.bincount(sectionIds, minlength = len(self.sections))
+
+        # 同一个课程序号可能对应多个`sectionId`，按课程序号合计
+        totals = {}
+        for sectionId in np.flatnonzero(counts):
+            courseNo = self.sections[sectionId]
+            totals[courseNo] = totals.get(courseNo, 0) + int(counts[sectionId])
+        return dict(sorted(totals.items(), key = lambda item: item[1], reverse = True))
+
+
+    def scores(self, commuteTimeWeight:float|None = None, courseScoreWeight:float|None = None) -> "numpy.ndarray":
+        r"""
+        用新的权重重新计算每个课表的综合得分，公式与`TimeTable.scoreOf`相同。
+
+        ## 参数
+
+        - `commuteTimeWeight`（`float|None`，可选）：通勤时间的权重，默认为`None`，即写入时的权重。
+        - `courseScoreWeight`（`float|None`，可选）：课程得分的权重，默认为`None`，即写入时的权重。
+
+        ## 返回
+
+        - `numpy.ndarray`：权重都与写入时相同时，是`rows["score"]`（文件的视图），否则是新算出的数组。
+        """
+
+        commuteTimeWeight = self.commuteTimeWeight if commuteTimeWeight is None else commuteTimeWeight
+        courseScoreWeight = self.courseScoreWeight if courseScoreWeight is None else courseScoreWeight
+        if (commuteTimeWeight, courseScoreWeight) == (self.commuteTimeWeight, self.courseScoreWeight):
+            return self.rows["score"]
+
+        import numpy as np
+
+        # 权重为`0`的项不参与计算，与`gmean`中`0 * log(value)`的结果相同
+        logSum = np.zeros(len(self.rows))
+        if commuteTimeWeight:
+            logSum += commuteTimeWeight * np.log(1 / self.rows["commuteTime"] * 60)
+        if courseScoreWeight:
+            logSum += courseScoreWeight * np.log(self.rows["courseScore"])
+        return np.exp(logSum / (commuteTimeWeight + courseScoreWeight))
+
+
+    def rank(self, k:int, mask:"numpy.ndarray|None" = None, commuteTimeWeight:float|None = None, courseScoreWeight:float|None = None) -> "numpy.ndarray":
+        r"""
+        返回得分最高的`k`个课表的下标，按得分从高到低排列，得分相同时下标小的在前。
+
+        ## 参数
+
+        - `k`（`int`）：返回的数量。
+        - `mask`（`numpy.ndarray|None`，可选）：只在其中为`True`的课表中排序，默认为`None`，即全部。
+        - `commuteTimeWeight`、`courseScoreWeight`：重新排序所用的权重，见`scores`。
+        """
+
+        import numpy as np
+
+        scores = self.scores(commuteTimeWeight, courseScoreWeight)
+        indexes = np.arange(len(self.rows)) if mask is None else np.flatnonzero(mask)
+        if k <= 0 or not len(indexes):
+            return indexes[:0]
+
+        # 先用`argpartition`找出前`k`个，只对它们排序
+        candidateScores = scores[indexes]
+        if k < len(indexes):
+            top = np.argpartition(-candidateScores, k - 1)[:k]
+            (indexes, candidateScores) = (indexes[top], candidateScores[top])
+        return indexes[np.lexsort((indexes, -candidateScores))]
+
+
+    def lessonsAt(self, index:int) -> tuple[str]:
+        r"""
+        返回第`index`个课表中的课的课程序号。
+        """
+
+        return tuple(self.sections[sectionId] for sectionId in self.rows["sectionIds"][index] if sectionId >= 0)
@@ -0,0 +1,140 @@
+r"""
+class: SpatialIndex
+"""
+
+import math
+from heapq import heappush, heappushpop
+
+from src.util.geography import EARTH_RADIUS, manhattan_distance
+
+
+class SpatialIndex():
+    r"""
+    一些地点的空间索引（k-d 树），用来查询离任意一点最近的若干个地点。
+
+    距离是`src.util.geography.manhattan_distance`给出的曼哈顿距离，查询结果是精确的：
+    在 k-d 树中剪枝时，只用这个距离的下界，不会漏掉更近的地点；距离相等时，代码小的排在前面，
+    所以结果与地点的加入顺序无关。
+
+    ## 属性
+
+    - `codes: tuple[str]`：地点的代码，按代码排好序。
+    - `locations: tuple[(float, float)]`：与`codes`一一对应的`(经度, 纬度)`。
+
+    ## 注意
+
+    - 假设所有地点和查询点都不跨越经度 ±180°（复旦大学的校区都在上海）。
+    """
+
+    def __init__(self, locations:dict[str, tuple[float, float]]):
+        r"""
+        ## 参数
+
+        - `locations`（`dict[str, (float, float)]`）：以地点的代码为键，以`(经度, 纬度)`为值的字典，如`BUILDING_LOCATIONS`。
+        """
+
+        self.codes = tuple(sorted(locations))
+        self.locations = tuple(locations[code] for code in self.codes)
+
+        # 经度方向上的距离要乘以纬度的余弦，取所有地点中最大的纬度，用于计算距离的下界
+        self._maxAbsLatitude = max((abs(latitude) for (_, latitude) in self.locations), default = 0)
+
+        # k-d 树的节点：`(地点的下标, 划分的坐标轴, 左子树, 右子树)`，坐标轴`0`为经度，`1`为纬度
+        self._root = self._build(list(range(len(self.codes))), 0)
+
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+
+    def _build(self, indexes:list[int], axis:int) -> tuple|None:
+        r"""
+        以`indexes`中的地点建立 k-d 树，返回根节点。
+        """
+
+        if not indexes:
+            return None
+
+        # 以中位数划分，坐标相同时按下标（即代码的顺序）排
+        indexes.sort(key = lambda index: (self.locations[index][axis], index))
+        middle = len(indexes) // 2
+        return (
+            indexes[middle],
+            axis,
+            self._build(indexes[:middle], 1 - axis),
+            self._build(indexes[middle + 1:], 1 - axis),
+        )
+
+
+    def nearest(self, location:tuple[float, float], k:int = 1) -> list[tuple[float, str]]:
+        r"""
+        查询离`location`最近的`k`个地点。
+
+        ## 参数
+
+        - `location`（`(float, float)`）：查询点的`(经度, 纬度)`。
+        - `k`（`int`，可选）：要查询的地点的数量，默认为`1`。
+
+        ## 返回
+
+        - `list[(float, str)]`：`(距离, 代码)`组成的列表，按距离从近到远排列，距离相等时按代码排列。地点不足`k`个时，返回所有地点。
+        """
+
+        if k <= 0:
+            return []
+
+        # 经度相差一度时，距离的下界（米）
+        cosine = math.cos(math.radians(max(self._maxAbsLatitude, abs(location[1]))))
+        meterPerDegree = (EARTH_RADIUS * math.radians(1) * cosine, EARTH_RADIUS * math.radians(1))
+
+        # 以`(-距离, -下标)`为元素的大根堆，堆顶是目前找到的第`k`近的地点
+        heap = []
+
+        def search(node):
+            if node is None:
+                return
+            (index, axis, left, right) = node
+
+            item = (-manhattan_distance(location, self.locations[index]), -index)
+            if len(heap) < k:
+                heappush(heap, item)
+            elif item > heap[0]:
+                heappushpop(heap, item)
+
+            # 先搜索查询点所在的一侧
+            difference = location[axis] - self.locations[index][axis]
+            (near, far) = (left, right) if difference < 0 else (right, left)
+            search(near)
+
+            # 另一侧的地点的距离不小于`bound`，比第`k`近的还远时就不用搜索了
+            bound = abs(difference) * meterPerDegree[axis]
+            if len(heap) < k or bound <= -heap[0][0]:
+                search(far)
+
+        search(self._root)
+
+        return [
+            (-negativeDistance, self.codes[-negativeIndex])
+            for (negativeDistance, negativeIndex) in sorted(heap, reverse = True)
+        ]
+
+
+    def nearestCode(self, location:tuple[float, float]) -> str:
+        r"""
+        返回离`location`最近的地点的代码。
+
+        ## 异常
+
+        - `IndexError`：如果索引中没有任何地点。
+        """
+
+        return self.nearest(location)[0][1]
+
+
+
+if __name__ == "__main__":
+    from config.constants import BUILDING_LOCATIONS, CANTEEN_CODES
+
+    canteens = SpatialIndex({code: BUILDING_LOCATIONS[code] for code in CANTEEN_CODES})
+    print(canteens.nearest(BUILDING_LOCATIONS["HGX"], k = 3))
+    print(canteens.nearestCode(BUILDING_LOCATIONS["JA"]))
@@ -3,10 +3,9 @@ class: TimeTable
 """
 
 import csv
-from math import prod
-from functools import cache
-
-from scipy.stats import gmean
+from math import prod, exp, log
+from itertools import chain
+from operator import itemgetter
 
 from config.constants import COURSES_COUNT, MAX_CLASSES_PER_DAY
 from config.constants import COURSE_TIME, TABLE_HEADING
@@ -15,6 +14,34 @@ from src.model.course_group import CourseGroup
 from src.model.arrangement import Arrangement
 from src.model.course import Course
 from src.model.room import Room
+from src.util import location
+
+
+# 上午、下午的最后一节课，这节课之后去食堂吃饭
+MEAL_SLOTS = (
+    COURSES_COUNT["morning"],
+    COURSES_COUNT["morning"] + COURSES_COUNT["afternoon"],
+)
+
+
+def gmean(values:"Sequence[float]", weights:"Sequence[float]") -> float:
+    r"""
+    加权几何平均数，即`scipy.stats.gmean(values, weights = weights)`。
+
+    直接用`math.exp`和`math.log`计算，比调用`scipy`快得多。
+
+    权重为`0`的项不参与计算；有权重不为`0`的值为`0`时（如选课人数远超上限时`Course.norm`下溢为`0.0`），
+    与`scipy`一样返回`0.0`，而不是让`math.log`抛出异常。
+    """
+
+    logSum = 0.0
+    for (value, weight) in zip(values, weights):
+        if not weight:
+            continue
+        if value == 0:
+            return 0.0
+        logSum += weight * log(value)
+    return exp(logSum / sum(weights))
 
 
 class TimeTable(CourseGroup):
@@ -29,6 +56,10 @@ class TimeTable(CourseGroup):
     - `probability: float`：当前选上该课表的可能性。
     """
 
+    # `_commuteTime`和`_courseScore`记住`getCommuteTime`和`getCourseScore`的结果，随课表一起被回收；
+    # `_courseScoreVersion`是计算`_courseScore`时的`Course.countsVersion`
+    __slots__ = ("_commuteTime", "_courseScore", "_courseScoreVersion")
+
     def __init__(self, courses:list[Course]|None = None):
         """
         初始化一个新的课程表实例。
@@ -41,6 +72,37 @@ class TimeTable(CourseGroup):
         """
 
         CourseGroup.__init__(self, courses)
+        self._commuteTime = None
+        self._courseScore = None
+        self._courseScoreVersion = None
+
+
+    @classmethod
+    def fromSectionIds(cls, sectionIds:"Sequence[int]") -> "TimeTable":
+        r"""
+        根据候选课表（课程的`sectionId`组成的元组）创建课表。
+
+        ## 参数
+
+        - `sectionIds`（`Sequence[int]`）：课表中的课程的`sectionId`，见`Course.sections`。
+
+        ## 返回
+
+        - `TimeTable`：由这些课程组成的课表。
+        """
+
+        sections = Course.sections
+        return cls([sections[sectionId] for sectionId in sectionIds])
+
+
+    def append(self, course: Course) -> bool:
+        r"""
+        与`CourseGroup.append`相同，同时让记住的通勤时间和课程得分失效。
+        """
+
+        self._commuteTime = None
+        self._courseScore = None
+        return CourseGroup.append(self, course)
 
 
     @property
@@ -54,7 +116,16 @@ class TimeTable(CourseGroup):
 
     def toArrangementTable(self) -> list[list[Arrangement|None]]:
         r"""
-        将`TimeTable`对象转换为安排表。
+        将`TimeTable`对象转换为安排表，详见`arrangementTableOf`。
+        """
+
+        return self.arrangementTableOf(self.courses)
+
+
+    @staticmethod
+    def arrangementTableOf(courses:"Iterable[Course]") -> list[list[Arrangement|None]]:
+        r"""
+        将一些课程转换为安排表，不需要创建`TimeTable`对象。
 
         返回一个二维表格，代表一周的课程安排。每个有效元素是课程的具体安排（`Arrangement`对象），无效元素为`None`用于占位。
         
@@ -76,12 +147,10 @@ class TimeTable(CourseGroup):
             [None] * MAX_CLASSES_PER_DAY for _ in range(7)
         ]
 
-        # 遍历每一个安排
-        for course in self.courses:
-            for arrangement in course.arrangements:
-                # 将这个安排填入表格的相应位置
-                for unit in range(arrangement.startUnit - 1, arrangement.endUnit):
-                    arrangementTable[arrangement.weekDay][unit] = arrangement
+        # 将每门课的每一个格子填入表格的相应位置
+        for course in courses:
+            for (weekDay, slot, arrangement) in course.cells:
+                arrangementTable[weekDay][slot - 1] = arrangement
 
         # 返回表格
         return arrangementTable
@@ -114,28 +183,21 @@ class TimeTable(CourseGroup):
 
         # 遍历每一个安排
         for course in self.courses:
-            for arrangement in course.arrangements:
+            for (weekDay, slot, arrangement) in course.cells:
                 # 将这个安排的`"[课程序号]课程名[教室代码]"`形式的字符串填入表格的相应位置
-                for unit in range(arrangement.startUnit - 1, arrangement.endUnit):
-                    stringTable[arrangement.weekDay][unit] = arrangement.getCourseString()
+                stringTable[weekDay][slot - 1] = arrangement.getCourseString()
 
         # 返回表格
         return stringTable
 
 
-    def toCsv(self, path, mode:str = 'a', newline:str = '') -> None:
-        """
-        将课程表导出为 CSV 文件。
+    def toCsvRows(self) -> list[list[str]]:
+        r"""
+        返回课程表导出为 CSV 时的各行。
 
         表格格式：
         - 转置后的表格，其中每一列对应一周中的某一天（周一至周日）。
-        - 第一行为表头信息（来自`TABLE_HEADING`），接下来的每一行对应一天中的某一节课时段，包含时间段（来自`COURSE_TIME`）和该时段对应的课程信息（如果有）。
-
-        ## 参数
-
-        - `path`（`str）：CSV文件的保存路径。
-        - `mode`（`str`，可选）：文件打开模式（默认为追加模式`'a'`）。
-        - `newline`（`str`，可选）：指定在换行时应使用的换行符（默认为空字符串`''`，适用于不同操作系统间的兼容性）。
+        - 第一行为得分信息，第二行为表头信息（来自`TABLE_HEADING`），接下来的每一行对应一天中的某一节课时段，包含时间段（来自`COURSE_TIME`）和该时段对应的课程信息（如果有），最后是一个空行。
 
         ## 注意
 
@@ -163,16 +225,77 @@ class TimeTable(CourseGroup):
         # 表格最后下面加个空行
         content.append([])
 
+        return content
+
+
+    def toCsv(self, path, mode:str = 'a', newline:str = '', encoding:str = "gbk") -> None:
+        """
+        将课程表导出为 CSV 文件，内容见`toCsvRows`。
+
+        需要导出多个课程表时，用`src.model.result_writer.ResultWriter`，它只打开一次文件。
+
+        ## 参数
+
+        - `path`（`str）：CSV文件的保存路径。
+        - `mode`（`str`，可选）：文件打开模式（默认为追加模式`'a'`）。
+        - `newline`（`str`，可选）：指定在换行时应使用的换行符（默认为空字符串`''`，适用于不同操作系统间的兼容性）。
+        - `encoding`（`str`，可选）：文件的编码，默认为`"gbk"`。
+        """
+
         # 写入到指定路径的CSV文件中
-        with open(path, mode = mode, newline = newline, encoding = "gbk") as file:
+        with open(path, mode = mode, newline = newline, encoding = encoding) as file:
             writer = csv.writer(file)
-            writer.writerows(content)
+            writer.writerows(self.toCsvRows())
+
+
+    def toJSON(self) -> dict:
+        r"""
+        返回课程表的 JSON 对象（字典），用于导出为 JSON Lines 供其它程序分析。
+
+        ## 返回
+
+        - `dict`：包含得分（`commuteTime`、`courseScore`、`score`、`probability`）和课程（`courses`）。
+          每门课包含`id`、`courseNo`、`courseName`、`teachers`、`credits`、`selectCount`、`limitCount`，
+          以及它占用的格子`cells`（`[星期, 节次, 教室]`，星期一为`0`，第一节为`1`）。
+        """
+
+        return {
+            "commuteTime": self.getCommuteTime(),
+            "courseScore": self.getCourseScore(),
+            "score": self.getScore(),
+            "probability": self.probability,
+            "courses": [
+                {
+                    "id": course.id,
+                    "courseNo": course.courseNo,
+                    "courseName": course.courseName,
+                    "teachers": course.teachers,
+                    "credits": course.credits,
+                    "selectCount": course.selectCount,
+                    "limitCount": course.limitCount,
+                    "cells": [[weekDay, slot, arrangement.roomsString] for (weekDay, slot, arrangement) in course.cells],
+                }
+                for course in self.courses
+            ],
+        }
 
 
-    @cache
     def getCommuteTime(self) -> float:
         r"""
-        返回该课程表预期的一周通勤时间（`float`，以分钟为单位）。
+        返回该课程表预期的一周通勤时间（`float`，以分钟为单位），详见`commuteTimeOf`。
+
+        结果记在`_commuteTime`中。
+        """
+
+        if self._commuteTime is None:
+            self._commuteTime = self.commuteTimeOf(self.courses)
+        return self._commuteTime
+
+
+    @staticmethod
+    def commuteTimeOf(courses:"Iterable[Course]") -> float:
+        r"""
+        返回由`courses`组成的课程表预期的一周通勤时间（`float`，以分钟为单位），不需要创建`TimeTable`对象。
 
         遍历一周中每一天的课程安排，计算从寝室出发到各上课地点、食堂以及最终返回寝室的总通勤时间。
 
@@ -180,67 +303,106 @@ class TimeTable(CourseGroup):
         - 从寝室开始，前往最近的食堂吃早餐。
         - 遍历当天的每节课安排，如果是实体课则计算到教室的通勤时间，并在上午或下午课程结束后去最近的食堂用餐。
         - 一天的课程全部结束后，计算从最后一处地点返回寝室的通勤时间。
+
+        不创建安排表，而是把每门课预先排好序的格子（`Course.cells`）合并起来，按顺序扫过。
+        结果与在`arrangementTableOf`返回的安排表上逐格扫过相同：同一个格子有多个安排时，以最后一门课的为准。
+
+        两地之间的通勤时间从`src.util.location`的通勤时间矩阵中查出，与调用`commuteTime`的结果相同：
+        - 有一方是在线教学的安排时，为`2`分钟；
+        - 从教室或楼到安排时，`Room`、`Building`把计算交给了安排，所以查的是从安排的教室到这个地点的时间。
         """
 
+        # 先取得寝室（第一次取得时会登记到地点索引中），再取矩阵
+        dormitoryRoom = Room.getDormitory()
+        dormitory = dormitoryRoom.locationId
+        dormitoryCanteen = dormitoryRoom.nearestCanteen.locationId
+
+        (matrix, size) = location.get_matrix()
+
+        # 合并所有课的格子，按（星期，节次）排序；排序是稳定的，同一个格子里后面的课排在后面
+        cells = sorted(chain.from_iterable(course.cells for course in courses), key = itemgetter(0, 1))
+        cellsCount = len(cells)
+        index = 0
+
         # 记录总通勤时间
         commuteTime = 0
 
         # 遍历每一天的安排
-        for weekdayArrangements in self.toArrangementTable():
-            # 从寝室出发
-            last = Room.dormitory
+        for weekDay in range(7):
+            # 从寝室出发，先找好最近的食堂，去食堂吃早饭
+            nearestCanteen = dormitoryCanteen
+            commuteTime += matrix[dormitory * size + nearestCanteen]
 
-            # 先找好最近的食堂
-            nearestCanteen = last.nearestCanteen
-
-            # 去食堂吃早饭
-            commuteTime += last.commuteTime(nearestCanteen)
+            # `last`是上一个地点的编号，`lastIsArrangement`表示上一个地点是不是安排（在线教学的安排编号为`-1`）
             last = nearestCanteen
+            lastIsArrangement = False
 
-            # 遍历当天的每一个安排
-            for (slot, arrangement) in enumerate(weekdayArrangements, start = 1):
-                # 这里第一节课对应的`slot`等于`1`
+            # 上午、下午的课结束后去吃午/晚饭，晚上的课结束后不吃饭
+            for mealSlot in (*MEAL_SLOTS, MAX_CLASSES_PER_DAY):
+                # 遍历这顿饭之前的每一个格子
+                while index < cellsCount and cells[index][0] == weekDay and cells[index][1] <= mealSlot:
+                    (_, slot, arrangement) = cells[index]
+                    index += 1
 
-                # 如果这节课有安排（要上课）
-                if arrangement: # 如果`arrangement`不是`None`
+                    # 同一个格子里还有后面的课的安排，以后面的为准
+                    if index < cellsCount and cells[index][0] == weekDay and cells[index][1] == slot:
+                        continue
 
                     # 计算从`last`（上一个地方）到`arrangement`的通勤时间
-                    commuteTime += last.commuteTime(arrangement)
+                    target = arrangement.locationId
+                    if target < 0 or last < 0:
+                        commuteTime += 2
+                    elif lastIsArrangement:
+                        commuteTime += matrix[last * size + target]
+                    else:
+                        commuteTime += matrix[target * size + last]
 
                     # 找到最近的食堂
-                    if not arrangement.isOnline:
-                        nearestCanteen = arrangement.nearestCanteen
-
-                    last = arrangement
+                    if target >= 0:
+                        nearestCanteen = arrangement.nearestCanteen.locationId
 
-                # 如果这节课是上午或下午的最后一节课
-                if slot in (
-                    COURSES_COUNT["morning"],
-                    COURSES_COUNT["morning"] + COURSES_COUNT["afternoon"]
-                ):
+                    last = target
+                    lastIsArrangement = True
 
-                    # 去食堂吃午/晚饭
-                    commuteTime += last.commuteTime(nearestCanteen)
+                # 去食堂吃午/晚饭
+                if mealSlot != MAX_CLASSES_PER_DAY:
+                    commuteTime += 2 if last < 0 else matrix[last * size + nearestCanteen]
                     last = nearestCanteen
+                    lastIsArrangement = False
 
             # 一天的课结束了，该回寝室了
-            commuteTime += last.commuteTime(Room.dormitory)
+            commuteTime += 2 if last < 0 else matrix[last * size + dormitory]
 
         # 返回一周的总通勤时间（分钟）
         return commuteTime
 
 
-    @cache
     def getCourseScore(self) -> float:
         r"""
-        计算这个课程表的课程的得分。
+        计算这个课程表的课程的得分，详见`courseScoreOf`。
+
+        结果记在`_courseScore`中，直到有课程的选课人数发生变化（`Course.countsVersion`改变）。
+        """
+
+        if self._courseScoreVersion == Course.countsVersion and self._courseScore is not None:
+            return self._courseScore
+
+        self._courseScore = self.courseScoreOf(self.courses)
+        self._courseScoreVersion = Course.countsVersion
+        return self._courseScore
+
+
+    @staticmethod
+    def courseScoreOf(courses:"Sequence[Course]") -> float:
+        r"""
+        计算由`courses`组成的课程表的课程的得分，不需要创建`TimeTable`对象。
 
-        将这个课程表内所有课程的得分按照学分进行加权，计算几何平均。
+        将所有课程的得分按照学分进行加权，计算几何平均。
         """
 
         return gmean(
-            [course.score for course in self.courses],
-            weights = [course.credits for course in self.courses]
+            [course.score for course in courses],
+            weights = [course.credits for course in courses]
         )
 
 
@@ -262,7 +424,31 @@ class TimeTable(CourseGroup):
         $$
         """
 
+        return self.scoreOf(
+            self.getCommuteTime(), self.getCourseScore(),
+            commuteTimeWeight = commuteTimeWeight, courseScoreWeight = courseScoreWeight
+        )
+
+
+    @staticmethod
+    def scoreOf(commuteTime:float, courseScore:float, *, commuteTimeWeight:float = COMMUTE_TIME_WEIGHT, courseScoreWeight:float = COURSE_SCORE_WEIGHT) -> float:
+        r"""
+        由通勤时间（分钟）和课程得分计算综合得分，计算公式见`getScore`。
+        """
+
         return gmean(
-            (1 / self.getCommuteTime() * 60, self.getCourseScore()),
+            (1 / commuteTime * 60, courseScore),
             weights = (commuteTimeWeight, courseScoreWeight)
         )
+
+
+    @staticmethod
+    def scoreSectionIds(sectionIds:"Sequence[int]") -> float:
+        r"""
+        返回候选课表（课程的`sectionId`组成的元组）的综合得分，与`TimeTable.fromSectionIds(sectionIds).getScore()`相同，
+        但不创建`TimeTable`对象，也不记住结果。
+        """
+
+        sections = Course.sections
+        courses = [sections[sectionId] for sectionId in sectionIds]
+        return TimeTable.scoreOf(TimeTable.commuteTimeOf(courses), TimeTable.courseScoreOf(courses))
@@ -0,0 +1,56 @@
+r"""
+此模块提供了课程目录的快照的读写，见`src.model.catalogue_snapshot`。
+
+function: config_digest 当前配置的摘要。
+function: load_catalogue 读入有效期内的快照。
+function: save_catalogue 写入快照。
+"""
+
+import hashlib
+import json
+
+from config.constants import BASE_URL, CATALOGUE_SNAPSHOT_PATH
+from config.user import USERNAME, CATALOGUE_MAX_AGE
+from src.model.catalogue_snapshot import CatalogueSnapshot
+from src.util.config_snapshot import get_config_snapshot
+from src.util.log import log
+
+
+def config_digest() -> bytes:
+    r"""
+    返回决定查询结果的配置的 SHA-256 摘要：选课系统的地址、学号（已选的课因人而异）和要查询的课程代码。
+
+    `FULL_OK`、`TAGS_COUNT`等只影响之后的`classify`和排课，不在其中，修改它们不会使快照失效。
+    """
+
+    document = {
+        "baseURL": BASE_URL,
+        "username": USERNAME,
+        "courseCodes": sorted(get_config_snapshot().courseCodes),
+    }
+    return hashlib.sha256(json.dumps(document, ensure_ascii = False, sort_keys = True).encode("utf-8")).digest()
+
+
+def load_catalogue(path:str = CATALOGUE_SNAPSHOT_PATH, max_age:float = CATALOGUE_MAX_AGE) -> CatalogueSnapshot|None:
+    r"""
+    读入`max_age`秒内生成的、与当前配置相符的快照；`max_age`不大于`0`时不使用快照，返回`None`。
+    """
+
+    if max_age <= 0:
+        return None
+    return CatalogueSnapshot.load(path, config_digest(), max_age)
+
+
+def save_catalogue(phase:str, query_results:dict[str, dict], path:str = CATALOGUE_SNAPSHOT_PATH, max_age:float = CATALOGUE_MAX_AGE) -> None:
+    r"""
+    把查询结果写入快照；`max_age`不大于`0`时不写入。
+
+    快照只是缓存，写不了（如`tmp`只读、磁盘已满）时只记录警告，不影响之后的排课。
+    """
+
+    if max_age <= 0:
+        return
+    try:
+        CatalogueSnapshot(phase, query_results).dump(path, config_digest())
+    except OSError as error:
+        log(f"写入课程目录的快照失败：{type(error).__name__}: {str(error)}", "WARNING")
@@ -0,0 +1,33 @@
+r"""
+此模块提供了配置的快照，见`src.model.config_snapshot`。
+
+function: get_config_snapshot 读入或编译配置的快照。
+"""
+
+from functools import cache
+
+from config.constants import CONFIG_SNAPSHOT_PATH
+from src.model.config_snapshot import ConfigSnapshot
+
+
+@cache
+def get_config_snapshot(path:str = CONFIG_SNAPSHOT_PATH) -> ConfigSnapshot:
+    r"""
+    返回配置的快照。
+
+    快照文件`path`有效时直接读入；否则重新编译，并写入`path`。同一次运行中总是返回同一个实例。
+
+    ## 异常
+
+    - `ValueError`：如果配置有误，见`ConfigSnapshot.compile`。
+    """
+
+    snapshot = ConfigSnapshot.load(path)
+    if snapshot is None:
+        snapshot = ConfigSnapshot.compile()
+        try:
+            snapshot.dump(path)
+        except OSError:
+            # 写不了快照时，下次运行再编译一次即可
+            pass
+    return snapshot
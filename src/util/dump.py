@@ -0,0 +1,13 @@
+r"""
+此模块提供了所有请求共用的响应文本诊断输出，模式见`config.user.DUMP_MODE`。
+"""
+
+from config.constants import DUMP_PATH, DUMP_RING_SIZE
+from config.user import DUMP_MODE
+from src.model.response_dumper import ResponseDumper
+
+
+dumper = ResponseDumper(DUMP_MODE, DUMP_PATH, DUMP_RING_SIZE)
+
+record = dumper.record
+dump_on_error = dumper.dumpOnError
@@ -10,12 +10,27 @@ def write_to_file(path, content:str, mode:str = "w", encoding:str = "utf-8") ->
     将`content`内容写入`path`文件中。
     """
 
-    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # 文件就在当前目录下时，没有需要创建的目录
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
 
     with open(path, mode = mode, encoding = encoding) as file:
         file.write(content)
 
 
+def open_with_default_app(path) -> bool:
+    r"""
+    用系统默认的程序打开文件`path`，返回是否打开了。
+
+    只有 Windows 有`os.startfile`，其它系统上什么也不做，返回`False`。
+    """
+
+    if not hasattr(os, "startfile"):
+        return False
+    os.startfile(path)
+    return True
+
+
 def get_size(path):
     r"""
     返回文件`path`的大小，单位为 Bytes 。
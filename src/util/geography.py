@@ -3,6 +3,7 @@ r"""
 """
 
 import math
+from functools import cache
 
 # 平均地球半径，取 6371 千米
 EARTH_RADIUS = 6371e3
@@ -53,6 +54,43 @@ def degrees_to_meters(lat1, lon1, lat2, lon2):
     return (delta_lat_meter, delta_lon_meter)
 
 
+def manhattan_distance(location1:tuple[float, float], location2:tuple[float, float]) -> float:
+    r"""
+    计算两个地点之间的曼哈顿距离（米），即`degrees_to_meters`返回的两个距离之和。
+
+    ## 参数
+
+    - `location1`（`(float, float)`）：第一个地点的`(经度, 纬度)`，与`BUILDING_LOCATIONS`中的顺序相同。
+    - `location2`（`(float, float)`）：第二个地点的`(经度, 纬度)`。
+
+    ## 返回
+
+    - `float`：两个地点之间的曼哈顿距离，单位为米。
+
+    ## 注意
+
+    - `degrees_to_meters`的参数是先纬度、后经度，与`(经度, 纬度)`的顺序相反，这里负责调换。
+    """
+
+    (lon1, lat1) = location1
+    (lon2, lat2) = location2
+    return sum(degrees_to_meters(lat1, lon1, lat2, lon2))
+
+
+@cache
+def get_geography() -> "Geography":
+    r"""
+    返回复旦大学的校区和楼的注册表`src.model.geography.Geography`。
+
+    第一次调用时才创建所有的校区和楼，之后总是返回同一个实例。导入各个模型模块时不会创建它们。
+    """
+
+    # 在函数中导入，避免循环导入
+    from src.model.geography import Geography
+
+    return Geography()
+
+
 if __name__ == '__main__':
     # 示例调用
     lat1, lon1 = 40.7128, -74.0060  # 纽约市
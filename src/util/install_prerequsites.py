@@ -1,45 +1,139 @@
 r"""
 自动安装所依赖的拓展库。
+
+检查时只查找模块的位置（`importlib.util.find_spec`），不会导入、执行这些拓展库。检查通过后，把结果连同解释器的路径和版本
+写入`PREREQUISITES_CACHE_PATH`；之后用同一个解释器启动时，只需确认记录下来的模块文件还在即可。
 """
 
-from importlib import import_module
-from os import system
+import json
+import os
+import subprocess
+import sys
+from importlib import invalidate_caches
+from importlib.util import find_spec
+
+from config.constants import REQUIRED_MODULES, PREREQUISITES_CACHE_PATH
+from src.util.file import write_to_file
+
+
+def _interpreter() -> dict[str, str]:
+    r"""
+    返回当前解释器的路径和版本，缓存只对同一个解释器有效。
+    """
+
+    return {"executable": sys.executable, "version": sys.version}
+
+
+def find_modules(modules:dict[str, str] = REQUIRED_MODULES) -> dict[str, str|None]:
+    r"""
+    查找`modules`中的模块，不导入它们。
+
+    ## 参数
+
+    - `modules`（`dict[str, str]`）：键是模块导入时使用的名称，值是用 pip 安装该模块时所用的名称。
+
+    ## 返回
+
+    - `dict[str, str|None]`：以模块导入时使用的名称为键，值是模块的文件（包是`__init__.py`）；没有安装的模块的值为`None`。
+    """
+
+    origins = {}
+    for imported_name in modules:
+        try:
+            spec = find_spec(imported_name)
+        except (ImportError, ValueError):
+            spec = None
+        origins[imported_name] = None if spec is None else (spec.origin or "")
+    return origins
+
 
-from config.constants import REQUIRED_MODULES
+def _load_cache(modules:dict[str, str], path:str) -> bool:
+    r"""
+    返回缓存是否表明`modules`都已经安装在当前解释器中。
+    """
+
+    try:
+        with open(path, encoding = "utf-8") as file:
+            cache = json.load(file)
+    except (OSError, ValueError):
+        return False
+
+    if not isinstance(cache, dict) or cache.get("interpreter") != _interpreter():
+        return False
+
+    # 缓存中要有每一个模块，并且它们的文件都还在
+    origins = cache.get("modules", {})
+    return all(
+        isinstance(origins.get(imported_name), str)
+        and (not origins[imported_name] or os.path.exists(origins[imported_name]))
+        for imported_name in modules
+    )
 
 
-def install_prerequsites(modules:dict[str, str] = REQUIRED_MODULES):
+def install_prerequsites(modules:dict[str, str] = REQUIRED_MODULES, cache_path:str|None = PREREQUISITES_CACHE_PATH):
     r"""
     检查并安装指定的Python模块作为运行某些程序的先决条件。
 
     ## 参数
 
     - `modules`（`dict[str, str]`）：一个字典，包含需要检查或安装的模块信息。键是模块导入时使用的名称值是用于通过 pip 安装该模块时所用的名称。默认值是从 'config.constants' 模块中导入的 `REQUIRED_MODULES` 常量。
+    - `cache_path`（`str|None`）：检查结果的缓存文件，默认为`PREREQUISITES_CACHE_PATH`；为`None`时不使用缓存。
 
     ## 操作
 
-    1. 遍历传入的 modules 字典。
-    2. 尝试使用 Python 的 import_module 函数来导入（检查）每个模块。
-    3. 如果模块未找到（引发 ModuleNotFoundError），则调用系统命令通过 pip 自动安装该模块。
-        
+    1. 如果缓存表明当前解释器已经安装了所有的模块，直接返回。
+    2. 用`importlib.util.find_spec`查找每个模块，不导入它们。
+    3. 对没有找到的模块，用当前解释器的 pip（`python -m pip`）安装。
+    4. 所有模块都找到后，写入缓存。
+
     ## 输出
 
     对于每个需要安装的模块，函数将打印一条消息告知用户正在安装该模块，请稍候。
-        
+
+    ## 异常
+
+    - `subprocess.CalledProcessError`：如果 pip 安装失败。
+    - `ModuleNotFoundError`：如果安装后仍然找不到模块。
+
     ## 注意
 
-    该函数使用`os.system`调用来执行`pip`安装命令，这意味着它依赖于系统的`pip`工具链和网络环境。在某些环境中，可能需要管理员权限才能成功安装软件包。
-        
+    该函数调用 pip 安装，这意味着它依赖于 pip 和网络环境。在某些环境中，可能需要管理员权限才能成功安装软件包。
+
     ## 示例
 
     >>> install_prerequsites({'numpy': 'numpy', 'pandas': 'pandas>=1.0.0'})
     如果 numpy 已经安装，则不会有任何输出；如果 pandas 未安装，则会尝试通过 pip 安装之。
     """
 
-    for (imported_name, installed_name) in modules.items():
-        try:
-            import_module(imported_name)
-        except ModuleNotFoundError:
-            print(f"Installing {imported_name}, please wait...\n")
-            print("------------------------------------\n")
-            system(f"pip3 install {installed_name}")
+    # 缓存命中时，不需要查找任何模块
+    if cache_path is not None and _load_cache(modules, cache_path):
+        return
+
+    origins = find_modules(modules)
+    missing = [imported_name for (imported_name, origin) in origins.items() if origin is None]
+
+    for imported_name in missing:
+        print(f"Installing {imported_name}, please wait...\n")
+        print("------------------------------------\n")
+        subprocess.run([sys.executable, "-m", "pip", "install", modules[imported_name]], check = True)
+
+    # 安装后重新查找
+    if missing:
+        invalidate_caches()
+        origins = find_modules(modules)
+        missing = [imported_name for (imported_name, origin) in origins.items() if origin is None]
+        if missing:
+            raise ModuleNotFoundError(f"modules not found after installing: {', '.join(missing)}")
+
+    if cache_path is not None:
+        write_to_file(cache_path, json.dumps({"interpreter": _interpreter(), "modules": origins}, ensure_ascii = False))
+
+
+
+if __name__ == "__main__":
+    from time import perf_counter
+
+    start = perf_counter()
+    install_prerequsites()
+    print(f"install_prerequsites: {(perf_counter() - start) * 1000:.2f} ms")
+    print(find_modules())
@@ -0,0 +1,12 @@
+r"""
+此模块提供了所有地点（`Room`、`Building`）共用的地点索引，见`src.model.location_index`。
+"""
+
+from src.model.location_index import LocationIndex
+
+
+location_index = LocationIndex()
+
+register = location_index.register
+get_matrix = location_index.getMatrix
+commute_time = location_index.commuteTime
@@ -2,10 +2,24 @@ r"""
 该模块提供了对日志的操作。
 """
 
-import os
 import time
 
-from config.constants import LOG_PATH, STR_TIME_FORMAT
+from config.constants import LOG_PATH, LOG_JSON_PATH, LOG_MAX_BYTES, LOG_BACKUP_COUNT, STR_TIME_FORMAT
+from config.user import LOG_LEVEL, LOG_FILE_LEVEL, LOG_JSON
+from src.model.logger import Logger
+
+
+logger = Logger(
+    LOG_PATH,
+    LOG_JSON_PATH if LOG_JSON else None,
+    consoleLevel = LOG_LEVEL,
+    fileLevel = LOG_FILE_LEVEL,
+    maxBytes = LOG_MAX_BYTES,
+    backupCount = LOG_BACKUP_COUNT,
+    timeFormat = STR_TIME_FORMAT,
+)
+
+flush = logger.flush
 
 
 def get_str_time() -> str:
@@ -32,52 +46,42 @@ def get_str_time() -> str:
     return time.strftime(STR_TIME_FORMAT, now)
 
 
-def log(message:str) -> None:
+def log(message:str, level:str = "INFO") -> None:
     r"""
-    记录消息到指定的日志文件中，并在消息前添加当前时间戳。
+    记录消息到指定的日志文件中，并在消息前添加当前时间戳和级别。
 
-    此函数将传入的消息追加到由`LOG_PATH`指定的日志文件中，并在每条消息前添加一个时间。
-    时间通过`get_str_time()`函数获取。
+    消息交给`logger`（`src.model.logger.Logger`）：达到`config.user.LOG_LEVEL`的立即输出到标准输出，
+    达到`config.user.LOG_FILE_LEVEL`的由后台线程批量追加到`LOG_PATH`（以及`LOG_JSON_PATH`）中，调用者不等待磁盘。
 
     ## 参数
 
     - `message`（`str`）：要记录的消息内容。
+    - `level`（`str`，可选）：级别，为`"DEBUG"`、`"INFO"`、`"WARNING"`、`"ERROR"`之一，默认为`"INFO"`。
 
     ## 返回
 
     - `None`。
-        
+
     ## 注意
-    
+
     - 确保`LOG_PATH`指向有效的文件路径，并且程序有权限在此路径下创建或写入文件。
+    - 日志文件是在后台写入的，需要立即读取日志文件时，先调用`flush`。
 
     ## 示例
 
     >>> log("这是一个测试消息。")
     # 这将在LOG_PATH指向的日志文件中添加一行如下：
-    # [2025-02-14 21:44:02]这是一个测试消息。
+    # [2025-02-14 21:44:02][INFO]这是一个测试消息。
     """
 
-    # 保证文件的目录存在
-    if os.path.isfile(LOG_PATH):
-        mode = "a"
-    else:
-        mode = "w"
-        os.makedirs(os.path.dirname(LOG_PATH), exist_ok=True)
-
-    # 写入文件
-    with open(LOG_PATH, mode = mode, encoding = "utf-8") as file:
-        file.write(f"[{get_str_time()}]{message}\n")
-
-    # 输出到标准输出
-    print(message)
+    logger.log(message, level)
 
 
 def clear() -> None:
     r"""
     清除指定的日志文件内容。
 
-    如果由`LOG_PATH`指定的日志文件存在，则通过以写模式（'w'）打开该文件来清空其内容。
+    先等待后台线程写完已经记录的消息；如果由`LOG_PATH`指定的日志文件存在，则通过以写模式（'w'）打开该文件来清空其内容。
     若该文件不存在，则抛出`FileNotFoundError`异常。
 
     ## 参数
@@ -104,8 +108,4 @@ def clear() -> None:
     # FileNotFoundError: path/to/your/logfile.log
     """
 
-    if os.path.isfile(LOG_PATH):
-        with open(LOG_PATH, mode = "w", encoding = "utf-8"):
-            pass
-    else:
-        raise FileNotFoundError(LOG_PATH)
+    logger.clear()
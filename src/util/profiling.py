@@ -0,0 +1,33 @@
+r"""
+此模块提供了整个程序共用的剖析器，见`src.model.profiler`。
+
+function: span 把一段代码记为一个命名的片段。
+function: report 输出各阶段的用时报告。
+"""
+
+from config.constants import PROFILE_JSON_PATH
+from config.user import PROFILE, PROFILE_CPROFILE, PROFILE_TRACEMALLOC, PROFILE_JSON
+from src.model.profiler import Profiler
+
+
+profiler = Profiler(PROFILE, PROFILE_CPROFILE, PROFILE_TRACEMALLOC)
+
+span = profiler.span
+
+
+def report(json_path:str|None = PROFILE_JSON_PATH if PROFILE_JSON else None) -> None:
+    r"""
+    `config.user.PROFILE`为`True`时，输出各阶段的用时（以及内存分配、`cProfile`剖析的结果）的报告。
+
+    ## 参数
+
+    - `json_path`（`str|None`，可选）：同时以 JSON 格式写入的文件，默认在`PROFILE_JSON`为`True`时为`PROFILE_JSON_PATH`，否则为`None`，即不写入。
+    """
+
+    if not profiler.enabled:
+        return
+
+    data = profiler.report()
+    print(profiler.format(data))
+    if json_path is not None:
+        profiler.dump(json_path, data)
@@ -0,0 +1,12 @@
+r"""
+此模块提供了所有发往选课系统的请求共用的限速器。
+"""
+
+from config.constants import QUERY_INTERVAL_TIME
+from src.model.rate_limiter import RateLimiter
+
+
+limiter = RateLimiter(QUERY_INTERVAL_TIME)
+
+acquire = limiter.acquire
+penalize = limiter.penalize
@@ -0,0 +1,24 @@
+r"""
+此模块提供了对复旦大学的楼和食堂的空间索引的查询，索引见`src.model.geography.Geography`。
+
+function: nearest_canteen 离某一点最近的食堂的代码。
+function: nearest_buildings 离某一点最近的若干栋楼的代码。
+"""
+
+from src.util.geography import get_geography
+
+
+def nearest_canteen(location:tuple[float, float]) -> str:
+    r"""
+    返回离`location`（`(经度, 纬度)`）最近的食堂的代码，距离相等时取代码小的。
+    """
+
+    return get_geography().canteenIndex.nearestCode(location)
+
+
+def nearest_buildings(location:tuple[float, float], k:int = 1) -> list[str]:
+    r"""
+    返回离`location`（`(经度, 纬度)`）最近的`k`栋楼的代码，按距离从近到远排列。
+    """
+
+    return [code for (_, code) in get_geography().buildingIndex.nearest(location, k)]
@@ -0,0 +1,364 @@
+r"""
+本地的选课系统替身服务器。
+
+用 static/html/case 中的页面和 static/javascript/case/result.js 中的课程回放选课系统，
+可以设置响应延迟、“请不要过快点击”的出现概率和课程目录的大小。
+
+将环境变量`XK_BASE_URL`设为该服务器的地址（如`http://127.0.0.1:8765`），`config.constants`中所有的 URL 都会指向它，
+这样就可以在选课系统关闭时运行和测试`initialize` → `classify` → `arrange_schedule`的整个流程。
+
+class: StandInServer
+
+## 示例
+
+```shell
+python -m src.util.stand_in_server --port 8765 --latency 0.05 --throttle-rate 0.1 --catalogue-size 200
+python -m src.util.stand_in_server --pipeline # 启动服务器并在其上计时运行一遍排课流程
+```
+"""
+
+import json
+import os
+import random
+from copy import deepcopy
+from threading import Lock, Thread
+from time import sleep
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+# 样例文件所在的文件夹
+HTML_CASE_PATH = os.path.join("static", "html", "case")
+JAVASCRIPT_CASE_PATH = os.path.join("static", "javascript", "case")
+
+# 路径与样例文件的对应
+LOGIN_PATH = "/xk/login.action"
+STD_ELECT_COURSE_PATH = "/xk/stdElectCourse.action"
+DEFAULT_PAGE_PATH = "/xk/stdElectCourse!defaultPage.action"
+QUERY_LESSON_PATH = "/xk/stdElectCourse!queryLesson.action"
+
+
+def _read_case(*path:str) -> str:
+    r"""
+    读取一个样例文件的内容。
+    """
+
+    with open(os.path.join(*path), "r", encoding = "utf-8") as file:
+        return file.read()
+
+
+class StandInServer(ThreadingHTTPServer):
+    r"""
+    选课系统的替身服务器。
+
+    ## 属性
+
+    - `latency: float`：每个响应之前等待的时间（秒）。
+    - `throttleRate: float`：登录和查询请求返回“请不要过快点击”页面的概率，在`[0, 1]`之间。
+    - `lessonJSONs: list[dict]`：课程目录，其中前`selectedCount`门课被视为“已选的课”。
+    - `lessonId2Counts: dict[str, dict[str, int]]`：课程目录中每门课的`{"sc": 已选人数, "lc": 上限人数}`。
+    - `selectedCount: int`：已选的课的数量，每次查询的结果都以这些课开头，与真实的选课系统相同。
+    - `requestsCount: dict[str, int]`：每个路径收到的请求数量，用于测试。
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address:tuple[str, int] = ("127.0.0.1", 0), *, latency:float = 0.0, throttleRate:float = 0.0, catalogueSize:int = 0, selectedCount:int = 9, courseCodes = None, seed:int = 0):
+        r"""
+        ## 参数
+
+        - `address`（`tuple[str, int]`）：监听的地址，端口为`0`时由系统分配。
+        - `latency`（`float`）：每个响应之前等待的时间（秒）。
+        - `throttleRate`（`float`）：登录和查询请求返回“请不要过快点击”页面的概率。
+        - `catalogueSize`（`int`）：在 result.js 的课程之外，再合成多少门课。
+        - `selectedCount`（`int`）：已选的课的数量，取 result.js 中的前几门课。
+        - `courseCodes`（`Iterable[str]|None`）：合成的课所用的课程代码，轮流使用。默认为`None`，即 result.js 中出现过的课程代码。
+        - `seed`（`int`）：随机数种子，使合成的课程目录和“请不要过快点击”可以复现。
+        """
+
+        if not 0 <= throttleRate <= 1:
+            raise ValueError(f"`throttleRate` ({throttleRate}) should be in [0, 1]")
+
+        super().__init__(address, _StandInRequestHandler)
+
+        self.latency = latency
+        self.throttleRate = throttleRate
+        self.requestsCount = {}
+
+        self._random = random.Random(seed)
+        self._lock = Lock()
+
+        # 读取所有的页面
+        self.pages = {
+            "login": _read_case(HTML_CASE_PATH, "login.html"),
+            "home": _read_case(HTML_CASE_PATH, "home.html"),
+            "quickly_click": _read_case(HTML_CASE_PATH, "quickly_click.html"),
+            "std_elect_course": _read_case(HTML_CASE_PATH, "stdElectCourse.html"),
+            "default_page": _read_case(HTML_CASE_PATH, "stdElectCourse!defaultPage.html"),
+        }
+
+        # 构造课程目录
+        from src.core.parse import jsonfy_query_response
+        result = jsonfy_query_response(_read_case(JAVASCRIPT_CASE_PATH, "result.js"))
+        self.lessonJSONs = result["lessonJSONs"]
+        self.lessonId2Counts = result["lessonId2Counts"]
+        self.selectedCount = min(selectedCount, len(self.lessonJSONs))
+        self._synthesize(catalogueSize, courseCodes)
+
+
+    @property
+    def baseUrl(self) -> str:
+        r"""
+        可以直接作为`XK_BASE_URL`的服务器地址，如`"http://127.0.0.1:8765"`。
+        """
+
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+    def _synthesize(self, count:int, courseCodes) -> None:
+        r"""
+        以 result.js 中的课为模板，合成`count`门课加入课程目录。
+
+        合成的课的上课时间是随机的，教室、考试时间等其它信息沿用模板。
+        """
+
+        templates = self.lessonJSONs[:]
+        if courseCodes is None:
+            courseCodes = dict.fromkeys(lesson["code"] for lesson in templates)
+        courseCodes = list(courseCodes)
+
+        # 每个课程代码已经用掉的课程序号
+        sectionCounts = {}
+        for lesson in templates:
+            sectionCounts[lesson["code"]] = sectionCounts.get(lesson["code"], 0) + 1
+
+        nextId = max(lesson["id"] for lesson in templates) + 1
+        for index in range(count):
+            code = courseCodes[index % len(courseCodes)]
+            sectionCounts[code] = sectionCounts.get(code, 0) + 1
+
+            lesson = deepcopy(templates[index % len(templates)])
+            lesson["id"] = nextId
+            lesson["code"] = code
+            lesson["no"] = f"{code}.{sectionCounts[code]:02d}"
+            for arrangeJSON in lesson["arrangeInfo"]:
+                length = arrangeJSON["endUnit"] - arrangeJSON["startUnit"]
+                arrangeJSON["weekDay"] = self._random.randint(1, 5)
+                arrangeJSON["startUnit"] = self._random.randint(1, 14 - length)
+                arrangeJSON["endUnit"] = arrangeJSON["startUnit"] + length
+
+            limitCount = self._random.randint(15, 150)
+            self.lessonId2Counts[str(nextId)] = {
+                "sc": self._random.randint(0, limitCount + limitCount // 5),
+                "lc": limitCount,
+            }
+            self.lessonJSONs.append(lesson)
+            nextId += 1
+
+
+    def isThrottled(self) -> bool:
+        r"""
+        按照`throttleRate`的概率，决定这一次请求是否“点击过快”。
+        """
+
+        with self._lock:
+            return self._random.random() < self.throttleRate
+
+
+    def queryLesson(self, lessonNo:str = "", courseCode:str = "", courseName:str = "") -> str:
+        r"""
+        以 result.js 的格式返回查询结果，查询规则近似于真实的选课系统：
+        课程序号、课程代码按前缀匹配，课程名称按子串匹配，结果以已选的课开头。
+        """
+
+        if courseCode and len(courseCode) < 6:
+            return "error courseCode length"
+        if lessonNo and len(lessonNo) < 6:
+            return "error lessonNo length"
+
+        # 查询
+        lessonJSONs = self.lessonJSONs[:self.selectedCount] + [
+            lesson
+            for lesson in self.lessonJSONs[self.selectedCount:]
+            if lesson["no"].startswith(lessonNo) and lesson["code"].startswith(courseCode) and courseName in lesson["name"]
+        ]
+
+        # 选课人数
+        counts = ",".join(
+            "'{0}':{{sc:{1[sc]},lc:{1[lc]}}}".format(lesson["id"], self.lessonId2Counts[str(lesson["id"])])
+            for lesson in lessonJSONs
+        )
+
+        lessonJSONsString = json.dumps(lessonJSONs, ensure_ascii = False, separators = (",", ":"))
+        return f"var lessonJSONs = {lessonJSONsString};/*sc 当前人数, lc 人数上限*/\nwindow.lessonId2Counts={{{counts}}}"
+
+
+    def serveInBackground(self) -> Thread:
+        r"""
+        在后台线程中启动服务器，返回该线程。用`shutdown()`停止。
+        """
+
+        thread = Thread(target = self.serve_forever, daemon = True)
+        thread.start()
+        return thread
+
+
+
+class _StandInRequestHandler(BaseHTTPRequestHandler):
+    r"""
+    替身服务器的请求处理器。
+    """
+
+    server: StandInServer
+
+    def log_message(self, format, *args):
+        # 不在标准错误中输出每一个请求
+        pass
+
+
+    def _reply(self, text:str, status:int = 200) -> None:
+        r"""
+        等待`latency`秒，然后以 UTF-8 编码返回`text`。
+        """
+
+        if self.server.latency:
+            sleep(self.server.latency)
+
+        body = text.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/html;charset=UTF-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+    def _count(self, path:str) -> None:
+        with self.server._lock:
+            self.server.requestsCount[path] = self.server.requestsCount.get(path, 0) + 1
+
+
+    def do_GET(self):
+        path = urlsplit(self.path).path
+        self._count(path)
+
+        if path == LOGIN_PATH:
+            self._reply(self.server.pages["login"])
+        elif path == STD_ELECT_COURSE_PATH:
+            self._reply(self.server.pages["std_elect_course"])
+        else:
+            self._reply("Not Found", status = 404)
+
+
+    def do_POST(self):
+        path = urlsplit(self.path).path
+        self._count(path)
+
+        # 读取表单
+        length = int(self.headers.get("Content-Length", 0))
+        form = {
+            name: values[-1]
+            for (name, values) in parse_qs(self.rfile.read(length).decode("utf-8"), keep_blank_values = True).items()
+        }
+
+        if path == LOGIN_PATH:
+            if self.server.isThrottled():
+                self._reply(self.server.pages["quickly_click"])
+            else:
+                self._reply(self.server.pages["home"])
+        elif path == DEFAULT_PAGE_PATH:
+            self._reply(self.server.pages["default_page"])
+        elif path == QUERY_LESSON_PATH:
+            if self.server.isThrottled():
+                self._reply(self.server.pages["quickly_click"])
+            else:
+                self._reply(self.server.queryLesson(
+                    lessonNo = form.get("lessonNo", ""),
+                    courseCode = form.get("courseCode", ""),
+                    courseName = form.get("courseName", ""),
+                ))
+        else:
+            self._reply("Not Found", status = 404)
+
+
+
+def run_pipeline(server:StandInServer) -> dict[str, float]:
+    r"""
+    在替身服务器上运行一遍`initialize` → `classify` → `combine_courses` → `rank_time_tables`，返回每一步的用时（秒）。
+
+    ## 注意
+
+    - `config.constants`在第一次被导入时读取`XK_BASE_URL`，而创建`StandInServer`时就会导入它，
+      所以要在创建服务器之前把`XK_BASE_URL`设为服务器的地址，否则抛出`RuntimeError`。
+    """
+
+    from time import perf_counter
+
+    from config.constants import BASE_URL
+    if BASE_URL != server.baseUrl:
+        raise RuntimeError(f"`config.constants` has been imported with BASE_URL={BASE_URL}, not {server.baseUrl}")
+
+    from src.core.arrange_schedule import initialize, classify, combine_courses, rank_time_tables
+
+    durations = {}
+
+    start = perf_counter()
+    data = initialize()
+    durations["initialize"] = perf_counter() - start
+
+    start = perf_counter()
+    tags = classify(**data)
+    durations["classify"] = perf_counter() - start
+
+    start = perf_counter()
+    course_combinitions = combine_courses(tags)
+    durations["combine_courses"] = perf_counter() - start
+
+    start = perf_counter()
+    rank_time_tables(course_combinitions)
+    durations["rank_time_tables"] = perf_counter() - start
+
+    return durations
+
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description = "本地的选课系统替身服务器")
+    parser.add_argument("--host", default = "127.0.0.1")
+    parser.add_argument("--port", type = int, default = 8765)
+    parser.add_argument("--latency", type = float, default = 0.0, help = "每个响应的延迟（秒）")
+    parser.add_argument("--throttle-rate", type = float, default = 0.0, help = "返回“请不要过快点击”的概率")
+    parser.add_argument("--catalogue-size", type = int, default = 0, help = "合成的课的数量")
+    parser.add_argument("--selected-count", type = int, default = 9, help = "已选的课的数量")
+    parser.add_argument("--seed", type = int, default = 0)
+    parser.add_argument("--pipeline", action = "store_true", help = "在服务器上计时运行一遍排课流程，然后退出")
+    arguments = parser.parse_args()
+
+    # 合成的课使用 config/course_codes.csv 中的课程代码，这样排课流程才能查到课
+    with open(os.path.join("config", "course_codes.csv"), "r", encoding = "gbk") as file:
+        courseCodes = [line.split(",")[0] for line in file if line.strip()]
+
+    # 让`config.constants`中的 URL 指向替身服务器
+    if arguments.pipeline:
+        os.environ["XK_BASE_URL"] = f"http://{arguments.host}:{arguments.port}"
+
+    server = StandInServer(
+        (arguments.host, arguments.port),
+        latency = arguments.latency,
+        throttleRate = arguments.throttle_rate,
+        catalogueSize = arguments.catalogue_size,
+        selectedCount = arguments.selected_count,
+        courseCodes = courseCodes,
+        seed = arguments.seed,
+    )
+
+    if arguments.pipeline:
+        server.serveInBackground()
+        for (step, duration) in run_pipeline(server).items():
+            print(f"{step}: {duration:.3f} s")
+        print(f"requests: {server.requestsCount}")
+        server.shutdown()
+    else:
+        print(f"选课系统替身服务器已启动，请设置环境变量 XK_BASE_URL={server.baseUrl}")
+        server.serve_forever()